@@ -0,0 +1,81 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import cv2
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from batch_assessment import load_jobs, read_finished, assess_video
+
+class BatchAssessmentTests(unittest.TestCase):
+    def test_manifest_paths_are_relative_to_the_manifest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            manifest_path = os.path.join(directory, 'manifest.json')
+            with open(manifest_path, 'w') as manifest:
+                json.dump(["a.mp4", {"video": "clients/b.mp4", "client_id": 4, "scan_reason": "Follow-up"}], manifest)
+
+            # Act
+            jobs = load_jobs(manifest_path)
+
+            # Assert
+            self.assertEqual(jobs[0], {"video": os.path.join(directory, "a.mp4"), "client_id": None, "scan_reason": "Consult",
+                                       "job": jobs[0]["job"]})
+            self.assertTrue(jobs[0]["job"].startswith("a_"))
+            self.assertEqual(jobs[1]["video"], os.path.join(directory, "clients", "b.mp4"))
+            self.assertEqual(jobs[1]["client_id"], 4)
+
+    def test_directory_lists_only_videos(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for name in ["b.MP4", "a.avi", "notes.txt"]:
+                open(os.path.join(directory, name), 'w').close()
+
+            jobs = load_jobs(directory)
+
+            self.assertEqual([os.path.basename(job["video"]) for job in jobs], ["a.avi", "b.MP4"])
+
+    def test_resume_skips_succeeded_videos_only(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            output_path = os.path.join(directory, 'results.ndjson')
+            with open(output_path, 'w') as output:
+                output.write(json.dumps({"video": "/videos/a.mp4", "job": "a_1", "status": "ok"}) + '\n')
+                output.write(json.dumps({"video": "/videos/b.mp4", "job": "b_2", "status": "error", "error": "unreadable"}) + '\n')
+                output.write('{"video": "/videos/c.mp4", "job": "c_3", "sta')
+
+            # Act
+            finished = read_finished(output_path)
+
+            # Assert
+            self.assertEqual(finished, {"a_1"})
+
+    def test_same_named_videos_get_their_own_recording_and_log(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            for folder in ["clinic_a", "clinic_b"]:
+                os.makedirs(os.path.join(directory, folder))
+                writer = cv2.VideoWriter(os.path.join(directory, folder, "session.avi"),
+                                         cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (64, 48))
+                for _ in range(5):
+                    writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+                writer.release()
+            manifest_path = os.path.join(directory, 'manifest.json')
+            with open(manifest_path, 'w') as manifest:
+                json.dump(["clinic_a/session.avi", "clinic_b/session.avi"], manifest)
+            options = {"pose_backend": "mock", "recording_dir": os.path.join(directory, "recordings")}
+            log_dir = os.path.join(directory, "logs")
+
+            # Act
+            jobs = load_jobs(manifest_path)
+            results = [assess_video(job, options, log_dir) for job in jobs]
+
+            # Assert
+            self.assertNotEqual(jobs[0]["job"], jobs[1]["job"])
+            self.assertNotEqual(results[0]["recording"], results[1]["recording"])
+            self.assertTrue(all(os.path.exists(result["recording"]) for result in results))
+            self.assertEqual(len(os.listdir(log_dir)), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from batch_scoring import calculate_angles_batch, calculate_balance_score_batch, detect_step_events, score_session
+from helpers import calculate_angles
+from balance_tracker import BalanceTracker
+from pose_features import extract_features
+
+def standing_pose():
+    landmarks = np.full((33, 4), 0.5, dtype=np.float32)
+    landmarks[[11, 12], 1] = 0.3
+    landmarks[[23, 24], 1] = 0.5
+    landmarks[[25, 26], 1] = 0.7
+    landmarks[[27, 28], 1] = 0.9
+    landmarks[[11, 23, 25, 27], 0] = 0.45
+    landmarks[[12, 24, 26, 28], 0] = 0.55
+    return landmarks
+
+
+class BatchScoringTests(unittest.TestCase):
+    def test_batch_angles_match_the_scalar_helper(self):
+        # Arrange
+        a, b, c = np.random.default_rng(0).uniform(0, 1, (3, 50, 2))
+
+        # Act
+        angles = calculate_angles_batch(a, b, c)
+
+        # Assert
+        expected = [calculate_angles(a[i].tolist(), b[i].tolist(), c[i].tolist()) for i in range(50)]
+        np.testing.assert_allclose(angles, expected, rtol=0, atol=1e-12)
+
+    def test_balance_score_matches_the_tracker(self):
+        # Arrange
+        rng = np.random.default_rng(1)
+        frames = [standing_pose() for _ in range(200)]
+        for frame in frames:
+            frame[:, :2] += rng.normal(0, 0.01, (33, 2)).astype(np.float32)
+        tracker = BalanceTracker()
+        for frame in frames:
+            tracker.add_frame_data(extract_features(frame))
+        hip_centers = np.array([extract_features(frame).hip_center for frame in frames])
+
+        # Act
+        score = calculate_balance_score_batch(hip_centers)
+
+        # Assert
+        self.assertAlmostEqual(score, tracker.calculate_balance_score(), places=9)
+
+    def test_step_hysteresis(self):
+        # Arrange
+        ankle_diff = np.array([0.0, 0.06, 0.06, 0.04, 0.06, 0.01, 0.06, 0.0, 0.07])
+        timestamps = np.arange(len(ankle_diff)) * 0.4 + 10
+
+        # Act
+        events = detect_step_events(ankle_diff, timestamps)
+
+        # Assert
+        self.assertEqual(events, [1, 6, 8])
+
+    def test_incomplete_session_has_no_scores(self):
+        # Arrange
+        landmarks = np.stack([standing_pose()] * 300)
+        timestamps = np.arange(300) / 30
+
+        # Act
+        result = score_session(landmarks, timestamps)
+
+        # Assert
+        self.assertFalse(result["completed"])
+        self.assertEqual(result["assessment_results"]["overall_score"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from chunked_inference import plan_chunks
+
+class ChunkedInferenceTests(unittest.TestCase):
+    def test_chunks_cover_every_frame_once(self):
+        # Act
+        chunks = plan_chunks(1000, 4, overlap=15)
+
+        # Assert
+        self.assertEqual([(start, end) for _, start, end in chunks], [(0, 250), (250, 500), (500, 750), (750, None)])
+        self.assertEqual([warmup_start for warmup_start, _, _ in chunks], [0, 235, 485, 735])
+
+    def test_short_videos_use_fewer_chunks(self):
+        # Act
+        chunks = plan_chunks(3, 8)
+
+        # Assert
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(chunks[-1][2], None)
+
+
+if __name__ == '__main__':
+    unittest.main()
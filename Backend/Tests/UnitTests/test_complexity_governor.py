@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from complexity_governor import ComplexityGovernor, GOVERNOR_LEVELS
+
+class ComplexityGovernorTests(unittest.TestCase):
+    def test_downgrades_when_over_budget(self):
+        # Arrange
+        governor = ComplexityGovernor(target_fps=25, start_level=1, window_size=10)
+
+        # Act
+        changes = [governor.record(0.060, idle_phase=False) for _ in range(10)]
+
+        # Assert
+        self.assertEqual(changes[-1], GOVERNOR_LEVELS[2])
+        self.assertEqual(len(governor.summary()["changes"]), 1)
+
+    def test_upgrades_only_in_idle_phases(self):
+        # Arrange
+        governor = ComplexityGovernor(target_fps=25, start_level=3, window_size=10)
+
+        # Act
+        for _ in range(10):
+            governor.record(0.005, idle_phase=False)
+        level_during_exercise = governor.level
+        for _ in range(10):
+            governor.record(0.005, idle_phase=True)
+
+        # Assert
+        self.assertEqual(level_during_exercise, 3)
+        self.assertEqual(governor.level, 2)
+
+    def test_does_not_upgrade_back_to_a_level_known_to_be_too_slow(self):
+        # Arrange
+        governor = ComplexityGovernor(target_fps=25, start_level=1, window_size=10)
+        for _ in range(10):
+            governor.record(0.050, idle_phase=True)
+
+        # Act
+        for _ in range(10):
+            governor.record(0.030, idle_phase=True)
+
+        # Assert
+        self.assertEqual(governor.level, 2)
+
+    def test_rejected_complexity_is_skipped(self):
+        # Arrange
+        governor = ComplexityGovernor(target_fps=25, start_level=2, window_size=10)
+        for _ in range(10):
+            governor.record(0.060, idle_phase=False)
+
+        # Act
+        settings = governor.reject()
+
+        # Assert
+        self.assertEqual(settings, GOVERNOR_LEVELS[2])
+        self.assertEqual(governor.next_level(1), None)
+        self.assertTrue(governor.summary()["changes"][-1]["rejected"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import os
+import sys
+import io
+import contextlib
+import shutil
+import tempfile
+import cv2
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from frame_source import open_frame_source, ImageSequenceSource, VideoFileSource, WebcamSource
+
+class FrameSourceTests(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_frames(self, count):
+        for i in range(count):
+            frame = np.full((48, 64, 3), i * 10, dtype=np.uint8)
+            cv2.imwrite(os.path.join(self.temp_dir, f"frame_{i:04d}.png"), frame)
+
+    def test_image_sequence_timestamps(self):
+        # Arrange
+        self.write_frames(5)
+
+        # Act
+        source = open_frame_source(self.temp_dir, fps=10)
+        timestamps = []
+        while source.is_opened():
+            ret, frame, timestamp = source.read()
+            if not ret:
+                break
+            timestamps.append(timestamp)
+        source.release()
+
+        # Assert
+        self.assertIsInstance(source, ImageSequenceSource)
+        self.assertFalse(source.is_live)
+        self.assertEqual(timestamps, [0.0, 0.1, 0.2, 0.3, 0.4])
+
+    def test_image_sequence_skips_unreadable_frames(self):
+        # Arrange
+        self.write_frames(5)
+        with open(os.path.join(self.temp_dir, "frame_0002.png"), "wb") as corrupt_file:
+            corrupt_file.write(b"not a png")
+
+        # Act
+        source = open_frame_source(self.temp_dir, fps=10)
+        timestamps = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            while source.is_opened():
+                ret, frame, timestamp = source.read()
+                if not ret:
+                    break
+                timestamps.append(timestamp)
+
+        # Assert
+        self.assertEqual(timestamps, [0.0, 0.1, 0.3, 0.4])
+
+    def test_video_file_timestamps(self):
+        # Arrange
+        video_path = os.path.join(self.temp_dir, "session.avi")
+        writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 20.0, (64, 48))
+        for i in range(6):
+            writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+        writer.release()
+
+        # Act
+        with open_frame_source(video_path) as source:
+            frames = []
+            while True:
+                ret, frame, timestamp = source.read()
+                if not ret:
+                    break
+                frames.append(timestamp)
+
+        # Assert
+        self.assertIsInstance(source, VideoFileSource)
+        self.assertEqual(len(frames), 6)
+        self.assertAlmostEqual(frames[-1], 5 / 20.0)
+
+    def test_digit_string_opens_webcam(self):
+        source = open_frame_source("3")
+        source.release()
+        self.assertIsInstance(source, WebcamSource)
+        self.assertEqual(source.index, 3)
+
+    def test_unknown_source_raises(self):
+        with self.assertRaises(ValueError):
+            open_frame_source(os.path.join(self.temp_dir, "missing.mp4"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from inference_scheduler import InferenceScheduler, FRAME_INFERRED, FRAME_HELD, FRAME_EXTRAPOLATED
+
+def landmarks_at(x):
+    landmarks = np.full((33, 4), 0.5, dtype=np.float32)
+    landmarks[:, 0] = x
+    return landmarks
+
+
+class InferenceSchedulerTests(unittest.TestCase):
+    def test_idle_phase_runs_at_reduced_rate(self):
+        # Arrange
+        scheduler = InferenceScheduler(idle_rate=5.0)
+        decisions = []
+
+        # Act
+        for i in range(30):
+            current_time = i / 30
+            if scheduler.should_infer(current_time, idle_phase=True):
+                scheduler.record_inference(current_time, landmarks_at(0.5), 0.01)
+                decisions.append(True)
+            else:
+                scheduler.synthesize(current_time, idle_phase=True)
+                decisions.append(False)
+
+        # Assert
+        self.assertEqual(sum(decisions), 5)
+        self.assertEqual(scheduler.stats()["held"], 25)
+
+    def test_active_phase_never_skips_without_budget(self):
+        scheduler = InferenceScheduler(latency_budget=None)
+        scheduler.record_inference(0.0, landmarks_at(0.5), 1.0)
+        self.assertTrue(scheduler.should_infer(0.033, idle_phase=False))
+
+    def test_behind_budget_extrapolates_skipped_frames(self):
+        # Arrange
+        scheduler = InferenceScheduler(latency_budget=0.033)
+        scheduler.record_inference(0.0, landmarks_at(0.50), 0.030)
+        scheduler.record_inference(0.1, landmarks_at(0.52), 0.080)
+
+        # Act
+        infer = scheduler.should_infer(0.2, idle_phase=False)
+        landmarks = scheduler.synthesize(0.2, idle_phase=False)
+
+        # Assert
+        self.assertFalse(infer)
+        np.testing.assert_allclose(landmarks[:, 0], 0.54, rtol=1e-5)
+        self.assertEqual(list(scheduler.frame_kinds), [FRAME_INFERRED, FRAME_INFERRED, FRAME_EXTRAPOLATED])
+
+    def test_consecutive_skips_are_bounded(self):
+        # Arrange
+        scheduler = InferenceScheduler(latency_budget=0.01, max_consecutive_skips=2)
+        scheduler.record_inference(0.0, landmarks_at(0.5), 0.5)
+
+        # Act
+        decisions = []
+        for i in range(1, 4):
+            infer = scheduler.should_infer(i * 0.033, idle_phase=False)
+            decisions.append(infer)
+            if not infer:
+                scheduler.synthesize(i * 0.033, idle_phase=False)
+
+        # Assert
+        self.assertEqual(decisions, [False, False, True])
+        self.assertEqual(scheduler.frame_kinds[1], FRAME_HELD)
+
+    def test_gated_frames_are_counted_by_the_scheduler(self):
+        # Arrange
+        from model import AssessmentSession, InferenceStage
+        from motion_gate import MotionGate
+        from pose_estimator import PoseEstimator
+        gate = MotionGate()
+        scheduler = InferenceScheduler(idle_rate=5.0)
+        frame = np.full((48, 64, 3), 90, dtype=np.uint8)
+
+        # Act: static scene while waiting for the exercises
+        with PoseEstimator(backend="mock", landmarks=landmarks_at(0.5)) as estimator:
+            stage = InferenceStage(estimator, AssessmentSession(), scheduler=scheduler, motion_gate=gate)
+            for i in range(60):
+                stage.process(frame, i / 30)
+        stats = scheduler.stats()
+
+        # Assert
+        self.assertEqual(stats["frames"], 60)
+        self.assertEqual(stats["gated"], gate.stats()["skipped"])
+        self.assertGreater(stats["gated"], 0)
+        self.assertEqual(stats["inferred"] + stats["held"] + stats["extrapolated"] + stats["skipped_without_pose"]
+                         + stats["gated"], stats["frames"])
+
+
+if __name__ == '__main__':
+    unittest.main()
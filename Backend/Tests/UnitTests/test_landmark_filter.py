@@ -0,0 +1,54 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from landmark_filter import OneEuroFilter
+
+class OneEuroFilterTests(unittest.TestCase):
+    def test_reduces_jitter_of_still_landmarks(self):
+        # Arrange
+        rng = np.random.default_rng(0)
+        smoother = OneEuroFilter()
+        raw = [np.concatenate([0.5 + rng.normal(0, 0.005, (33, 3)), np.ones((33, 1))], axis=1).astype(np.float32)
+               for _ in range(300)]
+
+        # Act
+        filtered = [smoother.filter(landmarks, i / 30) for i, landmarks in enumerate(raw)]
+
+        # Assert
+        raw_jitter = np.std(np.array(raw)[100:, :, :3])
+        filtered_jitter = np.std(np.array(filtered)[100:, :, :3])
+        self.assertLess(filtered_jitter, raw_jitter * 0.5)
+        np.testing.assert_array_equal(filtered[-1][:, 3], raw[-1][:, 3])
+
+    def test_follows_fast_movement(self):
+        # Arrange
+        smoother = OneEuroFilter()
+        landmarks = np.zeros((33, 4), dtype=np.float32)
+
+        # Act
+        for i in range(30):
+            landmarks[:, 0] = i / 30  # one frame width per second
+            filtered = smoother.filter(landmarks, i / 30)
+
+        # Assert
+        self.assertLess(abs(filtered[0, 0] - landmarks[0, 0]), 0.05)
+
+    def test_restarts_after_the_person_is_lost(self):
+        # Arrange
+        smoother = OneEuroFilter()
+        smoother.filter(np.zeros((33, 4), dtype=np.float32), 0.0)
+
+        # Act
+        lost = smoother.filter(None, 0.033)
+        landmarks = np.full((33, 4), 0.8, dtype=np.float32)
+        filtered = smoother.filter(landmarks, 0.066)
+
+        # Assert
+        self.assertIsNone(lost)
+        np.testing.assert_array_equal(filtered, landmarks)
+
+
+if __name__ == '__main__':
+    unittest.main()
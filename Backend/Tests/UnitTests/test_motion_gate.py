@@ -0,0 +1,59 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from motion_gate import MotionGate
+
+def blank_frame():
+    return np.full((720, 1280, 3), 90, dtype=np.uint8)
+
+
+class MotionGateTests(unittest.TestCase):
+    def test_static_scene_reuses_last_landmarks(self):
+        # Arrange
+        gate = MotionGate()
+        landmarks = np.zeros((33, 4), dtype=np.float32)
+        gate.should_infer(blank_frame(), 0.0)
+        gate.update(landmarks)
+
+        # Act
+        decisions = [gate.should_infer(blank_frame(), i / 30) for i in range(1, 10)]
+
+        # Assert
+        self.assertEqual(decisions, [False] * 9)
+        self.assertIs(gate.landmarks, landmarks)
+        self.assertAlmostEqual(gate.stats()["hit_rate"], 0.9)
+
+    def test_motion_triggers_inference(self):
+        # Arrange
+        gate = MotionGate()
+        gate.should_infer(blank_frame(), 0.0)
+        gate.update(None)
+        moved = blank_frame()
+        moved[200:600, 500:700] = 200
+
+        # Act
+        decision = gate.should_infer(moved, 0.033)
+
+        # Assert
+        self.assertTrue(decision)
+
+    def test_refresh_is_forced_after_max_hold(self):
+        # Arrange
+        gate = MotionGate(max_hold=1.0)
+        gate.should_infer(blank_frame(), 0.0)
+        gate.update(None)
+
+        # Act
+        held = gate.should_infer(blank_frame(), 0.5)
+        refreshed = gate.should_infer(blank_frame(), 1.0)
+
+        # Assert
+        self.assertFalse(held)
+        self.assertTrue(refreshed)
+        self.assertEqual(gate.stats()["forced_refreshes"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
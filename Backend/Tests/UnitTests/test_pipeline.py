@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from pipeline import StageQueue, FrameGrabber, END_OF_STREAM, create_capture_queue
+
+class FakeSource:
+    def __init__(self, count, is_live=False):
+        self.count = count
+        self.index = 0
+        self.is_live = is_live
+
+    def read(self):
+        if self.index >= self.count:
+            return False, None, None
+        self.index += 1
+        return True, self.index, self.index / 10.0
+
+    def is_opened(self):
+        return True
+
+
+class StageQueueTests(unittest.TestCase):
+    def test_drop_oldest_keeps_newest(self):
+        # Arrange
+        stage_queue = StageQueue("capture", maxsize=1, drop_oldest=True)
+
+        # Act
+        for i in range(5):
+            stage_queue.put(i)
+
+        # Assert
+        self.assertEqual(stage_queue.get(), 4)
+        self.assertEqual(stage_queue.stats()["dropped"], 4)
+        self.assertEqual(stage_queue.stats()["frames"], 5)
+
+    def test_end_of_stream_is_never_dropped(self):
+        stage_queue = StageQueue("render", maxsize=1, drop_oldest=True)
+        stage_queue.put(END_OF_STREAM)
+        stage_queue.put("late frame")
+        self.assertIs(stage_queue.get(), END_OF_STREAM)
+
+    def test_grabber_keeps_every_recorded_frame(self):
+        # Arrange
+        source = FakeSource(20)
+        stage_queue = create_capture_queue(source)
+        grabber = FrameGrabber(source, stage_queue, threading.Event())
+
+        # Act
+        grabber.start()
+        timestamps = []
+        while True:
+            packet = stage_queue.get(timeout=1)
+            if packet is END_OF_STREAM:
+                break
+            timestamps.append(packet[1])
+        grabber.join()
+
+        # Assert
+        self.assertEqual(len(timestamps), 20)
+        self.assertEqual(stage_queue.stats()["dropped"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import numpy as np
+import cv2
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../benchmarks')))
+from pipeline_benchmark import list_fixtures, run_fixture
+from benchmark_report import save_report
+
+class PipelineBenchmarkTests(unittest.TestCase):
+    def test_fixture_directory_lists_only_videos_in_order(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            for name in ["b.mp4", "a.AVI", "notes.txt", "results.json"]:
+                open(os.path.join(directory, name), "w").close()
+
+            # Act
+            fixtures = list_fixtures(directory)
+
+            # Assert
+            self.assertEqual([os.path.basename(path) for path in fixtures], ["a.AVI", "b.mp4"])
+
+    def test_report_is_saved_with_suite_and_machine(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Act
+            path = save_report("pipeline", {"max_frames": 10}, [{"fixture": "a.mp4", "sustained_fps": 30.0}], directory)
+
+            # Assert
+            self.assertTrue(os.path.basename(path).startswith("pipeline_"))
+            with open(path) as report_file:
+                report = json.load(report_file)
+            self.assertEqual(report["suite"], "pipeline")
+            self.assertIn("cpu_count", report)
+            self.assertEqual(report["results"][0]["fixture"], "a.mp4")
+    def test_fixture_run_renders_the_overlay_and_times_each_frame(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            video_path = os.path.join(directory, "clip.avi")
+            writer = cv2.VideoWriter(video_path, cv2.VideoWriter_fourcc(*'MJPG'), 30.0, (64, 48))
+            for _ in range(20):
+                writer.write(np.zeros((48, 64, 3), dtype=np.uint8))
+            writer.release()
+
+            # Act
+            result = run_fixture(video_path, {"name": "worst_case", "motion_gate": False,
+                                              "inference_scheduling": False, "pose_backend": "mock"})
+
+        # Assert
+        self.assertEqual(result["frames"], 20)
+        self.assertIn("overlay", result["stages"])
+        self.assertGreater(result["stages"]["capture_to_render"]["count"], 0)
+        self.assertIsNotNone(result["capture_to_render_ms"]["p95_ms"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,191 @@
+import unittest
+import os
+import sys
+import io
+import contextlib
+from unittest import mock
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../benchmarks')))
+import pose_backends
+from pose_backends import MockPoseBackend, TFLiteBackend, create_pose_backend
+from pose_estimator import PoseEstimator
+from frame_source import FrameSource
+from synthetic_landmarks import generate_stream
+
+class BlankFrameSource(FrameSource):
+    """ black frames at 30 fps, the mock backend does not look at them """
+    is_live = False
+
+    def __init__(self, frame_count):
+        self.frame_count = frame_count
+        self.frame_index = 0
+
+    def read(self):
+        if self.frame_index >= self.frame_count:
+            return False, None, None
+        self.frame_index += 1
+        return True, np.zeros((48, 64, 3), dtype=np.uint8), (self.frame_index - 1) / 30.0
+
+    def is_opened(self):
+        return True
+
+    def release(self):
+        pass
+
+class FakeInterpreter:
+    """ tflite interpreter returning fixed outputs in the 256 x 256 model input space """
+    def __init__(self, raw_landmarks, scores):
+        self.raw_landmarks = raw_landmarks
+        self.scores = list(scores)
+        self.inputs = []
+
+    def get_input_details(self):
+        return [{'index': 0, 'shape': [1, 256, 256, 3]}]
+
+    def get_output_details(self):
+        return [{'name': 'Identity_1', 'index': 2}, {'name': 'Identity', 'index': 1}]
+
+    def set_tensor(self, index, value):
+        self.inputs.append(value)
+
+    def invoke(self):
+        pass
+
+    def get_tensor(self, index):
+        if index == 1:
+            return self.raw_landmarks.reshape(1, -1)
+        return np.array([[self.scores.pop(0)]], dtype=np.float32)
+
+def tflite_backend(interpreter, **pose_options):
+    with mock.patch.object(pose_backends, 'load_tflite_interpreter', return_value=interpreter):
+        return TFLiteBackend(model_path='pose_landmark_full.tflite', **pose_options)
+
+class PoseBackendTests(unittest.TestCase):
+    def test_mock_backend_replays_and_loops_the_stream(self):
+        # Arrange
+        landmarks = np.random.rand(3, 33, 4).astype(np.float32)
+        landmarks[1] = np.nan
+        backend = MockPoseBackend(landmarks)
+
+        # Act
+        replayed = [backend.process(None) for _ in range(4)]
+
+        # Assert
+        np.testing.assert_array_equal(replayed[0], landmarks[0])
+        self.assertIsNone(replayed[1])
+        np.testing.assert_array_equal(replayed[3], landmarks[0])
+
+    def test_mock_backend_replays_by_timestamp(self):
+        # Arrange
+        landmarks = np.random.rand(90, 33, 4).astype(np.float32)
+        backend = MockPoseBackend(landmarks, fps=30)
+
+        # Act: frames 1 and 2 never reach the backend, then the backend is rebuilt (reconfigure)
+        replayed = [backend.process(None, 0.0), backend.process(None, 3 / 30)]
+        rebuilt = MockPoseBackend(landmarks, fps=30)
+        rebuilt.resume_from(backend)
+        replayed.append(rebuilt.process(None, 45 / 30))
+        replayed.append(rebuilt.process(None, 91 / 30))
+
+        # Assert
+        for pose, index in zip(replayed, [0, 3, 45, 1]):
+            np.testing.assert_array_equal(pose, landmarks[index])
+
+    def test_mock_backend_replays_from_the_first_timestamp(self):
+        # Arrange: wall clock timestamps
+        landmarks = np.random.rand(90, 33, 4).astype(np.float32)
+        backend = MockPoseBackend(landmarks, fps=30)
+        start_time = 1792339200.123
+
+        # Act
+        replayed = [backend.process(None, start_time + index / 30) for index in (0, 1, 60)]
+
+        # Assert
+        for pose, index in zip(replayed, [0, 1, 60]):
+            np.testing.assert_array_equal(pose, landmarks[index])
+
+    def test_tflite_backend_maps_letterboxed_landmarks_back_to_the_frame(self):
+        # Arrange: 640 x 480 frame letterboxed in a 640 x 640 square (80 rows of padding) scaled to 256
+        raw = np.zeros((39, 5), dtype=np.float32)
+        raw[:, 0] = 160 * 256 / 640
+        raw[:, 1] = (240 + 80) * 256 / 640
+        raw[:, 2] = 10.0
+        interpreter = FakeInterpreter(raw, [0.9])
+        backend = tflite_backend(interpreter)
+        frame = np.full((480, 640, 3), 255, dtype=np.uint8)
+
+        # Act
+        landmarks = backend.process(frame)
+
+        # Assert
+        model_input = interpreter.inputs[0]
+        self.assertEqual(model_input.shape, (1, 256, 256, 3))
+        self.assertEqual(model_input[0, :32].max(), 0.0)
+        self.assertAlmostEqual(float(model_input[0, 128, 128, 0]), 1.0)
+        self.assertEqual(landmarks.shape, (33, 4))
+        np.testing.assert_allclose(landmarks[:, 0], 0.25, rtol=1e-5)
+        np.testing.assert_allclose(landmarks[:, 1], 0.5, rtol=1e-5)
+        np.testing.assert_allclose(landmarks[:, 2], 10.0 * 640 / 256 / 640, rtol=1e-5)
+        np.testing.assert_allclose(landmarks[:, 3], 0.5)
+
+    def test_tflite_backend_keeps_a_tracked_person_with_the_tracking_confidence(self):
+        # Arrange
+        interpreter = FakeInterpreter(np.zeros((39, 5), dtype=np.float32), [0.5, 0.7, 0.5, 0.2])
+        backend = tflite_backend(interpreter, min_detection_confidence=0.6, min_tracking_confidence=0.3)
+        frame = np.zeros((64, 64, 3), dtype=np.uint8)
+
+        # Act
+        detected = [backend.process(frame) is not None for _ in range(4)]
+
+        # Assert
+        self.assertEqual(detected, [False, True, True, False])
+
+    def test_unknown_backend_raises(self):
+        with self.assertRaises(ValueError):
+            create_pose_backend("openpose")
+
+    def test_pose_estimator_runs_on_the_mock_backend(self):
+        # Arrange
+        pose = np.full((33, 4), 0.5, dtype=np.float32)
+
+        # Act
+        with PoseEstimator(backend="mock", landmarks=pose) as estimator:
+            landmarks = estimator.process(np.zeros((48, 64, 3), dtype=np.uint8))
+
+        # Assert
+        np.testing.assert_array_equal(landmarks, pose)
+
+    def test_assessment_completes_on_mock_landmarks(self):
+        # Arrange
+        from model import run_assessment
+        timestamps, landmarks = generate_stream("session", duration=30, fps=30)
+
+        # Act
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_assessment(source=BlankFrameSource(len(timestamps)), headless=True, threaded=False,
+                                     motion_gate=False, inference_scheduling=False, record_landmarks=False,
+                                     generate_report=False, pose_backend="mock",
+                                     pose_backend_options={"landmarks": landmarks})
+
+        # Assert
+        self.assertTrue(results["completed"])
+        self.assertEqual(results["processing_settings"]["pose_backend"], "mock")
+
+    def test_assessment_completes_on_mock_landmarks_with_the_default_settings(self):
+        # Arrange: the motion gate and the inference scheduler keep frames from the backend
+        from model import run_assessment
+        timestamps, landmarks = generate_stream("session", duration=30, fps=30)
+
+        # Act
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_assessment(source=BlankFrameSource(len(timestamps)), headless=True, record_landmarks=False,
+                                     generate_report=False, pose_backend="mock",
+                                     pose_backend_options={"landmarks": landmarks})
+
+        # Assert
+        self.assertTrue(results["completed"])
+        self.assertGreater(results["motion_gate"]["skipped"], 0)
+
+if __name__ == '__main__':
+    unittest.main()
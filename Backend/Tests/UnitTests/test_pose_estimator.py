@@ -0,0 +1,85 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from pose_estimator import SharedFrameRing, ProcessPoseEstimator
+
+class SharedFrameRingTests(unittest.TestCase):
+    def test_attached_ring_sees_written_frames(self):
+        # Arrange
+        owner = SharedFrameRing(3, (48, 64, 3))
+        attached = SharedFrameRing(3, (48, 64, 3), name=owner.name)
+        frame = np.random.randint(0, 255, (48, 64, 3), dtype=np.uint8)
+
+        # Act
+        owner.write(2, frame)
+        received = attached.view(2).copy()
+        attached.close()
+        owner.close()
+
+        # Assert
+        np.testing.assert_array_equal(received, frame)
+
+
+class ProcessPoseEstimatorTests(unittest.TestCase):
+    def test_worker_process_infers_frames_in_submission_order(self):
+        # Arrange
+        stream = np.random.rand(2, 33, 4).astype(np.float32)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+        # Act: both frames in flight before the first result is collected
+        with ProcessPoseEstimator(backend="mock", landmarks=stream) as estimator:
+            estimator.submit(frame)
+            estimator.submit(frame)
+            first = estimator.collect()
+            second = estimator.collect()
+            latency = estimator.latency
+
+        # Assert
+        np.testing.assert_array_equal(first, stream[0])
+        np.testing.assert_array_equal(second, stream[1])
+        self.assertIsNotNone(latency)
+
+    def test_frame_shape_changes_keep_the_same_worker(self):
+        # Arrange: roi crops and full frames alternate
+        stream = np.random.rand(6, 33, 4).astype(np.float32)
+        frames = [np.zeros((48, 64, 3), dtype=np.uint8), np.zeros((32, 32, 3), dtype=np.uint8)] * 3
+
+        # Act
+        with ProcessPoseEstimator(backend="mock", landmarks=stream, max_rings=2) as estimator:
+            landmarks = [estimator.process(frame) for frame in frames[:1]]
+            worker = estimator.worker.pid
+            landmarks += [estimator.process(frame) for frame in frames[1:]]
+            landmarks.append(estimator.process(np.zeros((16, 16, 3), dtype=np.uint8)))
+            same_worker = estimator.worker.pid == worker
+            ring_shapes = list(estimator.rings)
+
+        # Assert
+        self.assertTrue(same_worker)
+        self.assertEqual(ring_shapes, [(32, 32, 3), (16, 16, 3)])
+        for received, expected in zip(landmarks, list(stream) + [stream[0]]):
+            np.testing.assert_array_equal(received, expected)
+
+    def test_inference_stage_keeps_the_next_frame_in_the_worker(self):
+        # Arrange
+        from model import AssessmentSession, InferenceStage
+        stream = np.random.rand(2, 33, 4).astype(np.float32)
+        frame = np.zeros((48, 64, 3), dtype=np.uint8)
+
+        # Act
+        with ProcessPoseEstimator(backend="mock", landmarks=stream) as estimator:
+            stage = InferenceStage(estimator, AssessmentSession())
+            first = stage.push(frame, 0.0)
+            second = stage.push(frame, 1 / 30)
+            rest = stage.drain()
+
+        # Assert
+        self.assertEqual(first, [])
+        self.assertEqual([done[1] for done in second + rest], [0.0, 1 / 30])
+        np.testing.assert_array_equal(second[0][2], stream[0])
+        np.testing.assert_array_equal(rest[0][2], stream[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from pose_features import extract_features, LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE, LEFT_ANKLE, RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE
+from helpers import calculate_angles
+from step_tracker import StepTracker
+
+def standing_pose():
+    landmarks = np.full((33, 4), 0.5, dtype=np.float32)
+    landmarks[[11, 12], 1] = 0.3
+    landmarks[[23, 24], 1] = 0.5
+    landmarks[[25, 26], 1] = 0.7
+    landmarks[[27, 28], 1] = 0.9
+    landmarks[[11, 23, 25, 27], 0] = 0.45
+    landmarks[[12, 24, 26, 28], 0] = 0.55
+    return landmarks
+
+
+class PoseFeaturesTests(unittest.TestCase):
+    def test_angles_match_the_scalar_helper(self):
+        # Arrange
+        rng = np.random.default_rng(0)
+        landmarks = rng.uniform(0, 1, (33, 4)).astype(np.float32)
+        point = lambda index: [float(landmarks[index, 0]), float(landmarks[index, 1])]
+
+        # Act
+        features = extract_features(landmarks)
+
+        # Assert
+        self.assertEqual(features.spine_angle, calculate_angles(point(LEFT_SHOULDER), point(LEFT_HIP), point(LEFT_KNEE)))
+        self.assertEqual(features.left_knee_angle, calculate_angles(point(LEFT_HIP), point(LEFT_KNEE), point(LEFT_ANKLE)))
+        self.assertEqual(features.right_knee_angle, calculate_angles(point(RIGHT_HIP), point(RIGHT_KNEE), point(RIGHT_ANKLE)))
+        self.assertEqual(features.trunk_angle, calculate_angles(point(LEFT_SHOULDER), point(LEFT_HIP), [0, point(LEFT_HIP)[1]]))
+
+    def test_centers_and_offsets(self):
+        # Act
+        features = extract_features(standing_pose())
+
+        # Assert
+        self.assertAlmostEqual(features.hip_center[0], 0.5)
+        self.assertAlmostEqual(features.shoulder_center[1], 0.3)
+        self.assertAlmostEqual(features.ankle_diff, 0.0)
+        self.assertAlmostEqual(features.left_knee_angle, 180.0)
+
+    def test_step_tracker_counts_a_step_from_features(self):
+        # Arrange
+        tracker = StepTracker()
+        lifted = standing_pose()
+        lifted[LEFT_ANKLE, 1] -= 0.1
+
+        # Act
+        tracker.detect_step(extract_features(standing_pose()), 1.0)
+        stepped = tracker.detect_step(extract_features(lifted), 1.1)
+
+        # Assert
+        self.assertTrue(stepped)
+        self.assertEqual(tracker.get_step_count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
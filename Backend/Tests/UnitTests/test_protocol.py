@@ -0,0 +1,124 @@
+import unittest
+import os
+import sys
+import io
+import contextlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../benchmarks')))
+from protocol import load_protocol, STANDARD_PROTOCOL
+from batch_scoring import score_session
+from synthetic_landmarks import generate_stream
+
+SHORT_PROTOCOL = {
+    "name": "short",
+    "phases": [
+        {"name": "WAITING", "until": {"duration": 3}},
+        {"name": "STEPPING", "trackers": ["step", "balance"], "until": {"steps": 6}},
+        {"name": "SQUATTING", "trackers": ["squat", "balance"], "until": {"squats": 2}},
+    ]
+}
+
+def run_session(protocol, timestamps, landmarks):
+    from model import AssessmentSession
+
+    session = AssessmentSession(protocol=protocol)
+    idle_frames = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for current_time, frame in zip(timestamps.tolist(), landmarks):
+            session.start(current_time)
+            idle_frames += session.is_idle() and not session.is_completed()
+            session.update(frame, current_time)
+    return session, idle_frames
+
+class ProtocolTests(unittest.TestCase):
+    def test_default_protocol_is_the_standard_one(self):
+        # Act
+        protocol = load_protocol()
+
+        # Assert
+        self.assertEqual(protocol, STANDARD_PROTOCOL)
+        self.assertIsNot(protocol["phases"], STANDARD_PROTOCOL["phases"])
+
+    def test_invalid_protocols_raise(self):
+        invalid_phases = [
+            [{"name": "STEPPING", "trackers": ["jump"], "until": {"steps": 10}}],
+            [{"name": "STEPPING", "trackers": ["balance"], "until": {"steps": 10}}],
+            [{"name": "WAITING", "until": {"duration": 5, "steps": 2}}],
+        ]
+        for phases in invalid_phases:
+            with self.assertRaises(ValueError):
+                load_protocol({"phases": phases})
+
+    def test_custom_protocol_live_and_batch_scores_match(self):
+        # Arrange
+        timestamps, landmarks = generate_stream("session", duration=30, fps=30)
+
+        # Act
+        session, _ = run_session(SHORT_PROTOCOL, timestamps, landmarks)
+        with contextlib.redirect_stdout(io.StringIO()):
+            batch = score_session(landmarks, timestamps, protocol=SHORT_PROTOCOL)
+
+        # Assert
+        self.assertTrue(session.is_completed())
+        self.assertEqual(session.step_tracker.get_step_count(), 6)
+        self.assertEqual(session.squat_tracker.get_squat_count(), 2)
+        for key, score in batch["assessment_results"].items():
+            self.assertAlmostEqual(session.assessment_results[key], score, places=9)
+
+    def test_rest_phase_is_idle_and_unused_scores_stay_zero(self):
+        # Arrange
+        protocol = {
+            "phases": [
+                {"name": "STEPPING", "trackers": ["step"], "until": {"steps": 4}},
+                {"name": "REST", "until": {"duration": 2}},
+                {"name": "STEPPING_AGAIN", "trackers": ["step"], "until": {"steps": 4}},
+            ],
+            "score_weights": {"stepping_score": 1.0}
+        }
+        timestamps, landmarks = generate_stream("stepping", duration=30, fps=30)
+
+        # Act
+        session, idle_frames = run_session(protocol, timestamps, landmarks)
+
+        # Assert
+        self.assertTrue(session.is_completed())
+        self.assertEqual(session.step_tracker.get_step_count(), 8)
+        self.assertGreater(idle_frames, 2 * 30)
+        self.assertEqual(session.assessment_results["squat_score"], 0)
+        self.assertEqual(session.assessment_results["overall_score"], session.assessment_results["stepping_score"])
+    def test_batch_scoring_replays_any_protocol(self):
+        # Arrange: steps split by a rest phase, and steps still counted by a timed phase running the step tracker
+        protocols = [
+            {
+                "phases": [
+                    {"name": "STEPPING", "trackers": ["step"], "until": {"steps": 4}},
+                    {"name": "REST", "until": {"duration": 2}},
+                    {"name": "STEPPING_AGAIN", "trackers": ["step"], "until": {"steps": 4}},
+                ],
+                "score_weights": {"stepping_score": 1.0}
+            },
+            {
+                "phases": [
+                    {"name": "STEPPING", "trackers": ["step"], "until": {"steps": 3}},
+                    {"name": "STEPPING_FREELY", "trackers": ["step", "balance"], "until": {"duration": 4}},
+                    {"name": "SQUATTING", "trackers": ["squat", "balance"], "until": {"squats": 2}},
+                ]
+            },
+        ]
+        timestamps, landmarks = generate_stream("session", duration=30, fps=30)
+
+        for protocol in protocols:
+            # Act
+            session, _ = run_session(protocol, timestamps, landmarks)
+            with contextlib.redirect_stdout(io.StringIO()):
+                batch = score_session(landmarks, timestamps, protocol=protocol)
+
+            # Assert
+            self.assertTrue(batch["completed"])
+            self.assertEqual(batch["step_count"], session.step_tracker.get_step_count())
+            self.assertEqual(batch["squat_count"], session.squat_tracker.get_squat_count())
+            for key, score in batch["assessment_results"].items():
+                self.assertAlmostEqual(session.assessment_results[key], score, places=9)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from session_recorder import SessionRecorder
+from rescoring import rescore_recording, rescore_recordings
+from helpers import resolve_thresholds
+
+def stepping_pose(t):
+    landmarks = np.full((33, 4), 0.5, dtype=np.float32)
+    landmarks[[11, 12], 1] = 0.3
+    landmarks[[23, 24], 1] = 0.5
+    landmarks[[25, 26], 1] = 0.7
+    landmarks[[27, 28], 1] = 0.9
+    landmarks[[11, 23, 25, 27], 0] = 0.45
+    landmarks[[12, 24, 26, 28], 0] = 0.55
+    # one ankle lifted by 0.08 every other second once the preparation is over
+    if t > 6 and int(t) % 2 == 0:
+        landmarks[27, 1] -= 0.08
+    return landmarks
+
+def record_session(directory, processing_settings=None):
+    recorder = SessionRecorder(os.path.join(directory, 'scan.npy'))
+    for i in range(30 * 20):
+        t = 100 + i / 30
+        recorder.record(t, None if i % 40 == 3 else stepping_pose(t - 100), 1)
+    metadata = {"events": [{"event": "start", "timestamp": 100.0}]}
+    if processing_settings is not None:
+        metadata["processing_settings"] = processing_settings
+    return recorder.close(metadata)
+
+
+class RescoringTests(unittest.TestCase):
+    def test_thresholds_change_the_detection(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = record_session(directory)
+
+            # Act
+            default = rescore_recording(path)
+            strict = rescore_recording(path, {"step_threshold": 0.1})
+
+            # Assert
+            self.assertEqual(default["step_count"], 7)
+            self.assertEqual(strict["step_count"], 0)
+            self.assertEqual(strict["thresholds"]["step_threshold"], 0.1)
+            self.assertEqual(strict["thresholds"]["squat_down_angle"], 130)
+
+    def test_recording_is_scored_with_its_protocol(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            protocol = {
+                "name": "steps_only",
+                "phases": [
+                    {"name": "WAITING", "until": {"duration": 6}},
+                    {"name": "STEPPING", "trackers": ["step", "balance"], "until": {"steps": 3}},
+                ],
+                "score_weights": {"stepping_score": 0.5, "balance_score": 0.5}
+            }
+            path = record_session(directory, {"protocol": protocol})
+
+            # Act
+            result = rescore_recording(path)
+
+            # Assert
+            self.assertTrue(result["completed"])
+            self.assertEqual(result["step_count"], 3)
+            self.assertEqual(result["assessment_results"]["squat_score"], 0)
+            self.assertGreater(result["assessment_results"]["overall_score"], 0)
+
+    def test_pool_reports_failed_recordings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = record_session(directory)
+
+            # Act
+            results = rescore_recordings([path, os.path.join(directory, 'missing.npy')], workers=2)
+
+            # Assert
+            self.assertEqual(results[0]["step_count"], 7)
+            self.assertIn("error", results[1])
+
+    def test_unknown_threshold_is_rejected(self):
+        with self.assertRaises(ValueError):
+            resolve_thresholds({"squat_angle": 120})
+
+
+if __name__ == '__main__':
+    unittest.main()
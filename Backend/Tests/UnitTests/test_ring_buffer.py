@@ -0,0 +1,94 @@
+import unittest
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from ring_buffer import RingBuffer
+from balance_tracker import BalanceTracker
+
+class RingBufferTests(unittest.TestCase):
+    def test_keeps_the_last_values_in_order_after_wrapping(self):
+        # Arrange
+        buffer = RingBuffer(5)
+
+        # Act
+        for value in range(12):
+            buffer.append(value)
+
+        # Assert
+        self.assertEqual(len(buffer), 5)
+        self.assertEqual(buffer.total, 12)
+        self.assertEqual(buffer[-3:].tolist(), [9, 10, 11])
+        self.assertEqual(list(buffer), [7, 8, 9, 10, 11])
+
+    def test_windowed_reads_are_views(self):
+        # Arrange
+        buffer = RingBuffer(4, width=2)
+        for value in range(7):
+            buffer.append((value, -value))
+
+        # Act
+        window = buffer[-2:]
+
+        # Assert
+        self.assertTrue(np.shares_memory(window, buffer.data))
+        self.assertEqual(window[:, 1].tolist(), [-5, -6])
+        self.assertFalse(window.flags.writeable)
+
+    def test_spill_keeps_the_full_history(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            buffer = RingBuffer(4, spill_path=os.path.join(directory, 'history.bin'))
+
+            # Act
+            for value in range(11):
+                buffer.append(value)
+            history = buffer.history()
+            buffer.close()
+
+        # Assert
+        self.assertEqual(history.tolist(), list(range(11)))
+        self.assertEqual(len(buffer), 4)
+
+    def test_context_manager_closes_the_spill_file(self):
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            with RingBuffer(3, width=2, spill_path=os.path.join(directory, 'history.bin')) as buffer:
+                # Act
+                for value in range(8):
+                    buffer.append((value, 2 * value))
+
+            history = buffer.history()
+
+        # Assert
+        self.assertIsNone(buffer.spill_file)
+        self.assertEqual(history[:, 0].tolist(), list(range(8)))
+        self.assertEqual(history[:, 1].tolist(), [2 * value for value in range(8)])
+
+    def test_balance_tracker_spills_its_histories(self):
+        # Arrange
+        hips = [(0.5 + 0.01 * (value % 7), 0.5) for value in range(50)]
+        with tempfile.TemporaryDirectory() as directory:
+            tracker = BalanceTracker(capacity=10, spill_path=os.path.join(directory, 'scan_balance'))
+
+            # Act
+            for hip in hips:
+                tracker.add_frame_data(SimpleNamespace(hip_center=hip, shoulder_center=(0.5, 0.3),
+                                                       left_ankle=(0.45, 0.9), right_ankle=(0.55, 0.9)))
+            tracker.close()
+            history = tracker.hip_positions.history()
+            spilled = sorted(os.listdir(directory))
+
+        # Assert
+        self.assertEqual(spilled, ['scan_balance_ankle_positions.bin', 'scan_balance_hip_positions.bin',
+                                   'scan_balance_shoulder_positions.bin'])
+        self.assertEqual(history.tolist(), [list(hip) for hip in hips])
+        # the score covers every frame, not only the ones kept in memory
+        expected = 100 - min(100, np.var([hip[0] for hip in hips]) * 500)
+        self.assertAlmostEqual(tracker.calculate_balance_score(), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from roi_tracker import RoiPoseEstimator
+
+def person_landmarks(x0, y0, x1, y1):
+    """ 33 visible landmarks spread over a box, in normalized coordinates """
+    landmarks = np.ones((33, 4), dtype=np.float32)
+    landmarks[:, 0] = np.linspace(x0, x1, 33)
+    landmarks[:, 1] = np.linspace(y0, y1, 33)
+    landmarks[:, 2] = 0.0
+    return landmarks
+
+
+class FakeEstimator:
+    """ Returns the person box on full frames and a centered person on crops """
+    def __init__(self, frame_shape):
+        self.frame_shape = frame_shape
+        self.inputs = []
+        self.lose_person = False
+
+    def process(self, frame, timestamp=None):
+        self.inputs.append(frame.shape)
+        if self.lose_person:
+            return None
+        if frame.shape == self.frame_shape:
+            return person_landmarks(0.4, 0.3, 0.6, 0.7)
+        return person_landmarks(0.3, 0.3, 0.7, 0.7)
+
+
+class RoiPoseEstimatorTests(unittest.TestCase):
+    def test_second_frame_runs_on_crop_and_maps_back(self):
+        # Arrange
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        fake = FakeEstimator(frame.shape)
+        estimator = RoiPoseEstimator(fake, input_size=128, padding=0.25)
+
+        # Act
+        estimator.process(frame)
+        x0, y0, side = estimator.roi
+        landmarks = estimator.process(frame)
+
+        # Assert
+        self.assertEqual(fake.inputs[1], (128, 128, 3))
+        self.assertAlmostEqual(landmarks[0, 0], (x0 + 0.3 * side) / 1280, places=5)
+        self.assertAlmostEqual(landmarks[0, 1], (y0 + 0.3 * side) / 720, places=5)
+        self.assertEqual(estimator.stats()["roi_frames"], 1)
+
+    def test_falls_back_to_full_frame_when_lost(self):
+        # Arrange
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        fake = FakeEstimator(frame.shape)
+        estimator = RoiPoseEstimator(fake, input_size=128)
+        estimator.process(frame)
+
+        # Act
+        fake.lose_person = True
+        landmarks = estimator.process(frame)
+
+        # Assert
+        self.assertIsNone(landmarks)
+        self.assertIsNone(estimator.roi)
+        self.assertEqual(fake.inputs[-1], frame.shape)
+        self.assertEqual(estimator.stats()["lost_count"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
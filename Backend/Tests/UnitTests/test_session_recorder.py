@@ -0,0 +1,41 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from session_recorder import SessionRecorder, load_recording, CHUNK_SIZE
+
+class SessionRecorderTests(unittest.TestCase):
+    def test_recording_round_trip(self):
+        # Arrange
+        rng = np.random.default_rng(0)
+        frames = [rng.uniform(0, 1, (33, 4)).astype(np.float32) for _ in range(CHUNK_SIZE + 10)]
+
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = SessionRecorder(os.path.join(directory, 'scan.npy'))
+
+            # Act
+            for i, landmarks in enumerate(frames):
+                recorder.record(i / 30, None if i == 5 else landmarks, 1)
+            path = recorder.close({"events": [{"event": "start", "timestamp": 0.0}]})
+            recording = load_recording(path)
+
+            # Assert
+            self.assertEqual(len(recording["timestamps"]), len(frames))
+            self.assertIsInstance(recording["landmarks"], np.memmap)
+            np.testing.assert_allclose(recording["landmarks"][-1], frames[-1], atol=1e-3)
+            self.assertTrue(np.isnan(recording["landmarks"][5]).all())
+            self.assertAlmostEqual(float(recording["timestamps"][30]), 1.0)
+            self.assertEqual(recording["metadata"]["frame_count"], len(frames))
+            self.assertEqual(recording["metadata"]["events"][0]["event"], "start")
+            del recording
+
+    def test_empty_recording_loads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = SessionRecorder(os.path.join(directory, 'empty.npy')).close()
+            self.assertEqual(len(np.load(path)), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from stage_timer import LatencyHistogram, StageTimer
+
+class StageTimerTests(unittest.TestCase):
+    def test_percentiles_are_close_to_exact_ones(self):
+        # Arrange
+        durations = np.random.default_rng(0).lognormal(np.log(0.02), 0.5, 5000)
+        histogram = LatencyHistogram()
+
+        # Act
+        for duration in durations:
+            histogram.record(duration)
+
+        # Assert
+        for p in (50, 95, 99):
+            self.assertAlmostEqual(histogram.percentile(p) / np.percentile(durations, p), 1, delta=0.05)
+        self.assertEqual(histogram.maximum, durations.max())
+
+    def test_out_of_range_durations_are_kept(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0)
+        histogram.record(60.0)
+
+        self.assertEqual(histogram.count, 2)
+        self.assertEqual(histogram.percentile(100), 60.0)
+
+    def test_summary_of_measured_stages(self):
+        # Arrange
+        timer = StageTimer()
+
+        # Act
+        for _ in range(3):
+            timer.frame()
+            with timer.measure("pose_process"):
+                pass
+
+        # Assert
+        summary = timer.summary(dropped_frames=2)
+        self.assertEqual(summary["frames"], 3)
+        self.assertEqual(summary["dropped_frames"], 2)
+        self.assertEqual(summary["stages"]["pose_process"]["count"], 3)
+        self.assertGreater(summary["fps"], 0)
+
+    def test_capture_to_render_skips_dropped_frames(self):
+        # Arrange
+        timer = StageTimer()
+        for timestamp in (0.0, 0.1, 0.2):
+            timer.captured(timestamp)
+
+        # Act: the frame 0.1 was dropped by a stage queue, 0.3 was never captured
+        timer.rendered(0.0)
+        timer.rendered(0.2)
+        timer.rendered(0.3)
+
+        # Assert
+        self.assertEqual(timer.summary()["stages"]["capture_to_render"]["count"], 2)
+        self.assertEqual(len(timer.capture_times), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from streaming_stats import RunningStats, WindowedStats
+
+class StreamingStatsTests(unittest.TestCase):
+    def test_running_stats_match_numpy(self):
+        # Arrange
+        values = np.random.default_rng(0).normal(0.5, 0.02, 5000)
+        stats = RunningStats()
+
+        # Act
+        for value in values.tolist():
+            stats.add(value)
+
+        # Assert
+        self.assertAlmostEqual(stats.mean, np.mean(values), places=12)
+        self.assertAlmostEqual(stats.variance(), np.var(values), places=14)
+
+    def test_windowed_stats_match_numpy_on_the_last_values(self):
+        # Arrange
+        values = np.random.default_rng(1).normal(120, 15, 5000)
+        window = WindowedStats(30)
+
+        # Act / Assert
+        for i, value in enumerate(values.tolist()):
+            window.add(value)
+            if i % 97 == 0 or i == len(values) - 1:
+                recent = values[max(0, i - 29):i + 1]
+                self.assertAlmostEqual(window.variance(), np.var(recent), places=9)
+                self.assertEqual(window.minimum(), recent.min())
+                self.assertEqual(window.maximum(), recent.max())
+
+    def test_partial_window_uses_every_value(self):
+        # Arrange
+        window = WindowedStats(30)
+
+        # Act
+        for value in [1.0, 2.0, 4.0]:
+            window.add(value)
+
+        # Assert
+        self.assertEqual(window.count, 3)
+        self.assertAlmostEqual(window.variance(), np.var([1.0, 2.0, 4.0]))
+        self.assertEqual(window.range(), 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../benchmarks')))
+from synthetic_landmarks import generate_stream
+from batch_scoring import score_session
+
+class SyntheticLandmarkTests(unittest.TestCase):
+    def test_stream_shape_follows_duration_and_fps(self):
+        # Act
+        timestamps, landmarks = generate_stream("stepping", duration=10, fps=60)
+
+        # Assert
+        self.assertEqual(landmarks.shape, (600, 33, 4))
+        self.assertAlmostEqual(timestamps[1] - timestamps[0], 1 / 60)
+
+    def test_session_motion_completes_the_assessment(self):
+        for duration, fps in [(30, 30), (120, 60)]:
+            # Arrange
+            timestamps, landmarks = generate_stream("session", duration=duration, fps=fps)
+
+            # Act
+            result = score_session(landmarks, timestamps)
+
+            # Assert
+            self.assertTrue(result["completed"])
+            self.assertEqual((result["step_count"], result["squat_count"]), (10, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import os
+import sys
+import numpy as np
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from text_renderer import TextRenderer
+
+class TextRendererTests(unittest.TestCase):
+    def test_sprite_cache_evicts_least_recently_used(self):
+        # Arrange
+        renderer = TextRenderer(max_sprites=2)
+
+        # Act
+        first = renderer.get_sprite("Steps: 1/10", 28)
+        renderer.get_sprite("Steps: 2/10", 28)
+        renderer.get_sprite("Steps: 1/10", 28)
+        renderer.get_sprite("Steps: 3/10", 28)
+
+        # Assert
+        self.assertIs(renderer.get_sprite("Steps: 1/10", 28), first)
+        self.assertEqual(len(renderer.sprites), 2)
+        self.assertEqual(len(renderer.fonts), 1)
+
+    def test_draw_only_touches_text_region(self):
+        # Arrange
+        renderer = TextRenderer()
+        image = np.zeros((200, 300, 3), dtype=np.uint8)
+
+        # Act
+        renderer.draw(image, "AlignAI", (50, 50), font_size=20)
+
+        # Assert
+        self.assertTrue(image[40:80, 40:140].any())
+        self.assertFalse(image[120:, :].any())
+        self.assertFalse(image[:, 200:].any())
+
+    def test_draw_clips_at_frame_border(self):
+        image = np.zeros((40, 40, 3), dtype=np.uint8)
+        TextRenderer().draw(image, "Overall Score", (30, 30), font_size=28)
+        self.assertTrue(image[25:, 25:].any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import cv2
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../model')))
+from video_recorder import SessionVideoRecorder
+
+def read_video(path):
+    video = cv2.VideoCapture(path)
+    frame_count = int(video.get(cv2.CAP_PROP_FRAME_COUNT))
+    size = (int(video.get(cv2.CAP_PROP_FRAME_WIDTH)), int(video.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    fps = video.get(cv2.CAP_PROP_FPS)
+    video.release()
+    return frame_count, size, fps
+
+class VideoRecorderTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_frames_are_sampled_to_the_video_fps_and_resized(self):
+        # Arrange
+        path = os.path.join(self.directory.name, "session.mp4")
+        recorder = SessionVideoRecorder(path, fps=10, width=160, queue_size=64)
+        frame = np.zeros((240, 320, 3), dtype=np.uint8)
+
+        # Act: 3 s at 30 fps
+        for index in range(90):
+            recorder.submit(frame, index / 30.0)
+        video_path = recorder.close()
+
+        # Assert
+        frame_count, size, fps = read_video(video_path)
+        self.assertEqual(video_path, path)
+        self.assertEqual(frame_count, 30)
+        self.assertEqual(size, (160, 120))
+        self.assertAlmostEqual(fps, 10.0)
+        self.assertEqual(recorder.stats()["submitted"], 30)
+
+    def test_gaps_repeat_the_last_frame_to_keep_the_session_timing(self):
+        # Arrange
+        path = os.path.join(self.directory.name, "session.mp4")
+        recorder = SessionVideoRecorder(path, fps=10, width=None, queue_size=64)
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+        # Act: 1 s of frames, nothing for 1 s (e.g. frames dropped upstream), then one last frame at 2 s
+        for index in range(10):
+            recorder.submit(frame, index / 10.0)
+        recorder.submit(frame, 2.0)
+        video_path = recorder.close()
+        stats = recorder.stats()
+
+        # Assert
+        self.assertEqual(read_video(video_path)[0], 21)
+        self.assertEqual(stats["repeated"], 10)
+        self.assertEqual(stats["written"] - stats["repeated"], stats["submitted"] - stats["dropped"])
+
+    def test_submit_drops_frames_instead_of_waiting_for_the_encoder(self):
+        # Arrange
+        recorder = SessionVideoRecorder(os.path.join(self.directory.name, "session.mp4"), fps=30, width=None,
+                                        queue_size=1)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        # Act: submitted much faster than real time
+        for index in range(60):
+            recorder.submit(frame, index / 30.0)
+        recorder.close()
+        stats = recorder.stats()
+
+        # Assert
+        self.assertEqual(stats["submitted"], 60)
+        self.assertGreater(stats["dropped"], 0)
+        self.assertEqual(stats["max_queue_depth"], 1)
+        self.assertIsNone(stats["error"])
+
+    def test_nothing_submitted_writes_no_video(self):
+        # Arrange
+        recorder = SessionVideoRecorder(os.path.join(self.directory.name, "session.mp4"))
+
+        # Act
+        video_path = recorder.close()
+
+        # Assert
+        self.assertIsNone(video_path)
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, "session.mp4")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -17,8 +17,9 @@ def run_script():
             return jsonify({'error': 'Client ID must be an integer'}), 400
         
         scan_reason = data.get('scan_reason', 'Consult')
+        headless = bool(data.get('headless', False))
 
-        result = AIService.run_model(client_id, scan_reason)
+        result = AIService.run_model(client_id, scan_reason, headless=headless)
 
         return jsonify({'message': 'Scan started for client', 'client_id': client_id}), 200
 
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify, send_file
 from ..services.scan_services import ScanService
+from ..services.rescoring_service import RescoringService, resolve_recording_path
 import os
+import mimetypes
 
 scan_bp = Blueprint('scan', __name__)
 
@@ -34,6 +36,38 @@ def delete_scan(id):
     except Exception as e:
         return jsonify({'error': str(e)}), 400
 
+@scan_bp.route('/<int:id>/rescore', methods=['POST'])
+def rescore_scan(id):
+    try:
+        scan = ScanService.get_scan_by_id(id)
+        # e.g. {"thresholds": {"squat_down_angle": 120, "step_threshold": 0.04}}, missing ones keep their default
+        data = request.get_json(silent=True) or {}
+        score_set = RescoringService.rescore_scan(scan, data.get('thresholds'))
+        return jsonify(score_set.to_dict()), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
+
+@scan_bp.route('/<int:id>/video', methods=['GET'])
+def get_scan_video(id):
+    try:
+        scan = ScanService.get_scan_by_id(id)
+        if not scan.video_path:
+            return jsonify({'error': 'No video recorded for this scan'}), 404
+
+        # older scans stored the path relative to the directory the scan ran in, like the landmark recordings
+        try:
+            video_path = resolve_recording_path(scan.video_path)
+        except FileNotFoundError:
+            return jsonify({'error': 'Video file not found'}), 404
+
+        # the container follows the recorder settings (mp4, avi, ...), conditional responses answer
+        # the range requests of the browser video player
+        mimetype = mimetypes.guess_type(video_path)[0] or 'application/octet-stream'
+        return send_file(video_path, mimetype=mimetype, conditional=True)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 400
+
 
 @scan_bp.route('/download-report/<int:id>', methods=['GET'])
 def download_report(id):
@@ -7,8 +7,8 @@ import datetime
 
 class AIService:
     @staticmethod
-    def run_model(client_id, scan_reason="Consult"):
-        """ Run the assessment model as a detached process"""
+    def run_model(client_id, scan_reason="Consult", headless=False):
+        """ Run the assessment model as a detached process (headless skips the on-screen overlay) """
         base_directory = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         model_path = os.path.join(base_directory, 'model', 'model.py')
         log_file = os.path.join(base_directory, 'logs', 'model_output.log')
@@ -20,14 +20,15 @@ class AIService:
                 if client_id:
                     args = {
                         "client_id": int(client_id),
-                        "scan_reason": scan_reason
+                        "scan_reason": scan_reason,
+                        "headless": bool(headless)
                     }
                     args_json = json.dumps(args)
                     
                     # we use nohup on macOS to keep process running after parent terminates -> else we have a race condition
                     with open(log_file, 'a') as log:
                         log.write(f"\n--- Starting new scan at {datetime.datetime.now()} ---\n")
-                        log.write(f"Client ID: {client_id}, Reason: {scan_reason}\n")
+                        log.write(f"Client ID: {client_id}, Reason: {scan_reason}, Headless: {bool(headless)}\n")
                         
                         python_exe = sys.executable  
                         
@@ -0,0 +1,49 @@
+import os
+import sys
+import json
+from domain.models import db
+from domain.entities import Scan, ScanScoreSet
+
+# the scoring code lives with the model scripts, which import each other as top level modules
+MODEL_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'model')
+if MODEL_DIRECTORY not in sys.path:
+    sys.path.append(MODEL_DIRECTORY)
+
+from rescoring import rescore_recording, resolve_recording_path
+
+
+class RescoringService:
+    @staticmethod
+    def rescore_scan(scan, thresholds=None):
+        """ Scores a scan again from its landmark recording and saves the result as a new score set """
+        if not scan.recording_path:
+            raise ValueError(f'Scan {scan.id} has no landmark recording')
+        result = rescore_recording(scan.recording_path, thresholds)
+        return RescoringService.save_score_set(scan, result)
+
+    @staticmethod
+    def save_score_set(scan, result):
+        latest = ScanScoreSet.query.filter_by(scan_id=scan.id).order_by(ScanScoreSet.version.desc()).first()
+        scores = result['assessment_results']
+
+        score_set = ScanScoreSet(
+            scan_id=scan.id,
+            version=latest.version + 1 if latest else 1,
+            thresholds=json.dumps(result['thresholds']),
+            completed=result['completed'],
+            balance_score=scores['balance_score'],
+            stepping_score=scores['stepping_score'],
+            squat_score=scores['squat_score'],
+            posture_score=scores['posture_score'],
+            overall_score=scores['overall_score']
+        )
+        db.session.add(score_set)
+        db.session.commit()
+        return score_set
+
+    @staticmethod
+    def get_recorded_scans(scan_ids=None):
+        query = Scan.query.filter(Scan.recording_path.isnot(None))
+        if scan_ids:
+            query = query.filter(Scan.id.in_(scan_ids))
+        return query.order_by(Scan.id).all()
@@ -0,0 +1,48 @@
+import os
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIRECTORY = os.path.join(BENCHMARK_DIRECTORY, 'results')
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARK_DIRECTORY,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def machine_info():
+    """ What the results depend on besides the code """
+    import numpy as np
+
+    return {
+        "machine": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "numpy": np.__version__
+    }
+
+
+def save_report(suite, settings, results, output_directory=RESULTS_DIRECTORY):
+    """ Writes results/<suite>_<date>_<commit>.json and returns its path """
+    commit = git_commit()
+    report = {
+        "suite": suite,
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec='seconds'),
+        **machine_info(),
+        "settings": settings,
+        "results": results
+    }
+
+    os.makedirs(output_directory, exist_ok=True)
+    output_path = os.path.join(output_directory, f"{suite}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{commit or 'nocommit'}.json")
+    with open(output_path, 'w') as output_file:
+        json.dump(report, output_file, indent=4)
+    return output_path
@@ -0,0 +1,156 @@
+import os
+import sys
+import io
+import json
+import time
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmark_report import BENCHMARK_DIRECTORY, RESULTS_DIRECTORY, save_report
+sys.path.append(os.path.join(os.path.dirname(BENCHMARK_DIRECTORY), 'model'))
+
+try:
+    import resource  # not available on windows
+except ImportError:
+    resource = None
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.m4v', '.webm')
+
+DEFAULT_SETTINGS = {
+    "fixtures": os.path.join(BENCHMARK_DIRECTORY, 'fixtures'),  # directory of videos or list of video paths
+    # every fixture is replayed with every configuration, any run_assessment option can be set.
+    # The overlay is always rendered like in a real session and the frames go to a null display,
+    # "frame_width" resizes the decoded frames (camera resolution)
+    "configurations": [
+        {"name": "default"},
+        {"name": "debug_overlay", "debug_overlay": True},
+        # every frame through pose inference and the trackers: the latency budget the pipeline must hold
+        {"name": "worst_case", "motion_gate": False, "inference_scheduling": False},
+        {"name": "roi", "roi_tracking": True},
+        {"name": "inference_process", "inference_process": True},
+        {"name": "720p_input_384", "frame_width": 1280, "inference_width": 384},
+        {"name": "tflite_2_threads", "pose_backend": "tflite", "pose_backend_options": {"num_threads": 2}},
+    ],
+    "max_frames": None,  # frames replayed per fixture (None: the whole video)
+    "output": RESULTS_DIRECTORY
+}
+
+
+def list_fixtures(fixtures):
+    if isinstance(fixtures, list):
+        return fixtures
+    return sorted(os.path.join(fixtures, name) for name in os.listdir(fixtures) if name.lower().endswith(VIDEO_EXTENSIONS))
+
+
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on linux, bytes on macOS
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def cpu_seconds():
+    """ user + system cpu time of this process and of its finished children (inference process) """
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def run_fixture(fixture, configuration, max_frames=None):
+    """ Replays one fixture through the full pipeline in a fresh worker process and measures it """
+    from frame_source import FrameSource, VideoFileSource
+    from model import run_assessment, NullDisplay
+    import cv2
+
+    class BenchmarkSource(FrameSource):
+        """ Video file resized to the benchmarked camera resolution, limited to max_frames """
+        def __init__(self, path, frame_width=None):
+            self.video = VideoFileSource(path)
+            self.frame_width = frame_width
+            self.frame_count = 0
+
+        def read(self):
+            if max_frames is not None and self.frame_count >= max_frames:
+                return False, None, None
+            ret, frame, timestamp = self.video.read()
+            if ret and self.frame_width:
+                h, w = frame.shape[:2]
+                frame = cv2.resize(frame, (self.frame_width, int(h * self.frame_width / w)), interpolation=cv2.INTER_AREA)
+            self.frame_count += ret
+            return ret, frame, timestamp
+
+        def is_opened(self):
+            return self.video.is_opened()
+
+        def release(self):
+            self.video.release()
+
+    options = {key: value for key, value in configuration.items() if key not in ("name", "frame_width")}
+
+    cpu_start = cpu_seconds()
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        assessment_results = run_assessment(source=BenchmarkSource(fixture, configuration.get("frame_width")),
+                                            headless=False, display=NullDisplay(), record_landmarks=False,
+                                            generate_report=False, **options)
+    elapsed = time.perf_counter() - started
+    cpu_time = cpu_seconds() - cpu_start
+
+    performance = assessment_results["performance"]
+    # time from the capture of a frame to the end of its display, and time between two processed frames
+    capture_to_render = performance["stages"].get("capture_to_render", {})
+    frame_interval = performance["stages"].get("frame_interval", {})
+    return {
+        "fixture": os.path.basename(fixture),
+        "configuration": configuration.get("name"),
+        "frames": assessment_results["frame_count"],
+        "elapsed_s": round(elapsed, 3),
+        "sustained_fps": round(assessment_results["frame_count"] / elapsed, 2) if elapsed > 0 else 0.0,
+        "capture_to_render_ms": {key: capture_to_render.get(key) for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")},
+        "frame_interval_ms": {key: frame_interval.get(key) for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")},
+        # cpu seconds per wall second, above 100% when several threads or processes are busy
+        "cpu_percent": round(cpu_time / elapsed * 100, 1) if elapsed > 0 else 0.0,
+        "peak_rss_mb": round(peak_rss_bytes() / 2 ** 20, 1) if resource is not None else None,
+        "dropped_frames": performance["dropped_frames"],
+        "stages": performance["stages"],
+        "settings": {key: value for key, value in configuration.items() if key != "name"}
+    }
+
+
+def run_benchmark(settings):
+    """
+    Replays every fixture with every configuration. Each run gets its own spawned process so the peak RSS,
+    the cpu time and the mediapipe graph of a run do not leak into the next one, runs never overlap
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for fixture in list_fixtures(settings["fixtures"]):
+        for configuration in settings["configurations"]:
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+                try:
+                    result = executor.submit(run_fixture, fixture, configuration, settings["max_frames"]).result()
+                except Exception as e:
+                    result = {"fixture": os.path.basename(fixture), "configuration": configuration.get("name"),
+                              "error": str(e)}
+                    print(f"{result['fixture']:24s} {result['configuration']:20s} failed: {e}")
+                    results.append(result)
+                    continue
+
+            latency = result["capture_to_render_ms"]
+            print(f"{result['fixture']:24s} {result['configuration']:20s} {result['sustained_fps']:7.1f} fps, "
+                  f"capture to render p50 {latency['p50_ms']} ms, p95 {latency['p95_ms']} ms, p99 {latency['p99_ms']} ms, "
+                  f"cpu {result['cpu_percent']}%, rss {result['peak_rss_mb']} MB")
+            results.append(result)
+    return results
+
+
+if __name__ == "__main__":
+    # e.g. python pipeline_benchmark.py '{"fixtures": "../videos", "max_frames": 600}'
+    # python pipeline_benchmark.py '{"fixtures": ["clinic_a.mp4"], "configurations": [{"name": "lite", "inference_width": 320}]}'
+    settings = {**DEFAULT_SETTINGS, **(json.loads(sys.argv[1]) if len(sys.argv) > 1 else {})}
+
+    results = run_benchmark(settings)
+    output_path = save_report("pipeline", {key: settings[key] for key in ("configurations", "max_frames")},
+                              results, settings["output"])
+    print(f"\nResults saved to: {output_path}")
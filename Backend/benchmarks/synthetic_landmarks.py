@@ -0,0 +1,81 @@
+import numpy as np
+
+# mediapipe pose landmark indices moved by the synthetic motions
+LEFT_SHOULDER, RIGHT_SHOULDER = 11, 12
+LEFT_HIP, RIGHT_HIP = 23, 24
+LEFT_KNEE, RIGHT_KNEE = 25, 26
+LEFT_ANKLE, RIGHT_ANKLE = 27, 28
+
+# same preparation time as the assessment, the session motion starts stepping after it
+PREPARATION_TIME = 6.0
+
+
+def standing_pose():
+    """ (33, 4) landmarks of a person standing facing the camera, normalized coordinates like mediapipe """
+    landmarks = np.full((33, 4), 0.5, dtype=np.float64)
+    landmarks[:, 2] = 0.0
+    landmarks[:, 3] = 0.95
+    landmarks[:11, 1] = 0.15  # face
+    landmarks[[LEFT_SHOULDER, RIGHT_SHOULDER], 1] = 0.3
+    landmarks[[LEFT_HIP, RIGHT_HIP], 1] = 0.5
+    landmarks[[LEFT_KNEE, RIGHT_KNEE], 1] = 0.7
+    landmarks[[LEFT_ANKLE, RIGHT_ANKLE], 1] = 0.9
+    landmarks[[LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE, LEFT_ANKLE], 0] = 0.45
+    landmarks[[RIGHT_SHOULDER, RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE], 0] = 0.55
+    return landmarks
+
+
+def step(landmarks, phase):
+    """ Moves a foot up for the first half of each step period, alternating feet (phase in step periods) """
+    lift = max(0.0, np.sin(2 * np.pi * (phase % 1.0)))
+    foot = LEFT_ANKLE if int(phase) % 2 == 0 else RIGHT_ANKLE
+    knee = LEFT_KNEE if foot == LEFT_ANKLE else RIGHT_KNEE
+    landmarks[foot, 1] -= 0.1 * lift
+    landmarks[knee, 1] -= 0.05 * lift
+
+
+def squat(landmarks, phase):
+    """ Bends down to a ~75 degree knee angle and back up once per squat period """
+    depth = max(0.0, np.sin(2 * np.pi * (phase % 1.0)))
+    landmarks[[LEFT_HIP, RIGHT_HIP], 1] += 0.15 * depth
+    landmarks[[LEFT_HIP, RIGHT_HIP], 0] -= 0.1 * depth
+    landmarks[[LEFT_KNEE, RIGHT_KNEE], 0] += 0.12 * depth
+    landmarks[[LEFT_KNEE, RIGHT_KNEE], 1] += 0.02 * depth
+    landmarks[:13, 1] += 0.15 * depth
+    landmarks[:13, 0] += 0.05 * depth
+
+
+def generate_stream(motion="session", duration=30.0, fps=30.0, noise=0.003, seed=0):
+    """
+    Synthetic landmark stream of duration seconds at fps frames per second.
+    motion is "stepping" (steps in place), "squatting" (squats) or "session" (a full assessment:
+    preparation, 10 steps then 3 squats paced to end near the end of the stream).
+    Gaussian noise of std noise is added to x and y like mediapipe jitter.
+    Returns (timestamps, landmarks) with landmarks a (N, 33, 4) float32 array
+    """
+    rng = np.random.default_rng(seed)
+    frame_count = int(duration * fps)
+    timestamps = np.arange(frame_count) / fps
+    base = standing_pose()
+
+    # session pacing: 60% of the exercise time for 10.5 steps, 40% for 3.5 squats
+    exercise_time = max(duration - PREPARATION_TIME, 1.0)
+    step_period = 0.6 * exercise_time / 10.5 if motion == "session" else 1.2
+    squat_period = 0.4 * exercise_time / 3.5 if motion == "session" else 2.5
+    squat_start = PREPARATION_TIME + 10.5 * step_period
+
+    landmarks = np.empty((frame_count, 33, 4), dtype=np.float32)
+    for i, t in enumerate(timestamps):
+        frame = base.copy()
+        if motion == "stepping":
+            step(frame, t / step_period)
+        elif motion == "squatting":
+            squat(frame, t / squat_period)
+        elif t >= squat_start:
+            squat(frame, (t - squat_start) / squat_period)
+        elif t >= PREPARATION_TIME:
+            step(frame, (t - PREPARATION_TIME) / step_period)
+
+        frame[:, :2] += rng.normal(0, noise, (33, 2))
+        landmarks[i] = frame
+    return timestamps, landmarks
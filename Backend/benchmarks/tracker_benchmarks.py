@@ -0,0 +1,211 @@
+import os
+import sys
+import io
+import json
+import time
+import contextlib
+import tracemalloc
+
+from benchmark_report import BENCHMARK_DIRECTORY, RESULTS_DIRECTORY, save_report
+sys.path.append(os.path.join(os.path.dirname(BENCHMARK_DIRECTORY), 'model'))
+
+from synthetic_landmarks import generate_stream
+from pose_features import extract_features
+from balance_tracker import BalanceTracker
+from step_tracker import StepTracker
+from squat_tracker import SquatTracker
+from helpers import calculate_angles, calculate_posture_score
+from batch_scoring import score_session
+
+DEFAULT_SETTINGS = {
+    "durations": [30, 120],  # seconds of landmarks per stream
+    "fps": [30, 60],
+    "repeats": 3,
+    "noise": 0.003,
+    "output": RESULTS_DIRECTORY,
+    "compare": None,         # earlier result file to compare against
+    "tolerance": 0.1         # slowdown ratio reported as a regression
+}
+
+
+def bench_extract_features(stream):
+    _, landmarks = stream
+    def run():
+        for frame in landmarks:
+            extract_features(frame)
+    return run
+
+
+def bench_balance_tracker(stream):
+    features = stream_features(stream)
+    def run():
+        tracker = BalanceTracker()
+        for frame_features in features:
+            tracker.add_frame_data(frame_features)
+        tracker.calculate_balance_score()
+    return run
+
+
+def bench_step_tracker(stream):
+    timestamps, _ = stream
+    features = stream_features(stream)
+    def run():
+        tracker = StepTracker()
+        for current_time, frame_features in zip(timestamps, features):
+            tracker.detect_step(frame_features, current_time)
+    return run
+
+
+def bench_squat_tracker(stream):
+    timestamps, _ = stream
+    features = stream_features(stream)
+    def run():
+        tracker = SquatTracker()
+        for current_time, frame_features in zip(timestamps, features):
+            tracker.detect_squat(frame_features, current_time)
+    return run
+
+
+def bench_calculate_angles(stream):
+    _, landmarks = stream
+    points = [(frame[23, :2].tolist(), frame[25, :2].tolist(), frame[27, :2].tolist()) for frame in landmarks]
+    def run():
+        for hip, knee, ankle in points:
+            calculate_angles(hip, knee, ankle)
+    return run
+
+
+def bench_posture_score(stream):
+    # one posture score per frame over the trailing 90 spine angles
+    features = stream_features(stream)
+    angles = [frame_features.trunk_angle for frame_features in features]
+    def run():
+        for end in range(1, len(angles) + 1):
+            calculate_posture_score(angles[max(0, end - 90):end])
+    return run
+
+
+def bench_assessment_session(stream):
+    from model import AssessmentSession
+
+    timestamps, landmarks = stream
+    def run():
+        session = AssessmentSession()
+        for current_time, frame in zip(timestamps, landmarks):
+            session.start(current_time)
+            session.update(frame, current_time)
+    return run
+
+
+def bench_score_session(stream):
+    timestamps, landmarks = stream
+    def run():
+        score_session(landmarks, timestamps)
+    return run
+
+
+# name: (motion of the stream, setup returning the function to time)
+BENCHMARKS = {
+    "extract_features": ("session", bench_extract_features),
+    "balance_tracker": ("session", bench_balance_tracker),
+    "step_tracker": ("stepping", bench_step_tracker),
+    "squat_tracker": ("squatting", bench_squat_tracker),
+    "calculate_angles": ("session", bench_calculate_angles),
+    "posture_score": ("squatting", bench_posture_score),
+    "assessment_session": ("session", bench_assessment_session),
+    "score_session": ("session", bench_score_session),
+}
+
+
+def stream_features(stream):
+    _, landmarks = stream
+    return [extract_features(frame) for frame in landmarks]
+
+
+def measure(run, frame_count, repeats):
+    """ Best time over the repeats, then one traced run for memory """
+    # the trackers print on every step and squat, the output is not part of what we measure
+    with contextlib.redirect_stdout(io.StringIO()):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        blocks_before = sys.getallocatedblocks()
+        run()
+        blocks_after = sys.getallocatedblocks()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        "frames": frame_count,
+        "ns_per_frame": round(best / frame_count * 1e9, 1),
+        "frames_per_second": round(frame_count / best, 1),
+        "retained_blocks_per_frame": round((blocks_after - blocks_before) / frame_count, 3),
+        "peak_memory_bytes": peak_memory,
+        "repeats": repeats
+    }
+
+
+def run_benchmarks(settings):
+    """
+    Runs every benchmark on streams of each duration and frame rate. Each benchmark reports the best ns/frame
+    over the repeats, then runs once more under tracemalloc for the peak traced memory and the memory blocks
+    still allocated per frame at the end of the run (a hot path that starts keeping per frame objects shows up there)
+    """
+    results = []
+    streams = {}
+    for duration in settings["durations"]:
+        for fps in settings["fps"]:
+            for name, (motion, setup) in BENCHMARKS.items():
+                key = (motion, duration, fps)
+                if key not in streams:
+                    streams[key] = generate_stream(motion, duration, fps, noise=settings["noise"])
+                timestamps, _ = streams[key]
+
+                result = {"benchmark": name, "motion": motion, "duration_s": duration, "fps": fps,
+                          **measure(setup(streams[key]), len(timestamps), settings["repeats"])}
+                print(f"{name:20s} {duration:>5}s @ {fps:>3} fps: {result['ns_per_frame']:12.1f} ns/frame, "
+                      f"{result['retained_blocks_per_frame']:7.3f} blocks/frame, peak {result['peak_memory_bytes'] / 1024:9.1f} KiB")
+                results.append(result)
+    return results
+
+
+def compare_results(results, previous_path, tolerance):
+    """ Prints the speed ratio of every benchmark found in an earlier result file, returns the regressions """
+    with open(previous_path) as previous_file:
+        previous = json.load(previous_file)
+    previous_results = {(r["benchmark"], r["duration_s"], r["fps"]): r for r in previous["results"]}
+
+    regressions = []
+    print(f"\nCompared with {previous.get('commit')} ({previous_path})")
+    for result in results:
+        old = previous_results.get((result["benchmark"], result["duration_s"], result["fps"]))
+        if old is None:
+            continue
+        ratio = result["ns_per_frame"] / old["ns_per_frame"]
+        regressed = ratio > 1 + tolerance
+        if regressed:
+            regressions.append(result["benchmark"])
+        print(f"{result['benchmark']:20s} {result['duration_s']:>5}s @ {result['fps']:>3} fps: x{ratio:5.2f}"
+              f"{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    # e.g. python tracker_benchmarks.py '{"durations": [30, 300], "fps": [30, 60], "repeats": 5}'
+    # compare with an earlier run (exit code 1 on regressions):
+    # python tracker_benchmarks.py '{"compare": "results/tracker_20261018_101500_ab12cd3.json", "tolerance": 0.15}'
+    settings = {**DEFAULT_SETTINGS, **(json.loads(sys.argv[1]) if len(sys.argv) > 1 else {})}
+
+    results = run_benchmarks(settings)
+    output_path = save_report("tracker", {key: settings[key] for key in ("durations", "fps", "repeats", "noise")},
+                              results, settings["output"])
+    print(f"\nResults saved to: {output_path}")
+
+    if settings["compare"]:
+        regressions = compare_results(results, settings["compare"], settings["tolerance"])
+        sys.exit(1 if regressions else 0)
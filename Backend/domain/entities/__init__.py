@@ -1,6 +1,7 @@
 from .client import Client
 from .event import Event
 from .scan import Scan
+from .scan_score_set import ScanScoreSet
 from .user import User
 
-__all__ = ['Client', 'Event', 'Scan', 'User']
\ No newline at end of file
+__all__ = ['Client', 'Event', 'Scan', 'ScanScoreSet', 'User']
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from domain.models import db
 
@@ -19,9 +20,29 @@ class Scan(db.Model):
     # PDF report
     report_pdf = db.Column(db.String(255), nullable=True)
 
+    # settings of the processing that changes the landmarks (e.g. smoothing), stored as json
+    processing_settings = db.Column(db.Text, nullable=True)
+
+    # landmark recording of the session (memory mappable .npy, events in the .json next to it)
+    recording_path = db.Column(db.String(255), nullable=True)
+
+    # stage latencies of the assessment loop (p50/p95/p99, fps, dropped frames), stored as json
+    performance = db.Column(db.Text, nullable=True)
+
+    # video of the session (annotated frames), encoded while the assessment runs
+    video_path = db.Column(db.String(255), nullable=True)
+
     created_at = db.Column(db.DateTime, default=datetime.now)
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
+    # scores computed again from the landmark recording (e.g. after a threshold change)
+    score_sets = db.relationship(
+        'ScanScoreSet',
+        backref='scan',
+        lazy=True,
+        order_by='ScanScoreSet.version',
+        cascade="all, delete-orphan") # to ensure score sets are deleted when scan is deleted
+
 
     def __repr__(self):
         return f'<Scan {self.id} for Client {self.client_id}>'
@@ -48,6 +69,10 @@ class Scan(db.Model):
             'posture_score': self.posture_score,
             'overall_score': self.overall_score,
             'report_pdf': self.report_pdf,
+            'processing_settings': json.loads(self.processing_settings) if self.processing_settings else None,
+            'recording_path': self.recording_path,
+            'performance': json.loads(self.performance) if self.performance else None,
+            'video_path': self.video_path,
             'created_at': self.created_at,
             'updated_at': self.updated_at
         }
\ No newline at end of file
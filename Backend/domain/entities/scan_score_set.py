@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from domain.models import db
+
+class ScanScoreSet(db.Model):
+    """ Scores of a scan computed again from its landmark recording, with the thresholds used """
+    __tablename__ = 'scan_score_set'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    scan_id = db.Column(db.Integer, db.ForeignKey('scan.id'), nullable=False)
+    version = db.Column(db.Integer, nullable=False)  # 1 for the first re-scoring of a scan, then 2, 3...
+
+    # thresholds used for the scores, stored as json
+    thresholds = db.Column(db.Text, nullable=False)
+    completed = db.Column(db.Boolean, default=False)
+
+    balance_score = db.Column(db.Float, nullable=True)
+    stepping_score = db.Column(db.Float, nullable=True)
+    squat_score = db.Column(db.Float, nullable=True)
+    posture_score = db.Column(db.Float, nullable=True)
+    overall_score = db.Column(db.Float, nullable=True)
+
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    __table_args__ = (db.UniqueConstraint('scan_id', 'version'),)
+
+    def __repr__(self):
+        return f'<ScanScoreSet {self.version} for Scan {self.scan_id}>'
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'scan_id': self.scan_id,
+            'version': self.version,
+            'thresholds': json.loads(self.thresholds),
+            'completed': self.completed,
+            'balance_score': self.balance_score,
+            'stepping_score': self.stepping_score,
+            'squat_score': self.squat_score,
+            'posture_score': self.posture_score,
+            'overall_score': self.overall_score,
+            'created_at': self.created_at
+        }
@@ -1,39 +1,47 @@
-import numpy as np
+from ring_buffer import RingBuffer, spill_file_path
+from streaming_stats import RunningStats
+
+# positions kept in memory, 5 minutes at 30 fps. The balance score covers the whole session (running hip variance),
+# only the position histories of longer sessions are cut to their last 5 minutes, unless they spill to disk
+BALANCE_HISTORY = 9000
 
 class BalanceTracker:
-    def __init__(self):
-        self.hip_positions = []
-        self.shoulder_positions = []
-        self.ankle_positions = []
-        
-    def add_frame_data(self, landmarks, mp_pose):
-        """ Adds data of a frame to the respective lists for analysis """
-        left_hip = [landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].x, landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y]
-        right_hip = [landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].x, landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].y]
-        hip_center = [(left_hip[0] + right_hip[0])/2, (left_hip[1] + right_hip[1])/2]
-        self.hip_positions.append(hip_center)
-        
-        left_shoulder = [landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].x, landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y]
-        right_shoulder = [landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].x, landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].y]
-        shoulder_center = [(left_shoulder[0] + right_shoulder[0])/2, (left_shoulder[1] + right_shoulder[1])/2]
-        self.shoulder_positions.append(shoulder_center)
+    __slots__ = ('hip_positions', 'shoulder_positions', 'ankle_positions', 'hip_x_stats', 'hip_y_stats')
+
+    def __init__(self, capacity=BALANCE_HISTORY, spill_path=None):
+        # with spill_path, the position histories are also appended to <spill_path>_<history>.bin files
+        self.hip_positions = RingBuffer(capacity, width=2, spill_path=spill_file_path(spill_path, 'hip_positions'))
+        self.shoulder_positions = RingBuffer(capacity, width=2,
+                                             spill_path=spill_file_path(spill_path, 'shoulder_positions'))
+        # left x, left y, right x, right y
+        self.ankle_positions = RingBuffer(capacity, width=4, spill_path=spill_file_path(spill_path, 'ankle_positions'))
+
+        # running hip variance, the live sidebar score is O(1) per frame
+        self.hip_x_stats = RunningStats()
+        self.hip_y_stats = RunningStats()
         
-        left_ankle = [landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].x, landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y]
-        right_ankle = [landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].x, landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value].y]
-        self.ankle_positions.append([left_ankle, right_ankle])
+    def close(self):
+        """ Closes the spill files of the histories """
+        for history in (self.hip_positions, self.shoulder_positions, self.ankle_positions):
+            history.close()
+
+    def add_frame_data(self, features):
+        """ Adds data of a frame to the respective histories for analysis """
+        self.hip_positions.append(features.hip_center)
+        self.hip_x_stats.add(features.hip_center[0])
+        self.hip_y_stats.add(features.hip_center[1])
+        self.shoulder_positions.append(features.shoulder_center)
+        self.ankle_positions.append(features.left_ankle + features.right_ankle)
         
         
     def calculate_balance_score(self):
         """ Calculates the balance score based on hip position variance """
-        if len(self.hip_positions) < 10:   
+        if self.hip_x_stats.count < 10:   
             return 0
-            
-        hip_x_positions = [pos[0] for pos in self.hip_positions]
-        hip_y_positions = [pos[1] for pos in self.hip_positions]
         
         # lower variance in the hips position = better balance
-        x_variance = np.var(hip_x_positions)
-        y_variance = np.var(hip_y_positions)
+        x_variance = self.hip_x_stats.variance()
+        y_variance = self.hip_y_stats.variance()
         
         balance_score = 100 - min(100, (x_variance + y_variance) * 500)
         return max(0, balance_score)
\ No newline at end of file
@@ -0,0 +1,188 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from helpers import SCORE_KEYS
+
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.m4v', '.webm')
+
+
+def load_jobs(videos):
+    """
+    Videos to assess as a list of {"video": path, "client_id": id or None, "scan_reason": reason, "job": name}.
+    videos is a directory (every video file in it, sorted by name) or a json manifest listing
+    video paths or {"video": path, "client_id": 12, "scan_reason": "Consult"} entries,
+    relative paths in a manifest are relative to the manifest.
+    The job name keeps the recording, the log and the resume state of each job apart
+    """
+    if os.path.isdir(videos):
+        names = sorted(name for name in os.listdir(videos) if name.lower().endswith(VIDEO_EXTENSIONS))
+        entries = [os.path.join(videos, name) for name in names]
+        base_directory = videos
+    else:
+        with open(videos) as manifest:
+            entries = json.load(manifest)
+        base_directory = os.path.dirname(os.path.abspath(videos))
+
+    jobs = []
+    for entry in entries:
+        if isinstance(entry, str):
+            entry = {"video": entry}
+        job = {
+            "video": os.path.abspath(os.path.join(base_directory, entry["video"])),
+            "client_id": entry.get("client_id"),
+            "scan_reason": entry.get("scan_reason", "Consult")
+        }
+        job["job"] = job_name(job)
+        jobs.append(job)
+    return jobs
+
+
+def job_name(job):
+    """
+    Video name followed by a hash of its full path and client id, so same named videos of different
+    folders (or one video assessed for two clients) never share a recording, a log or a result line
+    """
+    digest = hashlib.sha1(f"{job['video']}|{job['client_id']}".encode()).hexdigest()[:10]
+    return f"{os.path.splitext(os.path.basename(job['video']))[0]}_{digest}"
+
+
+def read_finished(output_path):
+    """ Jobs that already have a successful result in the ndjson output (lines cut by a crash are ignored) """
+    finished = set()
+    if not os.path.exists(output_path):
+        return finished
+
+    with open(output_path) as output:
+        for line in output:
+            try:
+                result = json.loads(line)
+            except ValueError:
+                continue
+            if result.get("status") == "ok" and "job" in result:
+                finished.add(result["job"])
+    return finished
+
+
+def assess_video(job, options, log_dir):
+    """ Runs the full headless assessment of one video in a pool worker, the model output goes to a log file """
+    from model import run_assessment
+
+    name = job["job"]
+    os.makedirs(log_dir, exist_ok=True)
+    started = time.perf_counter()
+    with open(os.path.join(log_dir, f"{name}.log"), 'w') as log, contextlib.redirect_stdout(log):
+        # every video gets its own mediapipe graph (tracking state is not carried from one video to the next)
+        assessment_results = run_assessment(source=job["video"], headless=True, recording_name=f"{name}.npy",
+                                            generate_report=False, **options)
+
+    return {
+        **job,
+        "status": "ok",
+        "completed": assessment_results["completed"],
+        "scores": {key: assessment_results[key] for key in SCORE_KEYS},
+        "frame_count": assessment_results["frame_count"],
+        "duration_s": round(time.perf_counter() - started, 3),
+        "recording": assessment_results.get("recording"),
+        "processing_settings": assessment_results.get("processing_settings"),
+        "performance": assessment_results.get("performance")
+    }
+
+
+def run_batch(videos, output_path, workers=None, options=None, log_dir='../logs/batch', save_scan=None):
+    """
+    Assesses every video of a directory or manifest on a pool of worker processes.
+    Each result is appended to output_path as one json line as soon as its video is done, so a crashed
+    batch started again with the same output skips the videos that already succeeded.
+    save_scan(result) is called in this process for the results with a client_id (database write)
+    Returns the throughput summary of the run
+    """
+    jobs = load_jobs(videos)
+    finished = read_finished(output_path)
+    pending = [job for job in jobs if job["job"] not in finished]
+    print(f"{len(jobs)} videos, {len(jobs) - len(pending)} already assessed, {len(pending)} to go")
+
+    started = time.perf_counter()
+    frame_count = 0
+    assessed = 0
+    failed = 0
+
+    # a line cut by a crash would otherwise be glued to the first new result
+    if os.path.exists(output_path) and os.path.getsize(output_path):
+        with open(output_path, 'rb') as output:
+            output.seek(-1, os.SEEK_END)
+            needs_newline = output.read(1) != b'\n'
+    else:
+        needs_newline = False
+
+    # spawn: every worker starts clean, mediapipe graphs and opencv threads do not survive a fork
+    context = multiprocessing.get_context("spawn")
+    workers = max(1, min(workers or os.cpu_count() or 1, len(pending) or 1))
+    with open(output_path, 'a') as output, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        if needs_newline:
+            output.write('\n')
+
+        futures = {executor.submit(assess_video, job, options or {}, log_dir): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+                if save_scan is not None and result["client_id"] is not None:
+                    result["scan_id"] = save_scan(result)
+                frame_count += result["frame_count"]
+                assessed += 1
+            except Exception as e:
+                result = {**job, "status": "error", "error": str(e)}
+                failed += 1
+
+            line = json.dumps(result)
+            output.write(line + '\n')
+            output.flush()
+            os.fsync(output.fileno())
+            print(line)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "videos": assessed,
+        "failed": failed,
+        "skipped": len(jobs) - len(pending),
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "videos_per_minute": round(assessed / elapsed * 60, 2) if elapsed > 0 else 0,
+        "frames_per_second": round(frame_count / elapsed, 1) if elapsed > 0 else 0
+    }
+
+
+if __name__ == "__main__":
+    # e.g. python batch_assessment.py '{"videos": "../videos", "output": "../logs/batch.ndjson", "workers": 4}'
+    # options are passed to run_assessment, e.g. {"options": {"roi_tracking": true, "landmark_smoothing": false}}
+    args = json.loads(sys.argv[1])
+    output_path = args.get('output', 'batch_results.ndjson')
+
+    save_scan = None
+    if args.get('save_scans', True):
+        sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        try:
+            from app import create_app
+            from model import save_scan_to_db
+
+            app = create_app()
+
+            def save_scan(result):
+                # same scan record and client linked pdf as a live scan
+                with app.app_context():
+                    assessment_results = {**result["scores"], "processing_settings": result["processing_settings"],
+                                          "recording": result["recording"], "performance": result["performance"]}
+                    return save_scan_to_db(result["client_id"], result["scan_reason"], assessment_results, None).id
+        except ImportError as e:
+            print(f"Error importing Flask modules, scans will not be saved: {e}")
+
+    summary = run_batch(args['videos'], output_path, workers=args.get('workers'), options=args.get('options'),
+                        log_dir=args.get('log_dir', '../logs/batch'), save_scan=save_scan)
+    print(f"Batch throughput: {json.dumps(summary)}")
@@ -0,0 +1,281 @@
+import math
+import numpy as np
+from pose_features import extract_features_batch, LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE
+from step_tracker import STEP_WINDOW, calculate_stepping_score
+from squat_tracker import calculate_squat_score
+from helpers import SCORE_KEYS, resolve_thresholds, calculate_posture_score, calculate_overall_score
+from protocol import load_protocol, protocol_trackers, protocol_target, TRACKERS, CRITERION_TRACKERS
+
+# same windows and targets as the live trackers (standard protocol)
+STEPS_REQUIRED = 10
+SQUATS_REQUIRED = 3
+SQUAT_WINDOW = 30
+POSTURE_WINDOW = 90
+
+
+def calculate_angles_batch(a, b, c):
+    """ Batch version of helpers.calculate_angles, a, b and c are (N, 2) arrays, returns N angles in degrees """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    radians = np.arctan2(c[:, 1] - b[:, 1], c[:, 0] - b[:, 0]) - np.arctan2(a[:, 1] - b[:, 1], a[:, 0] - b[:, 0])
+    angle = np.abs(radians * 180.0 / np.pi)
+    return np.minimum(angle, 360 - angle)
+
+
+def calculate_spine_angle_batch(landmarks):
+    """ Batch version of helpers.calculate_spine_angle on a (N, 33, 4) landmark array """
+    landmarks = np.asarray(landmarks)
+    return calculate_angles_batch(landmarks[:, LEFT_SHOULDER, :2], landmarks[:, LEFT_HIP, :2], landmarks[:, LEFT_KNEE, :2])
+
+
+def trailing_windows(values, ends, window, start=0):
+    """
+    (len(ends), window) array with the values[max(start, end - window + 1):end + 1] of each end index,
+    right aligned and padded with nan on the left
+    """
+    indices = np.asarray(ends)[:, None] - np.arange(window - 1, -1, -1)[None, :]
+    padded = values[np.clip(indices, 0, None)].astype(np.float64)
+    padded[indices < start] = np.nan
+    return padded
+
+
+def calculate_balance_score_batch(hip_centers):
+    """ Batch version of BalanceTracker.calculate_balance_score on the (N, 2) hip centers of a session """
+    if len(hip_centers) < 10:
+        return 0
+
+    # lower variance in the hips position = better balance
+    variance = np.var(hip_centers[:, 0]) + np.var(hip_centers[:, 1])
+    balance_score = 100 - min(100, variance * 500)
+    return max(0, balance_score)
+
+
+def calculate_step_quality_batch(features, events, start=0):
+    """
+    Batch version of StepTracker.calculate_step_quality, quality of every step event at once.
+    features are the features (extract_features_batch) of the frames given to the step tracker, events the index
+    of each step in them, start the first frame the tracker got
+    """
+    events = np.asarray(events, dtype=np.intp)
+    if len(events) == 0:
+        return np.zeros(0)
+
+    hip_x = trailing_windows(features['hip_center'][:, 0], events, STEP_WINDOW, start)
+    hip_y = trailing_windows(features['hip_center'][:, 1], events, STEP_WINDOW, start)
+    spine = trailing_windows(features['spine_angle'], events, STEP_WINDOW, start)
+    shoulder_x = trailing_windows(features['shoulder_center'][:, 0], events, STEP_WINDOW, start)
+    left_knee = trailing_windows(features['left_knee_y'], events, STEP_WINDOW, start)
+    right_knee = trailing_windows(features['right_knee_y'], events, STEP_WINDOW, start)
+
+    # 1. hip displacement & stability (0-25 points)
+    hip_stability_score = 25 - np.minimum(25, (np.nanvar(hip_y, axis=1) + np.nanvar(hip_x, axis=1)) * 1000)
+
+    # 2. spine angle consistency (0-25 points)
+    spine_consistency_score = 25 - np.minimum(25, np.nanvar(spine, axis=1) * 0.5)
+
+    # 3. knee lift symmetry (0-25 points), only once more than a full window of frames was recorded
+    left_range = np.nanmax(left_knee, axis=1) - np.nanmin(left_knee, axis=1)
+    right_range = np.nanmax(right_knee, axis=1) - np.nanmin(right_knee, axis=1)
+    knee_symmetry_score = 25 - np.minimum(25, np.abs(left_range - right_range) * 500)
+    knee_symmetry_score = np.where(events - start + 1 > STEP_WINDOW, knee_symmetry_score, 12.5)
+
+    # 4. shoulder stability (0-25 points)
+    shoulder_stability_score = 25 - np.minimum(25, np.nanvar(shoulder_x, axis=1) * 1000)
+
+    return hip_stability_score + spine_consistency_score + knee_symmetry_score + shoulder_stability_score
+
+
+def calculate_squat_quality_batch(features, events, start=0):
+    """
+    Batch version of SquatTracker.calculate_squat_quality, quality of every squat event at once.
+    features are the features of the frames given to the squat tracker, events the index of each completed squat
+    in them, start the first frame the tracker got
+    """
+    events = np.asarray(events, dtype=np.intp)
+    if len(events) == 0:
+        return np.zeros(0)
+
+    knee_angles = trailing_windows(features['left_knee_angle'], events, SQUAT_WINDOW, start)
+    trunk_angles = trailing_windows(features['trunk_angle'], events, SQUAT_WINDOW, start)
+    knee_forward = trailing_windows(features['knee_forward'], events, SQUAT_WINDOW, start)
+
+    # deepest point of each squat (nan padding never wins)
+    deepest = np.nanargmin(knee_angles, axis=1)
+    rows = np.arange(len(events))
+    min_knee_angle = knee_angles[rows, deepest]
+    spine_angle = trunk_angles[rows, deepest]
+    knee_position = knee_forward[rows, deepest]
+
+    # 1. depth score (0-30 points)
+    depth_score = np.select([min_knee_angle < 90, min_knee_angle < 110, min_knee_angle < 130], [30, 25, 20], 15)
+
+    # 2. back angle score (0-25 points)
+    spine_score = np.select([
+        (65 <= spine_angle) & (spine_angle <= 75),
+        ((55 <= spine_angle) & (spine_angle < 65)) | ((75 < spine_angle) & (spine_angle <= 85)),
+        ((45 <= spine_angle) & (spine_angle < 55)) | ((85 < spine_angle) & (spine_angle <= 95)),
+    ], [25, 20, 15], 5)
+
+    # 3. knee position score (0-25 points)
+    knee_position_score = np.select([
+        (-0.1 < knee_position) & (knee_position < 0.3),
+        (0.3 <= knee_position) & (knee_position < 0.5),
+        ((-0.2 <= knee_position) & (knee_position <= -0.1)) | ((0.5 <= knee_position) & (knee_position < 0.6)),
+    ], [25, 20, 15], 10)
+
+    # 4. movement consistency score (0-20 points), rms of the frame to frame knee angle changes
+    movement_smoothness = np.sqrt(np.nanmean(np.square(np.diff(knee_angles, axis=1)), axis=1))
+    consistency_score = 20 - np.minimum(20, movement_smoothness * 3)
+
+    return depth_score + spine_score + knee_position_score + consistency_score
+
+
+def detect_step_events(ankle_diff, timestamps, threshold=0.05, max_steps=STEPS_REQUIRED):
+    """ Frame indices of the steps, same hysteresis as StepTracker.detect_step (max_steps=None counts them all) """
+    # only frames that can change the state are visited
+    candidates = np.flatnonzero((ankle_diff > threshold) | (ankle_diff < threshold / 2))
+    lifted = ankle_diff[candidates] > threshold
+    timestamps = timestamps[candidates].tolist()
+
+    events = []
+    is_stepping = False
+    last_step_time = 0
+    for index, is_lifted, current_time in zip(candidates.tolist(), lifted.tolist(), timestamps):
+        if is_lifted:
+            if not is_stepping and current_time - last_step_time > 0.5:
+                events.append(index)
+                is_stepping = True
+                last_step_time = current_time
+                if len(events) == max_steps:
+                    break
+        else:
+            is_stepping = False
+    return events
+
+
+def detect_squat_events(knee_angles, timestamps, max_squats=SQUATS_REQUIRED, down_angle=130, up_angle=160):
+    """ Frame indices of the completed squats, same state machine as SquatTracker.detect_squat (max_squats=None counts them all) """
+    candidates = np.flatnonzero((knee_angles < down_angle) | (knee_angles > up_angle))
+    down = knee_angles[candidates] < down_angle
+    timestamps = timestamps[candidates].tolist()
+
+    events = []
+    in_squat = False
+    last_squat_time = 0
+    for index, is_down, current_time in zip(candidates.tolist(), down.tolist(), timestamps):
+        if is_down:
+            if not in_squat and current_time - last_squat_time > 1.0:
+                in_squat = True
+        elif in_squat:
+            events.append(index)
+            in_squat = False
+            last_squat_time = current_time
+            if len(events) == max_squats:
+                break
+    return events
+
+
+def detect_tracker_events(tracker, frames, features, timestamps, thresholds):
+    """ Frame indices of the steps ("step") or squats ("squat") counted by a tracker fed with frames, in order """
+    if tracker == "step":
+        events = detect_step_events(features['ankle_diff'][frames], timestamps[frames],
+                                    threshold=thresholds["step_threshold"], max_steps=None)
+    else:
+        knee_angles = (features['left_knee_angle'][frames] + features['right_knee_angle'][frames]) / 2
+        events = detect_squat_events(knee_angles, timestamps[frames], max_squats=None,
+                                     down_angle=thresholds["squat_down_angle"], up_angle=thresholds["squat_up_angle"])
+    return frames[np.asarray(events, dtype=np.intp)]
+
+
+def replay_protocol(protocol, features, timestamps, start_time, thresholds):
+    """
+    Replays the phases of a protocol like AssessmentSession: a phase feeds every frame to its trackers until its
+    criterion is met (the frame meeting it is the last one of the phase), the next phase starts at that frame time.
+    Returns (completed, frame indices fed to each tracker, frame indices of the steps and squats)
+    """
+    frame_count = len(timestamps)
+    tracker_frames = {tracker: np.zeros(0, dtype=np.intp) for tracker in TRACKERS}
+    completed = True
+    start, phase_start_time = 0, start_time
+    for phase in protocol["phases"]:
+        criterion, target = next(iter(phase["until"].items()))
+        remaining = np.arange(start, frame_count, dtype=np.intp)
+        if criterion == "duration":
+            over = np.flatnonzero(timestamps[start:] - phase_start_time > target)
+            end = start + int(over[0]) if len(over) else None
+        else:
+            # the tracker keeps its state from the earlier phases running it, only the steps / squats
+            # of this phase count
+            tracker = CRITERION_TRACKERS[criterion]
+            counted = detect_tracker_events(tracker, np.concatenate([tracker_frames[tracker], remaining]),
+                                            features, timestamps, thresholds)
+            counted = counted[counted >= start]
+            required = math.ceil(target)
+            end = int(counted[required - 1]) if len(counted) >= required else None
+
+        phase_frames = remaining if end is None else remaining[:end - start + 1]
+        for tracker in phase["trackers"]:
+            tracker_frames[tracker] = np.concatenate([tracker_frames[tracker], phase_frames])
+        if end is None:
+            completed = False
+            break
+        start, phase_start_time = end + 1, timestamps[end]
+
+    events = {tracker: detect_tracker_events(tracker, tracker_frames[tracker], features, timestamps, thresholds)
+              for tracker in CRITERION_TRACKERS.values()}
+    return completed, tracker_frames, events
+
+
+def score_session(landmarks, timestamps, start_time=None, thresholds=None, protocol=None):
+    """
+    Scores a whole recorded session at once, same results as running the frames through AssessmentSession.
+    landmarks is the (N, 33, 4) array of the frames where a pose was found, timestamps their (N,) capture times,
+    start_time the timestamp of the first frame of the session (defaults to the first pose frame),
+    thresholds overrides the detection and scoring thresholds (see helpers.DEFAULT_THRESHOLDS),
+    protocol the exercise protocol of the session (any protocol, see protocol.py)
+    """
+    thresholds = resolve_thresholds(thresholds)
+    protocol = load_protocol(protocol)
+    landmarks = np.asarray(landmarks)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if start_time is None:
+        start_time = float(timestamps[0]) if len(timestamps) else 0.0
+
+    features = extract_features_batch(landmarks)
+    completed, tracker_frames, events = replay_protocol(protocol, features, timestamps, start_time, thresholds)
+
+    # the trackers only see their own frames, qualities are computed on the features of those frames
+    # and only once the tracker has more than 10 of them
+    step_features = {name: values[tracker_frames["step"]] for name, values in features.items()}
+    step_positions = np.searchsorted(tracker_frames["step"], events["step"])
+    step_qualities = calculate_step_quality_batch(step_features, step_positions[step_positions + 1 > 10]).tolist()
+
+    squat_features = {name: values[tracker_frames["squat"]] for name, values in features.items()}
+    squat_positions = np.searchsorted(tracker_frames["squat"], events["squat"])
+    squat_qualities = calculate_squat_quality_batch(squat_features, squat_positions[squat_positions + 1 > 10]).tolist()
+
+    # like the live assessment, scores are only given to completed sessions, and only for the trackers the protocol runs
+    trackers = protocol_trackers(protocol)
+    assessment_results = {key: 0 for key in SCORE_KEYS}
+    if completed:
+        if "balance" in trackers:
+            assessment_results["balance_score"] = calculate_balance_score_batch(features['hip_center'][tracker_frames["balance"]])
+        if "step" in trackers:
+            assessment_results["stepping_score"] = calculate_stepping_score(len(events["step"]), step_qualities,
+                                                                            protocol_target(protocol, "steps"))
+        if "squat" in trackers:
+            assessment_results["squat_score"] = calculate_squat_score(len(events["squat"]), squat_qualities)
+            posture_angles = squat_features['trunk_angle'][-POSTURE_WINDOW:]
+            assessment_results["posture_score"] = calculate_posture_score(posture_angles, thresholds)
+        assessment_results["overall_score"] = calculate_overall_score(assessment_results, protocol["score_weights"])
+
+    return {
+        "assessment_results": assessment_results,
+        "completed": completed,
+        "step_count": len(events["step"]),
+        "squat_count": len(events["squat"]),
+        "step_qualities": step_qualities,
+        "squat_qualities": squat_qualities,
+    }
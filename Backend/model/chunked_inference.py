@@ -0,0 +1,97 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import cv2
+
+from landmarks import NUM_LANDMARKS, LANDMARK_FIELDS
+from pose_estimator import PoseEstimator
+
+# frames inferred before each chunk (and thrown away) so mediapipe is already tracking at the chunk start
+DEFAULT_OVERLAP = 15
+
+
+def plan_chunks(frame_count, chunk_count, overlap=DEFAULT_OVERLAP):
+    """
+    Splits frame_count frames into chunk_count consecutive (warmup_start, start, end) chunks.
+    Frames warmup_start to start are only there to warm up the pose tracking, the last chunk
+    has no end (None) so frames past an inexact container frame count are not lost
+    """
+    chunk_count = max(1, min(chunk_count, frame_count))
+    bounds = np.linspace(0, frame_count, chunk_count + 1).astype(int).tolist()
+
+    chunks = []
+    for i in range(chunk_count):
+        start = bounds[i]
+        end = bounds[i + 1] if i < chunk_count - 1 else None
+        chunks.append((max(0, start - overlap), start, end))
+    return chunks
+
+
+def infer_chunk(path, warmup_start, start, end, fps, inference_width=None, pose_options=None):
+    """ Pose inference on frames start to end of a video file in a worker process, returns (timestamps, landmarks) """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video file {path}")
+    if warmup_start:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, warmup_start)
+
+    timestamps = []
+    landmarks = []
+    frame_index = warmup_start
+    with PoseEstimator(**(pose_options or {})) as pose_estimator:
+        while end is None or frame_index < end:
+            ret, frame = cap.read()
+            if not ret:
+                break
+
+            h, w = frame.shape[:2]
+            if inference_width and inference_width < w:
+                frame = cv2.resize(frame, (inference_width, int(h * inference_width / w)), interpolation=cv2.INTER_AREA)
+
+            # same timestamps as VideoFileSource, frames without a pose are kept as nan
+            frame_landmarks = pose_estimator.process(frame, frame_index / fps)
+            if frame_index >= start:
+                timestamps.append(frame_index / fps)
+                landmarks.append(np.nan if frame_landmarks is None else frame_landmarks)
+            frame_index += 1
+    cap.release()
+
+    stream = np.empty((len(landmarks), NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+    for i, frame_landmarks in enumerate(landmarks):
+        stream[i] = frame_landmarks
+    return np.asarray(timestamps, dtype=np.float64), stream
+
+
+def infer_video_chunked(path, workers=None, fps=None, overlap=DEFAULT_OVERLAP, inference_width=None, pose_options=None):
+    """
+    Runs pose inference on a video file split in one time chunk per worker process and stitches the
+    landmark streams back in frame order. Returns (timestamps, landmarks, stats), landmarks is a
+    (N, 33, 4) float32 array with nan rows where nobody was detected
+    """
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise IOError(f"Could not open video file {path}")
+    fps = fps or cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    workers = workers or os.cpu_count() or 1
+    chunks = plan_chunks(frame_count, workers, overlap)
+
+    # spawn: mediapipe graphs do not survive a fork, every worker builds its own
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as executor:
+        futures = [executor.submit(infer_chunk, path, warmup_start, start, end, fps, inference_width, pose_options)
+                   for warmup_start, start, end in chunks]
+        streams = [future.result() for future in futures]
+
+    timestamps = np.concatenate([chunk_timestamps for chunk_timestamps, _ in streams])
+    landmarks = np.concatenate([chunk_landmarks for _, chunk_landmarks in streams])
+    stats = {
+        "workers": len(chunks),
+        "overlap_frames": overlap,
+        "frames": len(timestamps),
+        "chunks": [len(chunk_timestamps) for chunk_timestamps, _ in streams]
+    }
+    return timestamps, landmarks, stats
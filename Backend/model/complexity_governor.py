@@ -0,0 +1,116 @@
+import time
+import numpy as np
+
+# pose settings from the best quality to the cheapest one
+GOVERNOR_LEVELS = [
+    {"model_complexity": 2, "input_scale": 1.0},
+    {"model_complexity": 1, "input_scale": 1.0},
+    {"model_complexity": 1, "input_scale": 0.75},
+    {"model_complexity": 0, "input_scale": 0.75},
+    {"model_complexity": 0, "input_scale": 0.5},
+]
+
+
+class ComplexityGovernor:
+    """
+    Measures pose inference latency and achieved FPS over windows of frames
+    and picks the best model complexity / input scale that keeps the target frame rate.
+    Upgrades only happen in idle phases (switching the model resets mediapipe tracking),
+    downgrades happen whenever the machine cannot keep up
+    """
+    def __init__(self, target_fps=25, start_level=1, window_size=30, upgrade_margin=0.6):
+        self.target_fps = target_fps
+        self.level = start_level
+        self.window_size = window_size
+        self.upgrade_margin = upgrade_margin
+
+        self.latencies = []
+        self.window_start = None
+        self.level_latency = {}  # level -> median inference latency measured at that level
+        self.unavailable_complexities = set()
+        self.last_fps = None
+        self.previous_level = start_level
+        self.history = []
+
+    @property
+    def settings(self):
+        return GOVERNOR_LEVELS[self.level]
+
+    def record(self, latency, idle_phase, timestamp=None):
+        """ Records one inference, returns the new settings when the level changes (None otherwise) """
+        now = time.perf_counter()
+        if self.window_start is None:
+            self.window_start = now
+
+        self.latencies.append(latency)
+        if len(self.latencies) < self.window_size:
+            return None
+
+        latencies = np.array(self.latencies)
+        median_latency = float(np.median(latencies))
+        p90_latency = float(np.percentile(latencies, 90))
+        elapsed = now - self.window_start
+        self.last_fps = (len(latencies) - 1) / elapsed if elapsed > 0 else None
+        self.level_latency[self.level] = median_latency
+
+        self.latencies = []
+        self.window_start = now
+
+        budget = 1.0 / self.target_fps
+        new_level = self.level
+        reason = None
+
+        cheaper_level = self.next_level(1)
+        better_level = self.next_level(-1)
+
+        if p90_latency > budget and cheaper_level is not None:
+            new_level = cheaper_level
+            reason = f"p90 inference {p90_latency * 1000:.1f} ms over the {budget * 1000:.1f} ms budget"
+        elif idle_phase and better_level is not None:
+            # unknown levels are assumed to cost twice the current one
+            estimate = self.level_latency.get(better_level, median_latency * 2)
+            if estimate < budget * self.upgrade_margin:
+                new_level = better_level
+                reason = f"estimated {estimate * 1000:.1f} ms fits the {budget * 1000:.1f} ms budget"
+
+        if new_level == self.level:
+            return None
+
+        self.previous_level = self.level
+        self.level = new_level
+        self.history.append({
+            "timestamp": timestamp,
+            **self.settings,
+            "reason": reason
+        })
+        print(f"Pose governor: switching to {self.settings} ({reason})")
+        return self.settings
+
+    def next_level(self, direction):
+        """ Closest level in the direction (+1 cheaper, -1 better) whose model is available """
+        level = self.level + direction
+        while 0 <= level < len(GOVERNOR_LEVELS):
+            if GOVERNOR_LEVELS[level]["model_complexity"] not in self.unavailable_complexities:
+                return level
+            level += direction
+        return None
+
+    def reject(self):
+        """ The estimator could not load the model of the current level, we go back to the previous one """
+        self.unavailable_complexities.add(self.settings["model_complexity"])
+        self.history[-1]["rejected"] = True
+        self.level = self.previous_level
+        return self.settings
+
+    def summary(self):
+        return {
+            "target_fps": self.target_fps,
+            **self.settings,
+            "achieved_fps": round(self.last_fps, 1) if self.last_fps else None,
+            "median_latency_ms": {
+                f"complexity_{GOVERNOR_LEVELS[level]['model_complexity']}_scale_{GOVERNOR_LEVELS[level]['input_scale']}": round(latency * 1000, 2)
+                for level, latency in sorted(self.level_latency.items())
+            },
+            "changes": self.history,
+            "unavailable_complexities": sorted(self.unavailable_complexities)
+        }
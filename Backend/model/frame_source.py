@@ -0,0 +1,161 @@
+import os
+import time
+import cv2
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+# settings requested to the camera, the device may pick the closest mode it supports
+DEFAULT_CAPTURE_SETTINGS = {
+    "width": 1280,
+    "height": 720,
+    "fps": 30,
+    "fourcc": "MJPG",   # MJPG allows higher resolutions and frame rates than YUYV over USB 2
+    "buffer_size": 1    # smallest internal buffer -> the frame we read is the most recent one
+}
+
+
+class FrameSource:
+    """ Base class for anything that can feed frames to the assessment loop """
+    # live sources are stamped with the wall clock, recorded ones with their own timeline
+    is_live = False
+
+    def read(self):
+        """ Returns (ret, frame, timestamp) where timestamp is the capture time in seconds """
+        raise NotImplementedError
+
+    def is_opened(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.release()
+
+
+class WebcamSource(FrameSource):
+    is_live = True
+
+    def __init__(self, index=0, capture_settings=None):
+        self.index = index
+        self.cap = cv2.VideoCapture(index)  # use 1 for built-in webcam, 0 for usb or external
+        self.settings = self.configure({**DEFAULT_CAPTURE_SETTINGS, **(capture_settings or {})})
+
+    def configure(self, requested):
+        """ Negotiates format, resolution, frame rate and buffer size with the device and returns what it accepted """
+        if not self.cap.isOpened():
+            return {}
+
+        # the pixel format has to be set before the resolution on most backends
+        if requested.get("fourcc"):
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*requested["fourcc"]))
+        if requested.get("width") and requested.get("height"):
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, requested["width"])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, requested["height"])
+        if requested.get("fps"):
+            self.cap.set(cv2.CAP_PROP_FPS, requested["fps"])
+        if requested.get("buffer_size"):
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, requested["buffer_size"])
+
+        fourcc_code = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        negotiated = {
+            "width": int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            "height": int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            "fps": self.cap.get(cv2.CAP_PROP_FPS),
+            "fourcc": "".join(chr((fourcc_code >> 8 * i) & 0xFF) for i in range(4)) if fourcc_code else None,
+            "buffer_size": int(self.cap.get(cv2.CAP_PROP_BUFFERSIZE))
+        }
+        print(f"Camera {self.index} capture settings: {negotiated}")
+        return negotiated
+
+    def read(self):
+        ret, frame = self.cap.read()
+        return ret, frame, time.time()
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    def __init__(self, path, fps=None):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open video file {path}")
+
+        # fall back on 30 fps when the container does not store a usable frame rate
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_index = 0
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret:
+            return False, None, None
+
+        # timestamps come from the frame position so replays can run faster than real time
+        timestamp = self.frame_index / self.fps
+        self.frame_index += 1
+        return True, frame, timestamp
+
+    def is_opened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageSequenceSource(FrameSource):
+    def __init__(self, directory, fps=30.0):
+        self.directory = directory
+        self.fps = fps
+        self.frame_paths = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.frame_paths:
+            raise IOError(f"No image frames found in {directory}")
+        self.frame_index = 0
+
+    def read(self):
+        while self.frame_index < len(self.frame_paths):
+            frame = cv2.imread(self.frame_paths[self.frame_index])
+            # the timestamp comes from the position in the sequence, a skipped file leaves a gap in the timeline
+            timestamp = self.frame_index / self.fps
+            self.frame_index += 1
+            if frame is not None:
+                return True, frame, timestamp
+            print(f"Could not read frame {self.frame_paths[self.frame_index - 1]}, skipping it")
+
+        return False, None, None
+
+    def is_opened(self):
+        return self.frame_index < len(self.frame_paths)
+
+
+def open_frame_source(source=None, fps=None, capture_settings=None):
+    """
+    Opens a frame source from a webcam index, a video file path or a directory of frames.
+    capture_settings (width, height, fps, fourcc, buffer_size) only apply to webcams
+    """
+    if isinstance(source, FrameSource):
+        return source
+
+    if source is None:
+        return WebcamSource(0, capture_settings)
+
+    if isinstance(source, int) or (isinstance(source, str) and source.isdigit()):
+        return WebcamSource(int(source), capture_settings)
+
+    if os.path.isdir(source):
+        return ImageSequenceSource(source, fps=fps or 30.0)
+
+    if os.path.isfile(source):
+        return VideoFileSource(source, fps=fps)
+
+    raise ValueError(f"Unknown frame source: {source}")
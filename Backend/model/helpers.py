@@ -1,5 +1,38 @@
 import numpy as np
-from mediapipe import solutions as mp_pose
+from pose_features import LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE
+
+# keys of assessment_results holding a score (other keys are extra info about the scan)
+SCORE_KEYS = ["balance_score", "stepping_score", "squat_score", "posture_score", "overall_score"]
+
+# weight of each exercise score in the overall score
+DEFAULT_SCORE_WEIGHTS = {
+    "balance_score": 0.25,
+    "stepping_score": 0.25,
+    "squat_score": 0.3,     # bigger weight score for the squats
+    "posture_score": 0.2,
+}
+
+# detection and scoring thresholds, recorded sessions can be re-scored with other values
+DEFAULT_THRESHOLDS = {
+    "step_threshold": 0.05,     # ankle height difference counted as a step
+    "squat_down_angle": 130,    # average knee angle entering a squat
+    "squat_up_angle": 160,      # average knee angle completing a squat
+    "posture_valid_min": 40,    # spine angles outside the valid band are not squat angles
+    "posture_valid_max": 100,
+    "posture_ideal_min": 55,    # average spine angle given the full posture score
+    "posture_ideal_max": 75,
+}
+
+
+def resolve_thresholds(thresholds=None):
+    """ Default thresholds updated with the given ones, unknown names raise a ValueError """
+    resolved = dict(DEFAULT_THRESHOLDS)
+    for name, value in (thresholds or {}).items():
+        if name not in DEFAULT_THRESHOLDS:
+            raise ValueError(f"Unknown threshold: {name}")
+        resolved[name] = float(value)
+    return resolved
+
 
 def calculate_angles(a, b, c):
     """ Helper function to calculate angles between three points """
@@ -16,11 +49,45 @@ def calculate_angles(a, b, c):
     return angle
 
 
-def calculate_spine_angle(landmarks, mp_pose):
-    """ Calculates the spine angle based on shoulder, hip and knee positions """
-    shoulder = [landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].x, landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y]
-    hip = [landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].x, landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y]
-    knee = [landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].x, landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].y]
-    
+def calculate_spine_angle(landmarks):
+    """ Calculates the spine angle based on shoulder, hip and knee positions of a (33, 4) landmark array """
+    shoulder = landmarks[LEFT_SHOULDER, :2]
+    hip = landmarks[LEFT_HIP, :2]
+    knee = landmarks[LEFT_KNEE, :2]
+
     spine_angle = calculate_angles(shoulder, hip, knee)
-    return spine_angle
\ No newline at end of file
+    return spine_angle
+
+
+def calculate_posture_score(spine_angles, thresholds=None):
+    """ Posture score from the spine angles recorded during the squats """
+    thresholds = thresholds or DEFAULT_THRESHOLDS
+    if len(spine_angles) == 0:
+        # default if no spine angles recorded
+        print("No spine angles recorded, using default score")
+        return 50
+
+    # calculate spine deviation
+    squat_spine_angles = [angle for angle in spine_angles if thresholds["posture_valid_min"] <= angle <= thresholds["posture_valid_max"]]
+
+    if not squat_spine_angles:
+        print("No valid squat spine angles found, using default score")
+        return 50
+
+    avg_spine_angle = sum(squat_spine_angles) / len(squat_spine_angles)
+
+    ideal_min, ideal_max = thresholds["posture_ideal_min"], thresholds["posture_ideal_max"]
+    if ideal_min <= avg_spine_angle <= ideal_max:
+        posture_score = 100
+    else:
+        # points are lost with the distance to the middle of the ideal band
+        posture_score = max(15, 100 - min(85, abs(avg_spine_angle - (ideal_min + ideal_max) / 2) * 3))
+
+    print(f"Average Spine Angle during squats: {avg_spine_angle:.1f}, Posture Score: {posture_score:.1f}%")
+    return posture_score
+
+
+def calculate_overall_score(assessment_results, weights=None):
+    """ Weighted sum of the exercise scores (DEFAULT_SCORE_WEIGHTS unless the protocol gives its own) """
+    weights = weights or DEFAULT_SCORE_WEIGHTS
+    return sum(assessment_results[key] * weight for key, weight in weights.items())
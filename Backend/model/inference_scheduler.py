@@ -0,0 +1,110 @@
+import numpy as np
+
+# how the landmarks of each frame were obtained
+FRAME_NO_POSE = 0       # inference ran, nobody detected
+FRAME_INFERRED = 1      # real pose inference
+FRAME_HELD = 2          # last real landmarks reused (idle phase, or not enough history to extrapolate)
+FRAME_EXTRAPOLATED = 3  # active phase, landmarks extrapolated from the last two real ones
+FRAME_SKIPPED = 4       # no inference and no landmarks to reuse
+FRAME_GATED = 5         # held back by the motion gate (nothing moved), the gate's last landmarks are reused
+
+
+class InferenceScheduler:
+    """
+    Decides frame by frame whether pose inference runs.
+    In idle phases inference runs at a reduced rate and the last landmarks are reused in between.
+    In active phases a frame is skipped when inference is behind its latency budget (latency debt),
+    and its landmarks are extrapolated from the last two inferred frames
+    """
+    def __init__(self, idle_rate=5.0, latency_budget=None, max_consecutive_skips=2, max_extrapolation=0.2):
+        self.idle_rate = idle_rate
+        self.latency_budget = latency_budget  # seconds per frame, None = never skip in active phases
+        self.max_consecutive_skips = max_consecutive_skips
+        self.max_extrapolation = max_extrapolation  # seconds after the last inference
+
+        self.last_inference_time = None
+        self.previous = None  # (timestamp, landmarks) of the inference before the last one
+        self.last = None      # (timestamp, landmarks) of the last inference
+        self.latency_debt = 0.0
+        self.consecutive_skips = 0
+
+        self.frame_kinds = bytearray()
+
+    def should_infer(self, current_time, idle_phase):
+        if self.last_inference_time is None:
+            return True
+
+        if idle_phase:
+            return current_time - self.last_inference_time >= 1.0 / self.idle_rate
+
+        if self.latency_budget is None or self.latency_debt <= 0:
+            return True
+
+        # behind budget: each skipped frame gives back one frame of budget
+        if self.consecutive_skips >= self.max_consecutive_skips or self.last is None:
+            return True
+        return False
+
+    def record_inference(self, current_time, landmarks, latency):
+        self.last_inference_time = current_time
+        self.consecutive_skips = 0
+        if self.latency_budget is not None:
+            self.latency_debt = max(0.0, self.latency_debt + latency - self.latency_budget)
+
+        if landmarks is None:
+            # a lost person must not be extrapolated from stale landmarks
+            self.previous = self.last = None
+            self.frame_kinds.append(FRAME_NO_POSE)
+        else:
+            self.previous, self.last = self.last, (current_time, landmarks)
+            self.frame_kinds.append(FRAME_INFERRED)
+
+    def record_gated(self):
+        """ Frame the motion gate kept from inference, before the scheduler was asked """
+        self.frame_kinds.append(FRAME_GATED)
+
+    def synthesize(self, current_time, idle_phase):
+        """ Landmarks for a frame without inference """
+        if not idle_phase:
+            self.consecutive_skips += 1
+            if self.latency_budget is not None:
+                self.latency_debt = max(0.0, self.latency_debt - self.latency_budget)
+
+        if self.last is None:
+            self.frame_kinds.append(FRAME_SKIPPED)
+            return None
+
+        last_time, last_landmarks = self.last
+        if idle_phase or self.previous is None:
+            self.frame_kinds.append(FRAME_HELD)
+            return last_landmarks
+
+        previous_time, previous_landmarks = self.previous
+        if last_time <= previous_time:
+            self.frame_kinds.append(FRAME_HELD)
+            return last_landmarks
+
+        # constant velocity extrapolation of x, y, z (visibility is kept from the last inference)
+        elapsed = min(current_time - last_time, self.max_extrapolation)
+        velocity = (last_landmarks[:, :3] - previous_landmarks[:, :3]) / (last_time - previous_time)
+        landmarks = last_landmarks.copy()
+        landmarks[:, :3] += velocity * elapsed
+
+        self.frame_kinds.append(FRAME_EXTRAPOLATED)
+        return landmarks
+
+    def stats(self):
+        kinds = np.frombuffer(bytes(self.frame_kinds), dtype=np.uint8)
+        total = len(kinds)
+        counts = np.bincount(kinds, minlength=6)
+        return {
+            "frames": total,
+            "inferred": int(counts[FRAME_INFERRED] + counts[FRAME_NO_POSE]),
+            "held": int(counts[FRAME_HELD]),
+            "extrapolated": int(counts[FRAME_EXTRAPOLATED]),
+            "skipped_without_pose": int(counts[FRAME_SKIPPED]),
+            "gated": int(counts[FRAME_GATED]),
+            "inference_rate": float((counts[FRAME_INFERRED] + counts[FRAME_NO_POSE]) / total) if total else 0.0,
+            "idle_rate_hz": self.idle_rate,
+            "latency_budget_ms": self.latency_budget * 1000 if self.latency_budget else None
+        }
@@ -0,0 +1,67 @@
+import numpy as np
+
+
+class OneEuroFilter:
+    """
+    One Euro adaptive low-pass filter applied to x, y and z of all 33 landmarks at once.
+    The cutoff frequency grows with the filtered speed of each coordinate: still landmarks are smoothed hard
+    (jitter removed), fast ones follow with little lag. Visibility is passed through unfiltered.
+    The filter restarts after the person was lost or after a gap of max_gap seconds.
+    Defaults are tuned for normalized coordinates: ~1 Hz cutoff when still, opening up quickly with movement
+    """
+    def __init__(self, min_cutoff=1.0, beta=10.0, d_cutoff=1.0, max_gap=0.5):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.max_gap = max_gap
+
+        self.previous = None     # last filtered (33, 3) coordinates
+        self.derivative = None   # last filtered (33, 3) speeds
+        self.previous_time = None
+
+    @staticmethod
+    def smoothing_factor(cutoff, elapsed):
+        tau = 1.0 / (2 * np.pi * cutoff)
+        return 1.0 / (1.0 + tau / elapsed)
+
+    def filter(self, landmarks, timestamp):
+        """ Filtered copy of a (33, 4) landmark array, None resets the filter """
+        if landmarks is None:
+            self.reset()
+            return None
+
+        coordinates = landmarks[:, :3]
+        elapsed = timestamp - self.previous_time if self.previous_time is not None else None
+        if elapsed is None or elapsed <= 0 or elapsed > self.max_gap:
+            self.previous = coordinates.astype(np.float32)
+            self.derivative = np.zeros_like(self.previous)
+            self.previous_time = timestamp
+            return landmarks
+
+        # filtered speed of every coordinate, then a per coordinate cutoff
+        speed = (coordinates - self.previous) / elapsed
+        alpha_d = self.smoothing_factor(self.d_cutoff, elapsed)
+        self.derivative += alpha_d * (speed - self.derivative)
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self.derivative)
+        alpha = 1.0 / (1.0 + 1.0 / (2 * np.pi * cutoff * elapsed))
+        self.previous += alpha * (coordinates - self.previous)
+        self.previous_time = timestamp
+
+        filtered = landmarks.copy()
+        filtered[:, :3] = self.previous
+        return filtered
+
+    def reset(self):
+        self.previous = None
+        self.derivative = None
+        self.previous_time = None
+
+    def settings(self):
+        return {
+            "filter": "one_euro",
+            "min_cutoff": self.min_cutoff,
+            "beta": self.beta,
+            "d_cutoff": self.d_cutoff,
+            "max_gap_s": self.max_gap
+        }
@@ -0,0 +1,52 @@
+import numpy as np
+import cv2
+
+# mediapipe pose always returns 33 landmarks, stored as (x, y, z, visibility) rows
+NUM_LANDMARKS = 33
+LANDMARK_FIELDS = 4
+
+# skeleton edges between landmark indices (same pairs as mp_pose.POSE_CONNECTIONS)
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+
+# landmarks less visible than this are not drawn (same threshold as mediapipe drawing utils)
+DRAW_MIN_VISIBILITY = 0.5
+
+
+def landmarks_to_array(landmark_list):
+    """ Converts mediapipe landmarks (NormalizedLandmarkList or its .landmark field) into a (33, 4) float32 array """
+    landmarks = getattr(landmark_list, 'landmark', landmark_list)
+    array = np.empty((NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+    for i, landmark in enumerate(landmarks):
+        array[i] = (landmark.x, landmark.y, landmark.z, landmark.visibility)
+    return array
+
+
+def draw_landmarks(image, landmarks, landmark_color=(0, 0, 255), connection_color=(0, 255, 0), thickness=2, circle_radius=2):
+    """
+    Draws the skeleton of a (33, 4) landmark array on a BGR image, in place.
+    Same look as mediapipe drawing_utils.draw_landmarks without converting the array back to a landmark list
+    """
+    h, w = image.shape[:2]
+    points = {}
+    for i, (x, y, z, visibility) in enumerate(landmarks.tolist()):
+        # landmarks outside the image are skipped like mediapipe does
+        if visibility < DRAW_MIN_VISIBILITY or not (0.0 <= x <= 1.0 and 0.0 <= y <= 1.0):
+            continue
+        points[i] = (min(int(x * w), w - 1), min(int(y * h), h - 1))
+
+    for start, end in POSE_CONNECTIONS:
+        if start in points and end in points:
+            cv2.line(image, points[start], points[end], connection_color, thickness)
+
+    border_radius = max(circle_radius + 1, int(circle_radius * 1.2))
+    for point in points.values():
+        cv2.circle(image, point, border_radius, (224, 224, 224), thickness)
+        cv2.circle(image, point, circle_radius, landmark_color, thickness)
+    return image
+
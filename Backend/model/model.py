@@ -1,25 +1,35 @@
-import mediapipe as mp
 import cv2
 import numpy as np
 import time
-from enum import Enum
 import json
 import sys
 import os
 import traceback
-from PIL import Image, ImageDraw, ImageFont
+import queue
+import threading
+from collections import deque
+from datetime import datetime
 
 from balance_tracker import BalanceTracker
 from step_tracker import StepTracker
 from squat_tracker import SquatTracker
-from helpers import calculate_spine_angle
-
-class ExerciseState(Enum):
-    WAITING = 0
-    STEPPING = 1  
-    SQUATTING = 2
-    COMPLETED = 3
-
+from frame_source import open_frame_source
+from pipeline import StageQueue, FrameGrabber, END_OF_STREAM, create_capture_queue
+from pose_estimator import create_pose_estimator
+from roi_tracker import RoiPoseEstimator
+from complexity_governor import ComplexityGovernor
+from inference_scheduler import InferenceScheduler, FRAME_NO_POSE, FRAME_INFERRED, FRAME_GATED
+from motion_gate import MotionGate
+from landmark_filter import OneEuroFilter
+from session_recorder import SessionRecorder
+from video_recorder import SessionVideoRecorder, VIDEO_SETTINGS
+from chunked_inference import infer_video_chunked, DEFAULT_OVERLAP
+from landmarks import draw_landmarks
+from pose_features import extract_features
+from helpers import SCORE_KEYS, resolve_thresholds, calculate_posture_score, calculate_overall_score
+from protocol import load_protocol, protocol_trackers, protocol_target
+from text_renderer import get_text_renderer
+from stage_timer import StageTimer
 
 """ Helper function for modern UI text using pillow """
 def add_modern_text(
@@ -30,59 +40,9 @@ def add_modern_text(
         text_color=(255, 255, 255), 
         with_background=True
     ):
-
-    if font_path is None:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        font_path = os.path.join(script_dir, "..", "fonts", "Nunito-Bold.ttf")
-
-    if not os.path.isfile(font_path):
-        print(f"Warning: Font file not found at {font_path}, using default font")
-        font = ImageFont.load_default()
-    else:
-        try:
-            font = ImageFont.truetype(font_path, font_size)
-        except Exception as e:
-            print(f"Error loading font: {str(e)}, using default font")
-            font = ImageFont.load_default()
-    
-    rgb_image = cv2.cvtColor(cv2_image, cv2.COLOR_BGR2RGB)
-    pil_image = Image.fromarray(rgb_image)
-    
-    draw = ImageDraw.Draw(pil_image)
-    
-    font = ImageFont.truetype(font_path, font_size)
-    if not font:
-        font = ImageFont.load_default()
-    
-    if hasattr(font, "getbbox"): # can be buggy 
-        # for newer pillow versions (9.2.0+)
-        bbox = font.getbbox(text)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-    elif hasattr(font, "getsize"):
-        # for pillow versions between 9.0.0 - 9.2.0
-        text_width, text_height = font.getsize(text)
-    else:
-        # for old pillow version
-        text_width, text_height = 0, 0
-    
-    if with_background:
-        # draw rounded rectangle background around the text (optional)
-        padding = 10
-        x, y = position
-        draw.rectangle(
-            [(x - padding, y - padding), 
-             (x + text_width + padding, y + text_height + padding)],
-            fill=(32, 33, 36, 180),
-            outline=(70, 70, 70),
-            width=1
-        )
-    
-    draw.text(position, text, font=font, fill=text_color)
-    
-    # we convert back to openCV format
-    result_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-    return result_image
+    # fonts and rasterized labels are cached, only the region covered by the text is touched
+    renderer = get_text_renderer(font_path)
+    return renderer.draw(cv2_image, text, position, font_size=font_size, text_color=text_color, with_background=with_background)
 
 
 def draw_progress_bar(image, progress, position, width=200, height=20):
@@ -93,330 +53,915 @@ def draw_progress_bar(image, progress, position, width=200, height=20):
     return image
 
 
-def run_assessment():
-    # initialize the trackers
-    balance_tracker = BalanceTracker()
-    step_tracker = StepTracker()
-    squat_tracker = SquatTracker()
-    
-    # exercise state
-    current_state = ExerciseState.WAITING
-    state_start_time = time.time()
-    instructions = "Get ready for stepping exercise"
-    
-    # assessment results dictionary
-    assessment_results = {
-        "balance_score": 0,
-        "stepping_score": 0,
-        "squat_score": 0,
-        "posture_score": 0,
-        "overall_score": 0
-    }
+def format_stage_latencies(timer):
+    """ One 'stage p50 / p95 ms' line per timed stage, with the frame rate first """
+    summary = timer.summary()
+    lines = [f"{summary['fps']:.1f} fps"]
+    for stage, latency in summary["stages"].items():
+        lines.append(f"{stage}: {latency['p50_ms']:.1f} / {latency['p95_ms']:.1f} ms")
+    return lines
 
-    # display dimensions -> can be adjusted depending on the screen
-    display_width = 1920
-    display_height = 1080
 
-    # global font sizes
-    FONT_TITLE = 34
-    FONT_HEADING = 32
-    FONT_SUBHEADING = 30
-    FONT_TEXT = 28
-    FONT_SIDEBAR = 14
-    
-    
-    # mediapipe poselandmark model
-    mp_drawing = mp.solutions.drawing_utils
-    mp_pose = mp.solutions.pose
-    
-    window_name = 'AlignAI Assessment'
-    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
-    cv2.resizeWindow(window_name, display_width, display_height)
+def draw_debug_overlay(image, lines):
+    """ Stage latencies in the bottom left corner of the frame """
+    h = image.shape[0]
+    line_height = max(14, h // 45)
+    y_position = h - line_height * (len(lines) + 1)
+    for line in lines:
+        image = add_modern_text(image, line, (10, y_position), font_size=line_height - 4, with_background=True)
+        y_position += line_height
+    return image
 
-    cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
-    
-    with mp_pose.Pose(min_detection_confidence=0.6, min_tracking_confidence=0.6) as pose:
-        # webcam activation
-        cap = cv2.VideoCapture(0)  # use 1 for built-in webcam, 0 for usb or external
-        
-        start_time = time.time()
-        
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                print("Failed to grab frame")
-                break
 
-            frame = cv2.resize(frame, (display_width, display_height))
-            
-            current_time = time.time()
-            
-            # process image for pose detection
-            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image.flags.writeable = False
-            results = pose.process(image)
-            image.flags.writeable = True
-            image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-            
-            # extract landmarks from the body
-            if results.pose_landmarks:
-                landmarks = results.pose_landmarks.landmark
-                
-                # update trackers based on current state
-                if current_state == ExerciseState.STEPPING:
-                    step_detected = step_tracker.detect_step(landmarks, mp_pose, current_time)
-                    balance_tracker.add_frame_data(landmarks, mp_pose)
-                    
-                    # check if stepping is complete
-                    if step_tracker.get_step_count() >= 10:
-                        current_state = ExerciseState.SQUATTING
-                        state_start_time = current_time
-                        instructions = "Now perform 3 squats"
-                        
-                elif current_state == ExerciseState.SQUATTING:
-                    squat_detected = squat_tracker.detect_squat(landmarks, mp_pose, current_time)
-                    balance_tracker.add_frame_data(landmarks, mp_pose)
-                    
-                    # check if squatting is complete
-                    if squat_tracker.get_squat_count() >= 3:
-                        current_state = ExerciseState.COMPLETED
-                        state_start_time = current_time
-                        instructions = "Assessment complete!"
-                        
-                        # calculate final scores
-                        assessment_results["balance_score"] = balance_tracker.calculate_balance_score()
-                        assessment_results["stepping_score"] = step_tracker.get_stepping_score()
-                        assessment_results["squat_score"] = squat_tracker.get_squat_score()
-                        
+# global font sizes
+FONT_TITLE = 34
+FONT_HEADING = 32
+FONT_SUBHEADING = 30
+FONT_TEXT = 28
+FONT_SIDEBAR = 14
 
-                        if squat_tracker.spine_angles:
-                            # calculate spine deviation
-                            spine_angles = squat_tracker.spine_angles[-90:]
 
-                            squat_spine_angles = [angle for angle in spine_angles if 40 <= angle <= 100]
+class AssessmentSession:
+    """
+    Holds the trackers and runs the phases of an exercise protocol (see protocol.py) on a single assessment.
+    Each phase only extracts the pose features and updates the trackers it lists, phases without trackers are idle
+    """
+    def __init__(self, thresholds=None, timer=None, protocol=None, spill_path=None):
+        # detection and scoring thresholds (helpers.DEFAULT_THRESHOLDS updated with the given ones)
+        self.thresholds = resolve_thresholds(thresholds)
+        self.protocol = load_protocol(protocol)
 
-                            if squat_spine_angles:
-                                avg_spine_angle = sum(squat_spine_angles) / len(squat_spine_angles)
+        # latency of each stage of the assessment loop, trackers included
+        self.timer = timer or StageTimer()
 
-                                if 55 <= avg_spine_angle <= 75:
-                                    posture_score = 100
-                                else:
-                                    posture_score = max(15, 100 - min(85, abs(avg_spine_angle - 65) * 3))
+        # with spill_path, the tracker histories are also written to <spill_path>_<tracker>_<history>.bin files
+        spill_paths = {tracker: None if spill_path is None else f"{spill_path}_{tracker}"
+                       for tracker in ("balance", "step", "squat")}
+        self.balance_tracker = BalanceTracker(spill_path=spill_paths["balance"])
+        self.step_tracker = StepTracker(step_threshold=self.thresholds["step_threshold"],
+                                        spill_path=spill_paths["step"])
+        self.squat_tracker = SquatTracker(down_angle=self.thresholds["squat_down_angle"],
+                                          up_angle=self.thresholds["squat_up_angle"],
+                                          spill_path=spill_paths["squat"])
 
-                                print(f"Average Spine Angle during squats: {avg_spine_angle:.1f}, Posture Score: {posture_score:.1f}%")
-                            else:    
-                                posture_score = 50 
-                                print("No valid squat spine angles found, using default score")  
+        # tracker name: (timed stage, update function)
+        self.tracker_updates = {
+            "step": ("step_tracker", self.update_step_tracker),
+            "squat": ("squat_tracker", self.update_squat_tracker),
+            "balance": ("balance_tracker", self.update_balance_tracker),
+        }
 
-                        else:
-                            # default if no spine angles recorded
-                            posture_score = 50
-                            print("No spine angles recorded, using default score")    
+        self.phase_index = 0
+        self.phase = self.protocol["phases"][0]
+        self.phase_start_counts = {"steps": 0, "squats": 0}
+        self.state_start_time = None  # set from the first frame timestamp
+        self.instructions = self.phase["instructions"]
 
+        self.assessment_results = {key: 0 for key in SCORE_KEYS}
 
-                        assessment_results["posture_score"] = posture_score
-                        
-                        # calculate overall score
-                        assessment_results["overall_score"] = (
-                            assessment_results["balance_score"] * 0.25 +
-                            assessment_results["stepping_score"] * 0.25 +
-                            assessment_results["squat_score"] * 0.3 +   # bigger weight score for the squats
-                            assessment_results["posture_score"] * 0.2
-                        )
-                        
-                # start stepping after 5 seconds of preparation
-                elif current_state == ExerciseState.WAITING and current_time - state_start_time > 5:
-                    current_state = ExerciseState.STEPPING
-                    state_start_time = current_time
-                    instructions = "Perform 10 steps in place"
-            
-            # draw skeleton from mediapipe
-            if results.pose_landmarks:
-                mp_drawing.draw_landmarks(
-                    image, results.pose_landmarks, mp_pose.POSE_CONNECTIONS,
-                    mp_drawing.DrawingSpec(color=(0,0,255), thickness=3, circle_radius=5),
-                    mp_drawing.DrawingSpec(color=(0,255,0), thickness=3, circle_radius=5)
-                )
-            
-            # current scores will be displayed on the right side
-            h, w = image.shape[:2]
-            sidebar_width = 300  # can be adjusted depending on the screen size and font size
-            
-            # sidebar title
+        # phase changes, steps and squats with their timestamp (saved with the landmark recording)
+        self.events = []
+
+    def close(self):
+        """ Closes the spill files of the tracker histories """
+        for tracker in (self.balance_tracker, self.step_tracker, self.squat_tracker):
+            tracker.close()
+
+    def start(self, current_time):
+        if self.state_start_time is None:
+            self.state_start_time = current_time
+            self.events.append({"event": "start", "timestamp": current_time})
+
+    def next_phase(self, current_time):
+        self.phase_index += 1
+        self.state_start_time = current_time
+        if self.is_completed():
+            self.phase = None
+            self.instructions = self.protocol["completed_instructions"]
+            self.events.append({"event": "phase", "phase": "COMPLETED", "timestamp": current_time})
+            self.calculate_final_scores()
+            return
+
+        self.phase = self.protocol["phases"][self.phase_index]
+        self.instructions = self.phase["instructions"]
+        self.phase_start_counts = {"steps": self.step_tracker.get_step_count(), "squats": self.squat_tracker.get_squat_count()}
+        self.events.append({"event": "phase", "phase": self.phase["name"], "timestamp": current_time})
+
+    def update_step_tracker(self, features, current_time):
+        if self.step_tracker.detect_step(features, current_time):
+            self.events.append({"event": "step", "timestamp": current_time})
+
+    def update_squat_tracker(self, features, current_time):
+        if self.squat_tracker.detect_squat(features, current_time):
+            self.events.append({"event": "squat", "timestamp": current_time})
+
+    def update_balance_tracker(self, features, current_time):
+        self.balance_tracker.add_frame_data(features)
+
+    def update(self, landmarks, current_time):
+        """ Updates the trackers of the current phase and moves to the next phase when its criterion is met """
+        if self.is_completed():
+            return
+
+        trackers = self.phase["trackers"]
+        if trackers:
+            timer = self.timer
+            # landmarks are converted once into the features shared by all the trackers
+            with timer.measure("features"):
+                features = extract_features(landmarks)
+            for tracker in trackers:
+                stage, update = self.tracker_updates[tracker]
+                with timer.measure(stage):
+                    update(features, current_time)
+
+        if self.phase_done(current_time):
+            self.next_phase(current_time)
+
+    def phase_progress(self):
+        """ (count, target) of the steps or squats counted during the current phase, None for timed phases """
+        criterion, target = next(iter(self.phase["until"].items()))
+        if criterion == "steps":
+            return self.step_tracker.get_step_count() - self.phase_start_counts["steps"], target
+        if criterion == "squats":
+            return self.squat_tracker.get_squat_count() - self.phase_start_counts["squats"], target
+        return None
+
+    def phase_done(self, current_time):
+        duration = self.phase["until"].get("duration")
+        if duration is not None:
+            return current_time - self.state_start_time > duration
+        count, target = self.phase_progress()
+        return count >= target
+
+    def calculate_final_scores(self):
+        assessment_results = self.assessment_results
+        # scores of trackers the protocol never runs stay at 0
+        trackers = protocol_trackers(self.protocol)
+        if "balance" in trackers:
+            assessment_results["balance_score"] = self.balance_tracker.calculate_balance_score()
+        if "step" in trackers:
+            assessment_results["stepping_score"] = self.step_tracker.get_stepping_score(protocol_target(self.protocol, "steps"))
+        if "squat" in trackers:
+            assessment_results["squat_score"] = self.squat_tracker.get_squat_score()
+            # posture from the spine angles of the last squats (last 90 frames)
+            assessment_results["posture_score"] = calculate_posture_score(self.squat_tracker.spine_angles[-90:], self.thresholds)
+        assessment_results["overall_score"] = calculate_overall_score(assessment_results, self.protocol["score_weights"])
+
+    def is_completed(self):
+        return self.phase_index >= len(self.protocol["phases"])
+
+    def is_idle(self):
+        """ No tracker uses the landmarks (preparation, rest phases and once the assessment is over) """
+        return self.is_completed() or not self.phase["trackers"]
+
+    def is_finished(self, current_time, hold_time=5):
+        """ The assessment window stays open a few seconds to show the final scores """
+        return self.is_completed() and current_time - self.state_start_time > hold_time
+
+    def snapshot(self):
+        """ Copy of everything the overlay needs, so rendering can run while the trackers keep updating """
+        step_qualities = self.step_tracker.step_qualities
+        squat_qualities = self.squat_tracker.squat_qualities
+
+        progress = None
+        if not self.is_completed() and self.phase_progress() is not None:
+            criterion = next(iter(self.phase["until"]))
+            count, target = self.phase_progress()
+            progress = {"label": criterion.title(), "count": count, "target": target}
+
+        return {
+            "phase": "COMPLETED" if self.is_completed() else self.phase["name"],
+            "completed": self.is_completed(),
+            "trackers": [] if self.is_completed() else list(self.phase["trackers"]),
+            "progress": progress,
+            "state_start_time": self.state_start_time,
+            "instructions": self.instructions,
+            "assessment_results": dict(self.assessment_results),
+            "step_count": self.step_tracker.get_step_count(),
+            "squat_count": self.squat_tracker.get_squat_count(),
+            # live balance score only if we have enough frames
+            "balance_score": self.balance_tracker.calculate_balance_score() if len(self.balance_tracker.hip_positions) > 10 else None,
+            "step_quality": sum(step_qualities) / len(step_qualities) if step_qualities else None,
+            "squat_quality": sum(squat_qualities) / len(squat_qualities) if squat_qualities else None
+        }
+
+
+def render_overlay(image, view, pose_landmarks, current_time):
+    """
+    Draws the skeleton, the sidebar scores and the exercise instructions from a session snapshot.
+    The layout is designed for 1080p and scaled to the frame height, so the overlay is drawn at capture resolution
+    """
+    assessment_results = view["assessment_results"]
+
+    h, w = image.shape[:2]
+    scale = h / 1080
+
+    def px(value):
+        return max(1, int(round(value * scale)))
+
+    # draw skeleton from the pose landmarks
+    if pose_landmarks is not None:
+        draw_landmarks(image, pose_landmarks, landmark_color=(0,0,255), connection_color=(0,255,0),
+                       thickness=px(3), circle_radius=px(5))
+    
+    # current scores will be displayed on the right side
+    sidebar_width = px(300)  # can be adjusted depending on the screen size and font size
+    
+    # sidebar title (static, pre-composited once per frame size)
+    image = get_text_renderer().draw_static(image, [
+        ("AlignAI", (w-sidebar_width+px(20), px(50)), px(FONT_TITLE), (200, 200, 255), True)
+    ])
+    
+    # add scores to sidebar
+    if view["completed"]:
+        # show all final scores in sidebar (they no longer change, so they are pre-composited too)
+        final_scores = []
+        y_pos = px(120)
+        for label in SCORE_KEYS:
+            score_text = f"{label.replace('_', ' ').title()}: {assessment_results[label]:.1f}%"
+            final_scores.append((score_text, (w-sidebar_width+px(20), y_pos), px(FONT_SUBHEADING), (255, 255, 255), True))
+            y_pos += px(50)
+        image = get_text_renderer().draw_static(image, final_scores)
+    else:
+        # we show live progress
+        
+        # add phase info
+        image = add_modern_text(
+            image,
+            f"Phase: {view['phase']}", 
+            (w-sidebar_width+px(20), px(120)),
+            font_size=px(FONT_TEXT),
+            text_color=(255, 255, 255),
+            with_background=True
+        )
+        
+        # add live balance score if we have enough frames
+        if view["balance_score"] is not None:
+            bal_score = view["balance_score"]
             image = add_modern_text(
-                image, 
-                "AlignAI", 
-                (w-sidebar_width+20, 50),
-                font_size=FONT_TITLE,
-                text_color=(200, 200, 255),
+                image,
+                f"Balance: {bal_score:.1f}%", 
+                (w-sidebar_width+px(20), px(170)),
+                font_size=px(FONT_TEXT),
+                text_color=(255, 255, 255),
                 with_background=True
             )
-            
-            # add scores to sidebar
-            if current_state == ExerciseState.COMPLETED:
-                # show all final scores in sidebar
-                y_pos = 120
-                for label, value in assessment_results.items():
-                    score_text = f"{label.replace('_', ' ').title()}: {value:.1f}%"
-                    image = add_modern_text(
-                        image,
-                        score_text, 
-                        (w-sidebar_width+20, y_pos), 
-                        font_size=FONT_SUBHEADING,
-                        text_color=(255, 255, 255),
-                        with_background=True
-                    )
-                    y_pos += 50
-            else:
-                # we show live progress
-                
-                # add phase info
+        
+        quality_y = 220
+
+        # add step quality if steps have been detected
+        if "step" in view["trackers"] and view["step_count"] > 0:
+            if view["step_quality"] is not None:
+                step_quality = view["step_quality"]
                 image = add_modern_text(
                     image,
-                    f"Phase: {current_state.name}", 
-                    (w-sidebar_width+20, 120),
-                    font_size=FONT_TEXT,
+                    f"Step Quality: {step_quality:.1f}", 
+                    (w-sidebar_width+px(20), px(quality_y)),
+                    font_size=px(FONT_TEXT),
                     text_color=(255, 255, 255),
                     with_background=True
                 )
-                
-                # add live balance score if we have enough frames
-                if len(balance_tracker.hip_positions) > 10:
-                    bal_score = balance_tracker.calculate_balance_score()
-                    image = add_modern_text(
-                        image,
-                        f"Balance: {bal_score:.1f}%", 
-                        (w-sidebar_width+20, 170),
-                        font_size=FONT_TEXT,
-                        text_color=(255, 255, 255),
-                        with_background=True
-                    )
-                
-                # add step quality if steps have been detected
-                if current_state == ExerciseState.STEPPING and step_tracker.get_step_count() > 0:
-                    if len(step_tracker.step_qualities) > 0:
-                        step_quality = sum(step_tracker.step_qualities) / len(step_tracker.step_qualities)
-                        image = add_modern_text(
-                            image,
-                            f"Step Quality: {step_quality:.1f}", 
-                            (w-sidebar_width+20, 220),
-                            font_size=FONT_TEXT,
-                            text_color=(255, 255, 255),
-                            with_background=True
-                        )
-                
-                # add squat quality if squats have been detected
-                if current_state == ExerciseState.SQUATTING and squat_tracker.get_squat_count() > 0:
-                    if len(squat_tracker.squat_qualities) > 0:
-                        squat_quality = sum(squat_tracker.squat_qualities) / len(squat_tracker.squat_qualities)
-                        image = add_modern_text(
-                            image,
-                            f"Squat Quality: {squat_quality:.1f}", 
-                            (w-sidebar_width+20, 220),
-                            font_size=FONT_TEXT,
-                            text_color=(255, 255, 255),
-                            with_background=True
-                        )
-                
-            # display exercise instructions with modern text
-            image = add_modern_text(
-                image, 
-                instructions, 
-                (30, 50),
-                font_size=FONT_HEADING,
-                text_color=(200, 200, 255)
-            )
-            
-            # display current progress
-            if current_state == ExerciseState.STEPPING:
-                steps_text = f"Steps: {step_tracker.get_step_count()}/10"
-                image = add_modern_text(
-                    image,
-                    steps_text, 
-                    (30, 120),
-                    font_size=FONT_SUBHEADING,
-                    text_color=(255, 255, 255)
-                )
-                
-                # add progress bar for steps
-                step_progress = (step_tracker.get_step_count() / 10) * 100
-                image = draw_progress_bar(image, step_progress, (30, 160), width=500, height=20)
-                
-            elif current_state == ExerciseState.SQUATTING:
-                squats_text = f"Squats: {squat_tracker.get_squat_count()}/3"
+                quality_y += 50
+        
+        # add squat quality if squats have been detected (below the step quality if a phase runs both)
+        if "squat" in view["trackers"] and view["squat_count"] > 0:
+            if view["squat_quality"] is not None:
+                squat_quality = view["squat_quality"]
                 image = add_modern_text(
                     image,
-                    squats_text, 
-                    (30, 120),
-                    font_size=FONT_SUBHEADING,
-                    text_color=(255, 255, 255)
+                    f"Squat Quality: {squat_quality:.1f}", 
+                    (w-sidebar_width+px(20), px(quality_y)),
+                    font_size=px(FONT_TEXT),
+                    text_color=(255, 255, 255),
+                    with_background=True
                 )
-                
-                # add progress bar for squats
-                squat_progress = (squat_tracker.get_squat_count() / 3) * 100
-                image = draw_progress_bar(image, squat_progress, (30, 160), width=500, height=20)
-                
-            elif current_state == ExerciseState.COMPLETED:
-                time_in_completed = current_time - state_start_time
-                if time_in_completed < 1.0:
-                    completion_overlay = image.copy()
-                    cv2.circle(completion_overlay, (w//2, 120), 80, (76, 175, 80), -1)
-                    cv2.addWeighted(completion_overlay, 0.3, image, 0.7, 0, image)
-                    
-                    image = add_modern_text(
-                        image,
-                        "ASSESSMENT COMPLETE", 
-                        (w//2 - 220, 130),
-                        font_size=FONT_TEXT,
-                        text_color=(76, 175, 80)
-                    )
-                
-                # show overall score
-                score_text = f"Overall Score: {assessment_results['overall_score']:.1f}%"
+        
+    # display exercise instructions with modern text
+    image = add_modern_text(
+        image, 
+        view["instructions"], 
+        (px(30), px(50)),
+        font_size=px(FONT_HEADING),
+        text_color=(200, 200, 255)
+    )
+    
+    # display current progress (steps or squats counted in the phase)
+    progress = view["progress"]
+    if progress is not None:
+        progress_text = f"{progress['label']}: {progress['count']}/{progress['target']}"
+        image = add_modern_text(
+            image,
+            progress_text, 
+            (px(30), px(120)),
+            font_size=px(FONT_SUBHEADING),
+            text_color=(255, 255, 255)
+        )
+        
+        # add progress bar for the phase
+        phase_progress = (progress["count"] / progress["target"]) * 100
+        image = draw_progress_bar(image, phase_progress, (px(30), px(160)), width=px(500), height=px(20))
+        
+    elif view["completed"]:
+        time_in_completed = current_time - view["state_start_time"]
+        if time_in_completed < 1.0:
+            completion_overlay = image.copy()
+            cv2.circle(completion_overlay, (w//2, px(120)), px(80), (76, 175, 80), -1)
+            cv2.addWeighted(completion_overlay, 0.3, image, 0.7, 0, image)
+            
+            image = add_modern_text(
+                image,
+                "ASSESSMENT COMPLETE", 
+                (w//2 - px(220), px(130)),
+                font_size=px(FONT_TEXT),
+                text_color=(76, 175, 80)
+            )
+        
+        # show overall score
+        score_text = f"Overall Score: {assessment_results['overall_score']:.1f}%"
+        image = add_modern_text(
+            image,
+            score_text, 
+            (px(30), px(120)),
+            font_size=px(FONT_TEXT),
+            text_color=(76, 175, 80)
+        )
+        
+        # add individual scores
+        y_position = px(180)
+        for key in SCORE_KEYS:
+            if key != "overall_score":
+                metric_text = f"{key.replace('_', ' ').title()}: {assessment_results[key]:.1f}%"
                 image = add_modern_text(
                     image,
-                    score_text, 
-                    (30, 120),
-                    font_size=FONT_TEXT,
-                    text_color=(76, 175, 80)
+                    metric_text, 
+                    (px(50), y_position),
+                    font_size=px(FONT_TEXT),
+                    text_color=(255, 255, 255),
+                    with_background=True
                 )
-                
-                # add individual scores
-                y_position = 180
-                for key, value in assessment_results.items():
-                    if key != "overall_score":
-                        metric_text = f"{key.replace('_', ' ').title()}: {value:.1f}%"
-                        image = add_modern_text(
-                            image,
-                            metric_text, 
-                            (50, y_position),
-                            font_size=FONT_TEXT,
-                            text_color=(255, 255, 255),
-                            with_background=True
-                        )
-                        y_position += 50
-            
-            cv2.imshow(window_name, image)
-            
-            # check for exit ('q' for exiting the application)
-            if cv2.waitKey(10) & 0xFF == ord('q') or (current_state == ExerciseState.COMPLETED and current_time - state_start_time > 5):
-                break
+                y_position += px(50)
+
+    return image
+
+
+class WindowDisplay:
+    """ OpenCV window of the assessment, frames are scaled by the window to the display size """
+    def __init__(self, window_name='AlignAI Assessment', width=1920, height=1080, wait_time=1):
+        # display (window) dimensions -> can be adjusted depending on the screen
+        self.window_name = window_name
+        self.wait_time = wait_time
+        cv2.namedWindow(window_name, cv2.WINDOW_NORMAL | cv2.WINDOW_KEEPRATIO)
+        cv2.resizeWindow(window_name, width, height)
+
+        cv2.setWindowProperty(window_name, cv2.WND_PROP_TOPMOST, 1)
+
+    def show(self, image):
+        """ Shows a frame, returns True when the user asks to quit ('q') """
+        cv2.imshow(self.window_name, image)
+        return cv2.waitKey(self.wait_time) & 0xFF == ord('q')
+
+    def poll(self):
+        # keeps the window responsive while no frame is ready
+        cv2.waitKey(1)
+
+    def close(self):
+        cv2.destroyAllWindows()
+
+
+class NullDisplay:
+    """ Display that drops the frames: the full rendering path runs without a window (benchmarks, servers) """
+    def show(self, image):
+        return False
+
+    def poll(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class InferenceStage:
+    """
+    Pose detection on a BGR frame followed by the tracker updates.
+    With a worker process pose estimator, push() keeps the next frame in flight in the worker
+    while the trackers run on the previous one, frames still come out in capture order
+    """
+    def __init__(self, pose_estimator, session, inference_width=None, governor=None, scheduler=None, motion_gate=None,
+                 smoother=None, recorder=None, video_recorder=None):
+        self.pose_estimator = pose_estimator
+        self.session = session
+        self.inference_width = inference_width
+        self.governor = governor
+        self.scheduler = scheduler
+        self.motion_gate = motion_gate
+        self.smoother = smoother
+        self.recorder = recorder
+        self.video_recorder = video_recorder  # raw frames (headless runs)
+        self.timer = session.timer
+        self.frame_count = 0
+        self.input_scale = governor.settings["input_scale"] if governor else 1.0
+
+        # frames in flight, one per shared memory slot of the worker process estimator.
+        # in-process estimators (and roi tracking, which crops around the previous landmarks) stay sequential
+        self.pipeline_depth = pose_estimator.slot_count if hasattr(pose_estimator, "submit") else 1
+        self.in_flight = deque()  # (frame, current_time, idle_phase, skip_reason, gate_reference)
+        self.pending_settings = None  # governor settings waiting for the frames in flight
+
+    def resize_for_inference(self, frame):
+        # pose inference runs on the native frame, or on a downscaled copy (inference width and governor scale)
+        # landmarks are normalized, so the trackers see the same coordinates either way
+        h, w = frame.shape[:2]
+        target_width = min(w, self.inference_width) if self.inference_width else w
+        target_width = int(target_width * self.input_scale)
+        if target_width >= w:
+            return frame
+        return cv2.resize(frame, (target_width, int(h * target_width / w)), interpolation=cv2.INTER_AREA)
+
+    def begin_frame(self, current_time):
+        self.session.start(current_time)
+        self.frame_count += 1
+        self.timer.frame()
+
+        # no tracker uses the landmarks before and after the exercises
+        return self.session.is_idle()
+
+    def finish_frame(self, frame, current_time, landmarks, kind):
+        # extract landmarks from the body
+        if landmarks is not None:
+            self.session.update(landmarks, current_time)
+        if self.recorder is not None:
+            self.recorder.record(current_time, landmarks, kind)
+        if self.video_recorder is not None:
+            self.video_recorder.submit(frame, current_time)
+
+        return landmarks
+
+    def process(self, frame, current_time):
+        """ Landmarks of one frame, pose inference runs before the method returns """
+        idle_phase = self.begin_frame(current_time)
+        landmarks, kind = self.estimate(frame, current_time, idle_phase)
+        return self.finish_frame(frame, current_time, landmarks, kind)
+
+    def push(self, frame, current_time):
+        """
+        Queues a frame and returns the (frame, current_time, landmarks) of the frames done so far, oldest first.
+        Sequential estimators are done with the frame before push returns, the worker process estimator
+        gets the frame and the trackers run on the previous one while it is inferred (see drain)
+        """
+        if self.pipeline_depth <= 1:
+            return [(frame, current_time, self.process(frame, current_time))]
+
+        done = []
+        if self.pending_settings is not None:
+            # the worker rebuilds its pose backend between two frames
+            done.extend(self.drain())
+            self.apply_settings(self.pending_settings)
+            self.pending_settings = None
+
+        idle_phase = self.begin_frame(current_time)
+        skip_reason = self.skip_reason(frame, current_time, idle_phase)
+        gate_reference = None
+        if skip_reason is None:
+            image = self.resize_for_inference(frame)
+            if self.motion_gate is not None:
+                gate_reference = self.motion_gate.take_pending()
+            self.pose_estimator.submit(image, current_time)
+        self.in_flight.append((frame, current_time, idle_phase, skip_reason, gate_reference))
+
+        # the newest inferred frame stays in the worker, frames without inference follow the ones before them
+        while self.in_flight and (len(self.in_flight) >= self.pipeline_depth or self.in_flight[0][3] is not None):
+            done.append(self.complete(self.in_flight.popleft()))
+        return done
+
+    def drain(self):
+        """ Waits for the frames still in flight and returns them like push() (end of the stream) """
+        done = []
+        while self.in_flight:
+            done.append(self.complete(self.in_flight.popleft()))
+        return done
+
+    def complete(self, entry):
+        frame, current_time, idle_phase, skip_reason, gate_reference = entry
+        if skip_reason is None:
+            landmarks = self.pose_estimator.collect()
+            # time the worker spent on the frame, the wait in collect() overlaps with the trackers
+            landmarks, kind = self.inferred(landmarks, current_time, idle_phase, self.pose_estimator.latency,
+                                            gate_reference)
+        else:
+            landmarks, kind = self.synthesized(current_time, idle_phase, skip_reason)
+        return frame, current_time, self.finish_frame(frame, current_time, landmarks, kind)
+
+    def estimate(self, frame, current_time, idle_phase):
+        """ Landmarks of the frame and how they were obtained (inference_scheduler frame code) """
+        skip_reason = self.skip_reason(frame, current_time, idle_phase)
+        if skip_reason is not None:
+            return self.synthesized(current_time, idle_phase, skip_reason)
+
+        # process image for pose detection, landmarks come back as a (33, 4) array
+        start = time.perf_counter()
+        landmarks = self.pose_estimator.process(self.resize_for_inference(frame), current_time)
+        return self.inferred(landmarks, current_time, idle_phase, time.perf_counter() - start)
+
+    def skip_reason(self, frame, current_time, idle_phase):
+        """ None when the frame goes through pose inference, otherwise what skipped it (motion_gate or scheduler) """
+        # static scene: the last inferred landmarks are still valid. during the exercises the gate only runs
+        # while nobody is detected, a still subject's small sway is below what the thumbnail can see
+        gated = self.motion_gate is not None and (idle_phase or self.motion_gate.landmarks is None)
+        if gated and not self.motion_gate.should_infer(frame, current_time):
+            return "motion_gate"
+
+        if self.scheduler is not None and not self.scheduler.should_infer(current_time, idle_phase):
+            return "scheduler"
+        return None
+
+    def synthesized(self, current_time, idle_phase, skip_reason):
+        """ Landmarks of a frame without inference """
+        if skip_reason == "motion_gate":
+            # the schedule statistics and the recording account for every frame, gated ones included
+            if self.scheduler is not None:
+                self.scheduler.record_gated()
+            return self.motion_gate.landmarks, FRAME_GATED
+
+        landmarks = self.scheduler.synthesize(current_time, idle_phase)
+        return landmarks, self.scheduler.frame_kinds[-1]
+
+    def inferred(self, landmarks, current_time, idle_phase, latency, gate_reference=None):
+        """ Inferred landmarks after smoothing, the scheduler, motion gate and governor learn about the inference """
+        self.timer.record("inference", latency)
+
+        # jitter removal before anything reuses the landmarks (trackers, extrapolation, overlay)
+        if self.smoother is not None:
+            landmarks = self.smoother.filter(landmarks, current_time)
+
+        if self.scheduler is not None:
+            self.scheduler.record_inference(current_time, landmarks, latency)
+        if self.motion_gate is not None:
+            self.motion_gate.update(landmarks, gate_reference)
+
+        if self.governor is not None:
+            settings = self.governor.record(latency, idle_phase, current_time)
+            if settings is not None:
+                if self.in_flight:
+                    self.pending_settings = settings
+                else:
+                    self.apply_settings(settings)
+
+        return landmarks, FRAME_INFERRED if landmarks is not None else FRAME_NO_POSE
+
+    def apply_settings(self, settings):
+        if not self.pose_estimator.reconfigure(model_complexity=settings["model_complexity"]):
+            settings = self.governor.reject()
+        self.input_scale = settings["input_scale"]
+
+
+def run_assessment(source=None, source_fps=None, headless=False, threaded=True, inference_process=False,
+                   capture_settings=None, inference_width=None, roi_tracking=False, roi_input_size=256,
+                   adaptive_complexity=None, target_fps=25, inference_scheduling=True, idle_inference_rate=5.0,
+                   motion_gate=True, landmark_smoothing=True, record_landmarks=True, recording_dir='../recordings',
+                   recording_name=None, thresholds=None, generate_report=True, inference_workers=1,
+                   debug_overlay=False, display=None, pose_backend="mediapipe", pose_backend_options=None,
+                   protocol=None, record_video=False, video_settings=None, spill_history=False):
+    """
+    Runs the assessment on a webcam index, a video file or a directory of frames.
+    In headless mode only pose inference, the trackers and the scoring are run (no overlay, no window).
+    In threaded mode capture, inference and rendering run as concurrent stages linked by bounded queues.
+    With inference_process, pose estimation runs in a worker process fed through shared memory frame slots,
+    the next frame is inferred there while the trackers run on the previous one.
+    Frames are processed at capture resolution, the window scales them to the display size at imshow.
+    With roi_tracking, pose inference runs on a small crop around the person found in the previous frame.
+    adaptive_complexity picks the model complexity and input scale that keep target_fps (default: on for live cameras).
+    inference_scheduling runs pose inference at idle_inference_rate outside the exercises and, for live cameras,
+    skips frames when inference is behind the target_fps budget (their landmarks are extrapolated)
+    motion_gate skips pose inference on frames where nothing moved since the last inferred one (disable it to benchmark)
+    landmark_smoothing runs a One Euro filter on the landmarks before the trackers (True, False or the filter settings)
+    record_landmarks writes the landmarks, timestamps and session events to a recording in recording_dir
+    (named after the start time, or recording_name)
+    thresholds overrides detection and scoring thresholds (see helpers.DEFAULT_THRESHOLDS)
+    generate_report writes the pdf report of completed assessments (not linked to any client)
+    With inference_workers > 1, headless runs on a video file infer the poses of time chunks of the video
+    in parallel processes before running the trackers (see run_chunked_assessment)
+    Stage latencies (capture, color conversion, pose, trackers, overlay, display, and capture_to_render for the
+    whole path of each displayed frame) are summarized in assessment_results["performance"],
+    debug_overlay also draws them on the frames.
+    display is where the frames go when not headless (default: an opencv window, NullDisplay drops them)
+    pose_backend picks the pose estimation engine (mediapipe, tflite or mock, see pose_backends),
+    pose_backend_options are given to it (e.g. {"num_threads": 2} for tflite)
+    protocol is the exercise protocol: a built-in protocol name, a json file or a dict (default: the standard one)
+    record_video encodes a video of the session next to the landmark recording in a background thread
+    (annotated frames when the overlay is rendered, raw frames in headless mode, not in chunked runs),
+    video_settings overrides video_recorder.VIDEO_SETTINGS (fps, width, fourcc, extension, queue_size)
+    spill_history also writes the whole tracker histories next to the recording (<recording>_<tracker>_<history>.bin),
+    in memory they only keep their last frames (5 minutes for the balance positions)
+    """
+    if inference_workers > 1 and headless and isinstance(source, str) and os.path.isfile(source):
+        return run_chunked_assessment(source, inference_workers=inference_workers, source_fps=source_fps,
+                                      inference_width=inference_width, landmark_smoothing=landmark_smoothing,
+                                      record_landmarks=record_landmarks, recording_dir=recording_dir,
+                                      recording_name=recording_name, thresholds=thresholds,
+                                      generate_report=generate_report, pose_backend=pose_backend,
+                                      pose_backend_options=pose_backend_options, protocol=protocol,
+                                      spill_history=spill_history)
+
+    recording_name = recording_name or f"scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npy"
+    session = AssessmentSession(thresholds, protocol=protocol,
+                                spill_path=history_spill_path(recording_dir, recording_name, spill_history))
+
+    if not headless and display is None:
+        display = WindowDisplay(wait_time=1 if threaded else 10)
+
+    timer = session.timer
+    debug_lines = []
+    video_recorder = None
+
+    def display_frame(frame, pose_landmarks, current_time, view):
+        # frame is still the BGR capture, we draw the overlay directly on it
+        with timer.measure("overlay"):
+            image = render_overlay(frame, view, pose_landmarks, current_time)
+            if debug_overlay:
+                # text refreshed every 30 frames, the rasterized labels are reused in between
+                if timer.frame_count % 30 == 1 or not debug_lines:
+                    debug_lines[:] = format_stage_latencies(timer)
+                image = draw_debug_overlay(image, debug_lines)
+
+        # the annotated frame is only read from now on, the encoder thread can take it without a copy
+        if video_recorder is not None:
+            video_recorder.submit(image, current_time)
+
+        with timer.measure("display"):
+            closed = display.show(image)
+        timer.rendered(current_time)
+        return closed
+    
+    # webcam, video file or image sequence activation
+    frame_source = open_frame_source(source, fps=source_fps, capture_settings=capture_settings)
+
+    # recorded sessions are not real time, they always run at full quality
+    if adaptive_complexity is None:
+        adaptive_complexity = frame_source.is_live
+    governor = ComplexityGovernor(target_fps=target_fps) if adaptive_complexity else None
+    pose_options = {"min_detection_confidence": 0.6, "min_tracking_confidence": 0.6, **(pose_backend_options or {})}
+    if governor is not None:
+        pose_options["model_complexity"] = governor.settings["model_complexity"]
+
+    with create_pose_estimator(inference_process, timer=timer, backend=pose_backend, **pose_options) as pose_estimator:
+        if roi_tracking:
+            pose_estimator = RoiPoseEstimator(pose_estimator, input_size=roi_input_size)
+
+        scheduler = None
+        if inference_scheduling:
+            latency_budget = 1.0 / target_fps if frame_source.is_live else None
+            scheduler = InferenceScheduler(idle_rate=idle_inference_rate, latency_budget=latency_budget)
+
+        gate = MotionGate() if motion_gate else None
+
+        smoother = None
+        if landmark_smoothing:
+            smoother = OneEuroFilter(**landmark_smoothing) if isinstance(landmark_smoothing, dict) else OneEuroFilter()
+
+        recorder = None
+        if record_landmarks:
+            recorder = SessionRecorder(os.path.join(recording_dir, recording_name))
+
+        if record_video:
+            video_settings = {**VIDEO_SETTINGS, **(video_settings or {})}
+            video_path = os.path.join(recording_dir, os.path.splitext(recording_name)[0] + video_settings.pop("extension"))
+            video_recorder = SessionVideoRecorder(video_path, **video_settings)
+
+        inference = InferenceStage(pose_estimator, session, inference_width=inference_width,
+                                   governor=governor, scheduler=scheduler, motion_gate=gate, smoother=smoother,
+                                   recorder=recorder, video_recorder=video_recorder if headless else None)
+
+        if threaded:
+            stop_event = threading.Event()
+            capture_queue = create_capture_queue(frame_source)
+            render_queue = StageQueue("render", maxsize=2, drop_oldest=True)
+            grabber = FrameGrabber(frame_source, capture_queue, stop_event, timer=timer)
+            grabber.start()
+
+            def inference_stage():
+                try:
+                    while not stop_event.is_set():
+                        try:
+                            packet = capture_queue.get()
+                        except queue.Empty:
+                            continue
+                        # the frames still in the pose worker process come out at the end of the stream
+                        done = inference.drain() if packet is END_OF_STREAM else inference.push(*packet)
+                        if not headless:
+                            for frame, current_time, pose_landmarks in done:
+                                render_queue.put((frame, pose_landmarks, current_time, session.snapshot()), stop_event)
+
+                        # nobody is watching in headless mode, we stop as soon as the scores are ready
+                        if packet is END_OF_STREAM or (headless and session.is_completed()):
+                            break
+                finally:
+                    render_queue.put(END_OF_STREAM, stop_event)
+
+            if headless:
+                inference_stage()
+            else:
+                inference_thread = threading.Thread(target=inference_stage, name="pose-inference", daemon=True)
+                inference_thread.start()
+
+                # rendering and display stay on the main thread (required by the opencv window on macOS)
+                while True:
+                    try:
+                        packet = render_queue.get()
+                    except queue.Empty:
+                        display.poll()
+                        continue
+                    if packet is END_OF_STREAM:
+                        break
+
+                    frame, pose_landmarks, current_time, view = packet
+                    if display_frame(frame, pose_landmarks, current_time, view) or session.is_finished(current_time):
+                        break
+
+                stop_event.set()
+                inference_thread.join()
+
+            stop_event.set()
+            grabber.join()
+
+            # per-stage backpressure: how often each stage had to drop or wait for the next one
+            stage_queues = [capture_queue] if headless else [capture_queue, render_queue]
+            pipeline_stats = {stage_queue.name: stage_queue.stats() for stage_queue in stage_queues}
+            print(f"Pipeline backpressure: {json.dumps(pipeline_stats)}")
+        else:
+            pipeline_stats = None
+
+            def show_frames(done):
+                """ Shows the frames done by the inference stage, True when the assessment is over """
+                for frame, current_time, pose_landmarks in done:
+                    # nobody is watching in headless mode, we stop as soon as the scores are ready
+                    if headless:
+                        if session.is_completed():
+                            return True
+                        continue
+
+                    if display_frame(frame, pose_landmarks, current_time, session.snapshot()) or session.is_finished(current_time):
+                        return True
+                return False
+
+            finished = False
+            while frame_source.is_opened() and not finished:
+                # the capture timestamp drives the trackers instead of the wall clock
+                with timer.measure("capture"):
+                    ret, frame, current_time = frame_source.read()
+                if not ret:
+                    print("Failed to grab frame" if frame_source.is_live else "End of recorded frames")
+                    break
+                timer.captured(current_time)
+
+                finished = show_frames(inference.push(frame, current_time))
+
+            if not finished:
+                # frames still in the pose worker process
+                show_frames(inference.drain())
                 
         # clean up the opencv resources
-        cap.release()
-        cv2.destroyAllWindows()
+        frame_source.release()
+        if not headless:
+            display.close()
+
+        # frames dropped by the stage queues (live capture keeps only the newest frame)
+        dropped_frames = sum(stats["dropped"] for stats in pipeline_stats.values()) if pipeline_stats else 0
+        assessment_results = collect_results(session, inference.frame_count, smoother, recorder, dropped_frames,
+                                             pose_backend)
+        print(f"Stage latencies: {json.dumps(assessment_results['performance'])}")
+        if pipeline_stats is not None:
+            assessment_results["pipeline"] = pipeline_stats
+        if roi_tracking:
+            assessment_results["roi_tracking"] = pose_estimator.stats()
+        if governor is not None:
+            assessment_results["pose_settings"] = governor.summary()
+        if scheduler is not None:
+            assessment_results["inference_schedule"] = scheduler.stats()
+        if gate is not None:
+            assessment_results["motion_gate"] = gate.stats()
+            print(f"Motion gate: {json.dumps(gate.stats())}")
+        if video_recorder is not None:
+            # waits for the encoder to write the frames still queued
+            # stored with the scan, the flask app runs from another directory than this script
+            assessment_results["video"] = os.path.abspath(video_recorder.close())
+            assessment_results["performance"]["video_recorder"] = video_recorder.stats()
+            print(f"Session video: {assessment_results['video']} {json.dumps(video_recorder.stats())}")
 
         # create the pdf report
-        if current_state == ExerciseState.COMPLETED:
-            print("Scan completed, generating PDF...")
-            try:
-                pdf_path = generate_scan_pdf(assessment_results)
-                assessment_results['report_pdf'] = pdf_path
-                print(f"Scan report saved to: {pdf_path} ")
-            except Exception as e:
-                print(f"Error generating PDF report: {str(e)}")
+        if session.is_completed() and generate_report:
+            write_report(assessment_results)
         
         return assessment_results
+
+
+def run_chunked_assessment(source, inference_workers=None, source_fps=None, inference_width=None,
+                           chunk_overlap=DEFAULT_OVERLAP, landmark_smoothing=True, record_landmarks=True,
+                           recording_dir='../recordings', recording_name=None, thresholds=None, generate_report=True,
+                           pose_backend="mediapipe", pose_backend_options=None, protocol=None, spill_history=False):
+    """
+    Headless assessment of a long video file using several cores.
+    The video is split in one time chunk per worker, pose inference runs on the chunks in parallel processes
+    (each chunk starts chunk_overlap frames early so the pose tracking is warm) and the landmark streams are
+    stitched back in frame order. Smoothing, the trackers and the recording then run once over the merged stream.
+    Every frame is inferred (no inference scheduling or motion gate, they depend on the tracker state)
+    """
+    recording_name = recording_name or f"scan_{datetime.now().strftime('%Y%m%d_%H%M%S')}.npy"
+    session = AssessmentSession(thresholds, protocol=protocol,
+                                spill_path=history_spill_path(recording_dir, recording_name, spill_history))
+    started = time.perf_counter()
+
+    pose_options = {"backend": pose_backend, **(pose_backend_options or {})}
+    timestamps, landmarks, chunk_stats = infer_video_chunked(source, workers=inference_workers, fps=source_fps,
+                                                             overlap=chunk_overlap, inference_width=inference_width,
+                                                             pose_options=pose_options)
+    print(f"Chunked inference: {json.dumps(chunk_stats)}")
+
+    smoother = None
+    if landmark_smoothing:
+        smoother = OneEuroFilter(**landmark_smoothing) if isinstance(landmark_smoothing, dict) else OneEuroFilter()
+
+    recorder = None
+    if record_landmarks:
+        recorder = SessionRecorder(os.path.join(recording_dir, recording_name))
+
+    # same per frame steps as InferenceStage.process on the merged stream
+    found = ~np.isnan(landmarks[:, 0, 0])
+    frame_count = 0
+    for current_time, frame_landmarks, has_pose in zip(timestamps.tolist(), landmarks, found.tolist()):
+        session.start(current_time)
+        frame_count += 1
+
+        frame_landmarks = frame_landmarks if has_pose else None
+        if smoother is not None:
+            frame_landmarks = smoother.filter(frame_landmarks, current_time)
+
+        if frame_landmarks is not None:
+            session.update(frame_landmarks, current_time)
+        if recorder is not None:
+            recorder.record(current_time, frame_landmarks, FRAME_INFERRED if frame_landmarks is not None else FRAME_NO_POSE)
+
+        # like the headless run, we stop as soon as the scores are ready
+        if session.is_completed():
+            break
+
+    assessment_results = collect_results(session, frame_count, smoother, recorder, pose_backend=pose_backend)
+    assessment_results["chunked_inference"] = chunk_stats
+    # frames are not processed one by one, the frame rate is the one of the whole run
+    assessment_results["performance"]["frames"] = frame_count
+    assessment_results["performance"]["fps"] = round(frame_count / (time.perf_counter() - started), 2)
+
+    if session.is_completed() and generate_report:
+        write_report(assessment_results)
+
+    return assessment_results
+
+
+def history_spill_path(recording_dir, recording_name, spill_history):
+    """ Prefix of the tracker history spill files of a session, None when they stay in memory """
+    if not spill_history:
+        return None
+    os.makedirs(recording_dir, exist_ok=True)
+    return os.path.join(recording_dir, os.path.splitext(recording_name)[0])
+
+
+def collect_results(session, frame_count, smoother, recorder, dropped_frames=0, pose_backend="mediapipe"):
+    """
+    Scores of the session with the settings and stage latencies that produced them,
+    closes the landmark recording and the tracker history spill files
+    """
+    session.close()
+    assessment_results = session.assessment_results
+    assessment_results["completed"] = session.is_completed()
+    assessment_results["frame_count"] = frame_count
+    assessment_results["performance"] = session.timer.summary(dropped_frames)
+    # settings changing the landmarks (and so the scores) are stored with the scan
+    assessment_results["processing_settings"] = {
+        "landmark_smoothing": smoother.settings() if smoother is not None else None,
+        "thresholds": session.thresholds,
+        "pose_backend": pose_backend,
+        "protocol": session.protocol
+    }
+
+    if recorder is not None:
+        assessment_results["recording"] = recorder.close({
+            "events": session.events,
+            "completed": session.is_completed(),
+            "scores": {key: assessment_results[key] for key in SCORE_KEYS},
+            "processing_settings": assessment_results["processing_settings"]
+        })
+        print(f"Landmarks recorded to: {assessment_results['recording']}")
+    return assessment_results
+
+
+def write_report(assessment_results):
+    """ pdf report of a completed assessment, not linked to any client """
+    print("Scan completed, generating PDF...")
+    try:
+        pdf_path = generate_scan_pdf(assessment_results)
+        assessment_results['report_pdf'] = pdf_path
+        print(f"Scan report saved to: {pdf_path} ")
+    except Exception as e:
+        print(f"Error generating PDF report: {str(e)}")
     
 
 def generate_scan_pdf(assessment_results, client_id=None, scan_id=None, scan_reason="Consult", output_dir='../reports'):
@@ -616,7 +1161,11 @@ def save_scan_to_db(client_id, scan_reason, assessment_results, pdf_path):
         stepping_score=assessment_results["stepping_score"],
         squat_score=assessment_results["squat_score"],
         posture_score=assessment_results["posture_score"],
-        overall_score=assessment_results["overall_score"]
+        overall_score=assessment_results["overall_score"],
+        processing_settings=json.dumps(assessment_results.get("processing_settings")),
+        recording_path=assessment_results.get("recording"),
+        performance=json.dumps(assessment_results.get("performance")),
+        video_path=assessment_results.get("video")
     )
     db.session.add(new_scan)
     db.session.commit()
@@ -642,13 +1191,35 @@ if __name__ == "__main__":
     import os
     import time
     import cv2
-    import mediapipe as mp
     import numpy as np
     import traceback
     from datetime import datetime
     
     client_id = None
     scan_reason = "Consult"
+    source = None
+    source_fps = None
+    headless = False
+    threaded = True
+    inference_process = False
+    capture_settings = None
+    inference_width = None
+    roi_tracking = False
+    adaptive_complexity = None
+    target_fps = 25
+    inference_scheduling = True
+    motion_gate = True
+    landmark_smoothing = True
+    record_landmarks = True
+    thresholds = None
+    inference_workers = 1
+    debug_overlay = False
+    pose_backend = "mediapipe"
+    pose_backend_options = None
+    protocol = None
+    record_video = False
+    video_settings = None
+    spill_history = False
     
     # process command line arguments when running the script through terminal
     if len(sys.argv) > 1:
@@ -662,12 +1233,56 @@ if __name__ == "__main__":
                 client_id = None
 
             scan_reason = args.get('scan_reason', scan_reason)
+
+            # webcam index, video file or frame directory (defaults to the webcam 0)
+            source = args.get('source', source)
+            source_fps = args.get('source_fps', source_fps)
+            headless = bool(args.get('headless', headless))
+            threaded = bool(args.get('threaded', threaded))
+            inference_process = bool(args.get('inference_process', inference_process))
+            # e.g. {"width": 1280, "height": 720, "fps": 30, "fourcc": "MJPG", "buffer_size": 1}
+            capture_settings = args.get('capture_settings', capture_settings)
+            inference_width = args.get('inference_width', inference_width)
+            roi_tracking = bool(args.get('roi_tracking', roi_tracking))
+            adaptive_complexity = args.get('adaptive_complexity', adaptive_complexity)
+            target_fps = args.get('target_fps', target_fps)
+            inference_scheduling = bool(args.get('inference_scheduling', inference_scheduling))
+            motion_gate = bool(args.get('motion_gate', motion_gate))
+            # true / false, or the filter settings e.g. {"min_cutoff": 1.0, "beta": 10.0}
+            landmark_smoothing = args.get('landmark_smoothing', landmark_smoothing)
+            record_landmarks = bool(args.get('record_landmarks', record_landmarks))
+            # e.g. {"squat_down_angle": 120, "posture_ideal_min": 50}
+            thresholds = args.get('thresholds', thresholds)
+            # parallel pose inference on time chunks of a video file (headless only)
+            inference_workers = int(args.get('inference_workers', inference_workers))
+            # stage latencies drawn on the assessment window
+            debug_overlay = bool(args.get('debug_overlay', debug_overlay))
+            # mediapipe, tflite or mock, with its options e.g. {"num_threads": 2}
+            pose_backend = args.get('pose_backend', pose_backend)
+            pose_backend_options = args.get('pose_backend_options', pose_backend_options)
+            # built-in protocol name, json file or protocol dict (see protocol.py)
+            protocol = args.get('protocol', protocol)
+            # video of the session, e.g. {"fps": 15, "width": 960}
+            record_video = bool(args.get('record_video', record_video))
+            video_settings = args.get('video_settings', video_settings)
+            # whole tracker histories written next to the recording (long sessions)
+            spill_history = bool(args.get('spill_history', spill_history))
             print(f"Running assessment for client ID: {client_id}")
             print(f"Scan reason: {scan_reason}")
         except Exception as e:
             print(f"Error parsing arguments for launching the scan: {str(e)}")
 
-    assessment_results = run_assessment()
+    assessment_results = run_assessment(source=source, source_fps=source_fps, headless=headless, threaded=threaded,
+                                        inference_process=inference_process, capture_settings=capture_settings,
+                                        inference_width=inference_width, roi_tracking=roi_tracking,
+                                        adaptive_complexity=adaptive_complexity, target_fps=target_fps,
+                                        inference_scheduling=inference_scheduling, motion_gate=motion_gate,
+                                        landmark_smoothing=landmark_smoothing, record_landmarks=record_landmarks,
+                                        thresholds=thresholds, inference_workers=inference_workers,
+                                        debug_overlay=debug_overlay, pose_backend=pose_backend,
+                                        pose_backend_options=pose_backend_options, protocol=protocol,
+                                        record_video=record_video, video_settings=video_settings,
+                                        spill_history=spill_history)
     
     try:
         # create database record first to get the scan ID
@@ -690,7 +1305,11 @@ if __name__ == "__main__":
                             stepping_score=assessment_results['stepping_score'],
                             squat_score=assessment_results['squat_score'],
                             posture_score=assessment_results['posture_score'],
-                            overall_score=assessment_results['overall_score']
+                            overall_score=assessment_results['overall_score'],
+                            processing_settings=json.dumps(assessment_results.get('processing_settings')),
+                            recording_path=assessment_results.get('recording'),
+                            performance=json.dumps(assessment_results.get('performance')),
+                            video_path=assessment_results.get('video')
                         )
                         db.session.add(new_scan)
                         db.session.commit()
@@ -0,0 +1,86 @@
+import numpy as np
+import cv2
+
+
+class MotionGate:
+    """
+    Cheap pre-filter run before pose inference.
+    A tiny grayscale copy of each frame is compared with the one of the last inferred frame,
+    when nothing has moved (empty room, nobody moving) the last landmarks are reused instead of running inference.
+    A refresh is forced every max_hold seconds so a slow drift is never missed
+    """
+    def __init__(self, thumbnail_width=64, pixel_threshold=12, motion_threshold=0.01, max_hold=1.0):
+        self.thumbnail_width = thumbnail_width
+        self.pixel_threshold = pixel_threshold    # gray level difference for a pixel to count as changed
+        self.motion_threshold = motion_threshold  # fraction of changed pixels for the frame to count as moving
+        self.max_hold = max_hold                  # seconds
+
+        self.reference = None  # thumbnail of the last inferred frame
+        self.reference_time = None
+        self.pending = None    # thumbnail of the frame waiting for its landmarks
+        self.landmarks = None  # landmarks of the last inferred frame
+
+        self.frames = 0
+        self.skipped = 0
+        self.forced_refreshes = 0
+        self.last_motion = 0.0
+
+    def thumbnail(self, frame):
+        h, w = frame.shape[:2]
+        # strided subsampling first, so the area resize only touches a few thousand pixels
+        step = max(1, w // (self.thumbnail_width * 2))
+        small = frame[::step, ::step]
+        height = max(1, int(round(h * self.thumbnail_width / w)))
+        small = cv2.resize(small, (self.thumbnail_width, height), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY) if small.ndim == 3 else small
+        return cv2.GaussianBlur(gray, (3, 3), 0)
+
+    def should_infer(self, frame, current_time):
+        """ True when the frame must go through pose inference, the gate then expects update() with its landmarks """
+        self.frames += 1
+        thumbnail = self.thumbnail(frame)
+
+        self.pending = (thumbnail, current_time)
+
+        if self.reference is None or self.reference.shape != thumbnail.shape:
+            return True
+
+        if current_time - self.reference_time >= self.max_hold:
+            self.forced_refreshes += 1
+            return True
+
+        difference = cv2.absdiff(thumbnail, self.reference)
+        self.last_motion = float(np.count_nonzero(difference > self.pixel_threshold)) / difference.size
+        if self.last_motion >= self.motion_threshold:
+            return True
+
+        self.pending = None
+        self.skipped += 1
+        return False
+
+    def take_pending(self):
+        """ Thumbnail of the frame that just passed the gate, for an update() after other frames went through """
+        pending, self.pending = self.pending, None
+        return pending
+
+    def update(self, landmarks, reference=None):
+        """
+        Landmarks inferred on the frame that passed the gate, it becomes the new reference.
+        reference is the take_pending() of that frame when its landmarks come back later (pipelined inference)
+        """
+        reference = reference or self.pending
+        if reference is not None:
+            self.reference, self.reference_time = reference
+            self.pending = None
+        self.landmarks = landmarks
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "skipped": self.skipped,
+            "hit_rate": self.skipped / self.frames if self.frames else 0.0,
+            "forced_refreshes": self.forced_refreshes,
+            "motion_threshold": self.motion_threshold,
+            "pixel_threshold": self.pixel_threshold,
+            "max_hold_s": self.max_hold
+        }
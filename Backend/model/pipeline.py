@@ -0,0 +1,111 @@
+import queue
+import threading
+import time
+
+from stage_timer import StageTimer
+
+# marks the end of the stream in a stage queue
+END_OF_STREAM = object()
+
+
+class StageQueue:
+    """
+    Bounded queue linking two pipeline stages.
+    With drop_oldest the producer never waits: the oldest item is discarded to keep latency low (live camera).
+    Without it the producer blocks until the consumer catches up, so no frame is lost (recorded sources).
+    """
+    def __init__(self, name, maxsize=2, drop_oldest=True):
+        self.name = name
+        self.maxsize = maxsize
+        self.drop_oldest = drop_oldest
+        self.queue = queue.Queue(maxsize)
+
+        # backpressure statistics
+        self.put_count = 0
+        self.drop_count = 0
+        self.blocked_time = 0.0
+        self.depth_total = 0
+        self.max_depth = 0
+
+    def put(self, item, stop_event=None):
+        """ Returns False if the pipeline was stopped before the item could be queued """
+        if item is not END_OF_STREAM:
+            depth = self.queue.qsize()
+            self.depth_total += depth
+            self.max_depth = max(self.max_depth, depth)
+            self.put_count += 1
+
+        if self.drop_oldest:
+            while True:
+                try:
+                    self.queue.put_nowait(item)
+                    return True
+                except queue.Full:
+                    try:
+                        dropped = self.queue.get_nowait()
+                        # the end marker must always reach the consumer
+                        if dropped is END_OF_STREAM:
+                            self.queue.put_nowait(dropped)
+                            return True
+                        self.drop_count += 1
+                    except queue.Empty:
+                        pass
+
+        start = time.perf_counter()
+        try:
+            while True:
+                try:
+                    self.queue.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    if stop_event is not None and stop_event.is_set():
+                        return False
+        finally:
+            self.blocked_time += time.perf_counter() - start
+
+    def get(self, timeout=0.1):
+        """ Raises queue.Empty if nothing arrived before the timeout """
+        return self.queue.get(timeout=timeout)
+
+    def stats(self):
+        return {
+            "frames": self.put_count,
+            "dropped": self.drop_count,
+            "drop_rate": self.drop_count / self.put_count if self.put_count else 0.0,
+            "producer_blocked_s": round(self.blocked_time, 4),
+            "avg_depth": self.depth_total / self.put_count if self.put_count else 0.0,
+            "max_depth": self.max_depth,
+            "capacity": self.maxsize
+        }
+
+
+class FrameGrabber(threading.Thread):
+    """ Capture thread pushing (frame, timestamp) packets from a frame source into a stage queue """
+    def __init__(self, frame_source, output_queue, stop_event, timer=None):
+        super().__init__(name="frame-grabber", daemon=True)
+        self.frame_source = frame_source
+        self.output_queue = output_queue
+        self.stop_event = stop_event
+        self.timer = timer or StageTimer()
+
+    def run(self):
+        try:
+            while not self.stop_event.is_set() and self.frame_source.is_opened():
+                with self.timer.measure("capture"):
+                    ret, frame, timestamp = self.frame_source.read()
+                if not ret:
+                    print("Failed to grab frame" if self.frame_source.is_live else "End of recorded frames")
+                    break
+                self.timer.captured(timestamp)
+
+                if not self.output_queue.put((frame, timestamp), self.stop_event):
+                    break
+        finally:
+            self.output_queue.put(END_OF_STREAM, self.stop_event)
+
+
+def create_capture_queue(frame_source):
+    """ Live sources only keep the newest frame, recorded sources keep every frame """
+    if frame_source.is_live:
+        return StageQueue("capture", maxsize=1, drop_oldest=True)
+    return StageQueue("capture", maxsize=4, drop_oldest=False)
@@ -0,0 +1,205 @@
+import os
+import importlib.util
+import numpy as np
+import cv2
+
+from landmarks import NUM_LANDMARKS, LANDMARK_FIELDS, landmarks_to_array
+
+# tflite pose landmark models, same files as the mediapipe model_complexity 0, 1 and 2
+TFLITE_MODELS = {
+    0: "pose_landmark_lite.tflite",
+    1: "pose_landmark_full.tflite",
+    2: "pose_landmark_heavy.tflite",
+}
+
+
+class PoseBackend:
+    """
+    Pose estimation engine behind PoseEstimator. process() takes an RGB image and returns a (33, 4)
+    float32 array of normalized (x, y, z, visibility) landmarks, or None when nobody is detected.
+    timestamp is the capture time of the frame in seconds (only the replaying mock backend uses it).
+    Options that do not apply to a backend are accepted and ignored, so the same pose options work with all of them
+    """
+    def process(self, image, timestamp=None):
+        raise NotImplementedError
+
+    def resume_from(self, previous):
+        """ Carries over the state of the backend this one replaces (reconfigure), nothing by default """
+        pass
+
+    def close(self):
+        pass
+
+
+class MediaPipeBackend(PoseBackend):
+    """ mediapipe solutions pose graph (person detection, then landmarks tracked from one frame to the next) """
+    def __init__(self, **pose_options):
+        import mediapipe as mp
+
+        self.pose = mp.solutions.pose.Pose(**pose_options)
+
+    def process(self, image, timestamp=None):
+        results = self.pose.process(image)
+        if not results.pose_landmarks:
+            return None
+        return landmarks_to_array(results.pose_landmarks)
+
+    def close(self):
+        self.pose.close()
+
+
+def load_tflite_interpreter(model_path, num_threads=None):
+    """ LiteRT, tflite_runtime or tensorflow interpreter, whichever is installed (all run the CPU model with XNNPACK) """
+    try:
+        from ai_edge_litert.interpreter import Interpreter
+    except ImportError:
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            try:
+                import tensorflow as tf
+            except ImportError:
+                raise ImportError("The tflite pose backend needs ai-edge-litert, tflite-runtime or tensorflow")
+            Interpreter = tf.lite.Interpreter
+
+    interpreter = Interpreter(model_path=model_path, num_threads=num_threads)
+    interpreter.allocate_tensors()
+    return interpreter
+
+
+def find_tflite_model(model_complexity):
+    """ Landmark model shipped in the mediapipe package (mediapipe itself is not imported) """
+    spec = importlib.util.find_spec("mediapipe")
+    if spec is not None and spec.submodule_search_locations:
+        path = os.path.join(spec.submodule_search_locations[0], "modules", "pose_landmark", TFLITE_MODELS[model_complexity])
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No {TFLITE_MODELS[model_complexity]} found, pass its model_path to the tflite backend")
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+class TFLiteBackend(PoseBackend):
+    """
+    BlazePose landmark model run directly on a tflite interpreter, with num_threads XNNPACK threads.
+    There is no person detector: the model sees the whole image letterboxed to its square input,
+    which works when the person fills most of the frame, or on the crops of the roi tracking
+    """
+    def __init__(self, model_complexity=1, model_path=None, num_threads=None,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5, **pose_options):
+        self.model_path = model_path or find_tflite_model(model_complexity)
+        self.interpreter = load_tflite_interpreter(self.model_path, num_threads)
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.tracking = False
+
+        input_details = self.interpreter.get_input_details()[0]
+        self.input_index = input_details['index']
+        self.input_size = int(input_details['shape'][1])
+        # output tensors by name: Identity are the 39 landmarks (x, y, z, visibility, presence), Identity_1 the pose score
+        outputs = {output['name']: output['index'] for output in self.interpreter.get_output_details()}
+        self.landmarks_index = outputs["Identity"]
+        self.score_index = outputs["Identity_1"]
+
+    def letterbox(self, image):
+        """ Pads the image to a square and resizes it to the model input, returns (input, side, pad_x, pad_y) """
+        h, w = image.shape[:2]
+        side = max(h, w)
+        pad_x, pad_y = (side - w) // 2, (side - h) // 2
+        square = cv2.copyMakeBorder(image, pad_y, side - h - pad_y, pad_x, side - w - pad_x, cv2.BORDER_CONSTANT, value=0)
+        interpolation = cv2.INTER_AREA if side > self.input_size else cv2.INTER_LINEAR
+        resized = cv2.resize(square, (self.input_size, self.input_size), interpolation=interpolation)
+        return resized, side, pad_x, pad_y
+
+    def process(self, image, timestamp=None):
+        h, w = image.shape[:2]
+        model_input, side, pad_x, pad_y = self.letterbox(image)
+        self.interpreter.set_tensor(self.input_index, (model_input.astype(np.float32) / 255.0)[np.newaxis])
+        self.interpreter.invoke()
+
+        # a person seen in the previous frame is kept with the (usually lower) tracking confidence
+        score = float(self.interpreter.get_tensor(self.score_index).reshape(-1)[0])
+        self.tracking = score >= (self.min_tracking_confidence if self.tracking else self.min_detection_confidence)
+        if not self.tracking:
+            return None
+
+        raw = self.interpreter.get_tensor(self.landmarks_index).reshape(-1, 5)[:NUM_LANDMARKS]
+        scale = side / self.input_size
+        landmarks = np.empty((NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+        landmarks[:, 0] = (raw[:, 0] * scale - pad_x) / w
+        landmarks[:, 1] = (raw[:, 1] * scale - pad_y) / h
+        # z has the same scale as x, like mediapipe
+        landmarks[:, 2] = raw[:, 2] * scale / w
+        landmarks[:, 3] = sigmoid(raw[:, 3])
+        return landmarks
+
+
+class MockPoseBackend(PoseBackend):
+    """
+    Deterministic backend for tests: replays landmarks whatever the image.
+    landmarks is one (33, 4) pose or a (N, 33, 4) stream (nan rows are frames without a pose) sampled at
+    timestamps (default: fps), recording is the path of a session recording to replay instead.
+    A frame gets the pose at its timestamp, taken relative to the first timestamp the backend sees (so the replay
+    starts at pose 0 whatever the clock), frames that never reach the backend (motion gate, scheduler) or a rebuilt
+    backend (reconfigure, see resume_from) do not shift the replay.
+    Without timestamp the poses are replayed one per call. The stream loops at its end,
+    without landmarks nobody is ever detected
+    """
+    def __init__(self, landmarks=None, recording=None, timestamps=None, fps=30.0, **pose_options):
+        if recording is not None:
+            from session_recorder import load_recording
+
+            recording = load_recording(recording)
+            landmarks, timestamps = recording["landmarks"], recording["timestamps"]
+        if landmarks is not None:
+            landmarks = np.asarray(landmarks, dtype=np.float32).reshape(-1, NUM_LANDMARKS, LANDMARK_FIELDS)
+            if timestamps is None:
+                timestamps = np.arange(len(landmarks)) / fps
+            timestamps = np.asarray(timestamps, dtype=np.float64)
+            timestamps = timestamps - timestamps[0] if len(timestamps) else timestamps
+            # the stream repeats one frame interval after its last pose
+            interval = timestamps[-1] / (len(timestamps) - 1) if len(timestamps) > 1 else 1.0 / fps
+            self.period = timestamps[-1] + interval if len(timestamps) else None
+        self.landmarks = landmarks
+        self.timestamps = timestamps
+        self.frame_index = 0
+        self.start_time = None  # first timestamp processed, the origin of the replay
+
+    def resume_from(self, previous):
+        # the rebuilt backend keeps the origin of the one it replaces
+        if isinstance(previous, MockPoseBackend):
+            self.start_time = previous.start_time
+            self.frame_index = previous.frame_index
+
+    def process(self, image, timestamp=None):
+        if self.landmarks is None or not len(self.landmarks):
+            return None
+        if timestamp is None:
+            index = self.frame_index % len(self.landmarks)
+            self.frame_index += 1
+        else:
+            if self.start_time is None:
+                self.start_time = timestamp
+            elapsed = (timestamp - self.start_time) % self.period
+            # last pose at or before the timestamp (the tolerance absorbs float rounding of i / fps)
+            index = int(np.searchsorted(self.timestamps, elapsed + 1e-6, side='right')) - 1
+        landmarks = self.landmarks[max(0, index)]
+        if np.isnan(landmarks).any():
+            return None
+        return landmarks.copy()
+
+
+POSE_BACKENDS = {
+    "mediapipe": MediaPipeBackend,
+    "tflite": TFLiteBackend,
+    "mock": MockPoseBackend,
+}
+
+
+def create_pose_backend(backend="mediapipe", **pose_options):
+    """ Builds a pose backend from its name (mediapipe, tflite or mock) """
+    if backend not in POSE_BACKENDS:
+        raise ValueError(f"Unknown pose backend: {backend}")
+    return POSE_BACKENDS[backend](**pose_options)
@@ -0,0 +1,277 @@
+import multiprocessing
+import queue
+import time
+import numpy as np
+import cv2
+from multiprocessing import shared_memory
+
+from pose_backends import create_pose_backend
+from stage_timer import StageTimer
+
+# default pose settings of the assessment
+POSE_OPTIONS = {
+    "min_detection_confidence": 0.6,
+    "min_tracking_confidence": 0.6
+}
+
+
+class PoseEstimator:
+    """
+    In-process pose estimation returning a (33, 4) landmark array, or None when nobody is detected.
+    backend names the pose backend (mediapipe, tflite or mock), pose_options are given to it
+    """
+    def __init__(self, backend="mediapipe", timer=None, **pose_options):
+        self.backend = backend
+        self.pose_options = {**POSE_OPTIONS, **pose_options}
+        self.pose = create_pose_backend(self.backend, **self.pose_options)
+        self.timer = timer or StageTimer()
+
+    def reconfigure(self, **pose_options):
+        """
+        Rebuilds the pose backend with new options (e.g. model_complexity).
+        Returns False and keeps the current backend if the new one cannot be created
+        (mediapipe downloads the lite and heavy models on first use)
+        """
+        previous_options = dict(self.pose_options)
+        self.pose_options.update(pose_options)
+        try:
+            pose = create_pose_backend(self.backend, **self.pose_options)
+        except Exception as e:
+            print(f"Could not reconfigure pose estimation with {pose_options}: {str(e)}")
+            self.pose_options = previous_options
+            return False
+
+        pose.resume_from(self.pose)
+        self.pose.close()
+        self.pose = pose
+        return True
+
+    def process(self, frame, timestamp=None):
+        """ Runs pose detection on a BGR frame captured at timestamp """
+        with self.timer.measure("color_conversion"):
+            image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        image.flags.writeable = False
+        with self.timer.measure("pose_process"):
+            return self.pose.process(image, timestamp)
+
+    def close(self):
+        self.pose.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+class SharedFrameRing:
+    """ Fixed number of frame slots in a shared memory block, so frames cross processes without pickling """
+    def __init__(self, slot_count, frame_shape, name=None):
+        self.slot_count = slot_count
+        self.frame_shape = tuple(frame_shape)
+        self.slot_size = int(np.prod(self.frame_shape))
+        self.owner = name is None
+
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.slot_size * slot_count)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.slots = np.ndarray((slot_count,) + self.frame_shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, slot, frame):
+        self.slots[slot][...] = frame
+
+    def view(self, slot):
+        return self.slots[slot]
+
+    def close(self):
+        # the numpy view must be released before the shared memory can be closed
+        self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _pose_worker_main(slot_count, requests, results, pose_options):
+    """ Worker process loop: reads frames from the ring slots and sends back landmark arrays """
+    # one ring per frame shape, the parent owns the blocks and unlinks them, the worker only attaches to them
+    rings = {}
+
+    try:
+        with PoseEstimator(**pose_options) as estimator:
+            while True:
+                request = requests.get()
+                if request is None:
+                    break
+
+                if request[0] == "configure":
+                    results.put(("configure", estimator.reconfigure(**request[1]), None, 0.0))
+                    continue
+                if request[0] == "release":
+                    if request[1] in rings:
+                        rings.pop(request[1]).close()
+                    continue
+
+                frame_id, ring_name, frame_shape, slot, timestamp = request
+                start = time.perf_counter()
+                try:
+                    if ring_name not in rings:
+                        rings[ring_name] = SharedFrameRing(slot_count, frame_shape, name=ring_name)
+                    landmarks = estimator.process(rings[ring_name].view(slot), timestamp)
+                    results.put((frame_id, landmarks, None, time.perf_counter() - start))
+                except Exception as e:
+                    results.put((frame_id, None, str(e), time.perf_counter() - start))
+    finally:
+        for ring in rings.values():
+            ring.close()
+
+
+class ProcessPoseEstimator:
+    """
+    Runs pose estimation (any backend, see PoseEstimator) in a dedicated worker process.
+    Frames are written into shared memory ring slots and only the compact (33, 4) landmark arrays come back,
+    so inference and the python-heavy tracker/overlay code run on two cores instead of sharing one GIL.
+    Up to slot_count frames are in flight: submit() the next frame before collect() of the previous one
+    and the worker infers it while the caller runs the trackers (see InferenceStage.push).
+    Each frame shape gets its own ring (roi crops and full frames, governor input scales), the worker
+    attaches to the new rings and is never restarted; the max_rings most recently used ones are kept
+    """
+    def __init__(self, slot_count=2, timeout=10.0, max_rings=4, **pose_options):
+        self.slot_count = slot_count
+        self.timeout = timeout
+        self.max_rings = max_rings
+        self.pose_options = pose_options
+
+        self.context = multiprocessing.get_context('spawn')
+        self.rings = {}  # frame shape -> SharedFrameRing, least recently used first
+        self.worker = None
+        self.next_frame_id = 0
+        self.pending = []  # (frame_id, frame_shape) in submission order
+        self.latency = None  # seconds the worker spent on the last collected frame
+
+    def _start(self):
+        self.requests = self.context.Queue()
+        self.results = self.context.Queue()
+        self.worker = self.context.Process(
+            target=_pose_worker_main,
+            args=(self.slot_count, self.requests, self.results, self.pose_options),
+            name="pose-worker",
+            daemon=True
+        )
+        self.worker.start()
+
+    def ring_for(self, frame_shape):
+        """ Ring of the frame shape, created on first use """
+        ring = self.rings.pop(frame_shape, None)
+        if ring is None:
+            ring = SharedFrameRing(self.slot_count, frame_shape)
+            # least recently used rings are released, except the ones holding frames the worker has not read yet
+            in_use = {shape for _, shape in self.pending}
+            for shape in list(self.rings):
+                if len(self.rings) < self.max_rings:
+                    break
+                if shape not in in_use:
+                    released = self.rings.pop(shape)
+                    self.requests.put(("release", released.name))
+                    released.close()
+        self.rings[frame_shape] = ring
+        return ring
+
+    def submit(self, frame, timestamp=None):
+        """ Copies the frame in the next free slot and queues it for inference """
+        if self.worker is None:
+            self._start()
+
+        if len(self.pending) >= self.slot_count:
+            raise RuntimeError("All shared memory slots are in use, collect() results before submitting more frames")
+
+        frame_id = self.next_frame_id
+        self.next_frame_id += 1
+        # frames in flight have consecutive ids, so their slots never collide whatever their ring
+        slot = frame_id % self.slot_count
+
+        ring = self.ring_for(frame.shape)
+        ring.write(slot, frame)
+        self.requests.put((frame_id, ring.name, ring.frame_shape, slot, timestamp))
+        self.pending.append((frame_id, ring.frame_shape))
+        return frame_id
+
+    def collect(self):
+        """ Waits for the oldest submitted frame and returns its landmark array (or None) """
+        expected_id, _ = self.pending.pop(0)
+        while True:
+            try:
+                frame_id, landmarks, error, latency = self.results.get(timeout=self.timeout)
+            except queue.Empty:
+                if not self.worker.is_alive():
+                    raise RuntimeError("Pose worker process exited unexpectedly")
+                continue
+
+            if error is not None:
+                print(f"Pose worker error on frame {frame_id}: {error}")
+            if frame_id == expected_id:
+                self.latency = latency
+                return landmarks
+
+    def process(self, frame, timestamp=None):
+        """ Same contract as PoseEstimator.process """
+        self.submit(frame, timestamp)
+        return self.collect()
+
+    def reconfigure(self, **pose_options):
+        """ The worker rebuilds its pose backend before handling the next frames, same contract as PoseEstimator """
+        if self.worker is None:
+            self.pose_options.update(pose_options)
+            return True
+
+        # pending frames are handled with the current graph first
+        while self.pending:
+            self.collect()
+
+        self.requests.put(("configure", pose_options))
+        while True:
+            try:
+                message_type, accepted, _, _ = self.results.get(timeout=self.timeout)
+            except queue.Empty:
+                if not self.worker.is_alive():
+                    raise RuntimeError("Pose worker process exited unexpectedly")
+                continue
+            if message_type == "configure":
+                break
+
+        if accepted:
+            self.pose_options.update(pose_options)
+        return accepted
+
+    def close(self):
+        if self.worker is not None:
+            self.requests.put(None)
+            self.worker.join(timeout=self.timeout)
+            if self.worker.is_alive():
+                self.worker.terminate()
+            self.worker = None
+        for ring in self.rings.values():
+            ring.close()
+        self.rings = {}
+        self.pending = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+
+
+def create_pose_estimator(inference_process=False, timer=None, backend="mediapipe", **pose_options):
+    """
+    Pose estimation in the assessment process, or in a dedicated worker process.
+    timer gets the color conversion and pose.process latencies of in-process estimation
+    """
+    if inference_process:
+        return ProcessPoseEstimator(backend=backend, **pose_options)
+    return PoseEstimator(backend=backend, timer=timer, **pose_options)
@@ -0,0 +1,108 @@
+import numpy as np
+from collections import namedtuple
+
+# mediapipe pose landmark indices (same values as mp_pose.PoseLandmark)
+LEFT_SHOULDER = 11
+RIGHT_SHOULDER = 12
+LEFT_HIP = 23
+RIGHT_HIP = 24
+LEFT_KNEE = 25
+RIGHT_KNEE = 26
+LEFT_ANKLE = 27
+RIGHT_ANKLE = 28
+
+# every angle used by the trackers, as (a, b, c) landmark triplets with the angle measured at b
+# None stands for the vertical reference point (x = 0, same height as b)
+ANGLE_TRIPLETS = {
+    "spine_angle": (LEFT_SHOULDER, LEFT_HIP, LEFT_KNEE),
+    "left_knee_angle": (LEFT_HIP, LEFT_KNEE, LEFT_ANKLE),
+    "right_knee_angle": (RIGHT_HIP, RIGHT_KNEE, RIGHT_ANKLE),
+    "trunk_angle": (LEFT_SHOULDER, LEFT_HIP, None),
+}
+
+_ANGLE_NAMES = list(ANGLE_TRIPLETS)
+
+# only the landmarks used by the features are gathered, indices below are positions in that subset
+_ROWS = np.array([LEFT_SHOULDER, RIGHT_SHOULDER, LEFT_HIP, RIGHT_HIP, LEFT_KNEE, RIGHT_KNEE, LEFT_ANKLE, RIGHT_ANKLE])
+_ROW = {landmark: i for i, landmark in enumerate(_ROWS.tolist())}
+
+# the angle at b is the difference between the directions b->c and b->a, all directions come from one arctan2 call
+_TO = np.array([_ROW[b if c is None else c] for a, b, c in ANGLE_TRIPLETS.values()] + [_ROW[a] for a, b, c in ANGLE_TRIPLETS.values()])
+_FROM = np.array([_ROW[b] for a, b, c in ANGLE_TRIPLETS.values()] * 2)
+_VERTICAL = np.array([i for i, (a, b, c) in enumerate(ANGLE_TRIPLETS.values()) if c is None])
+
+PoseFeatures = namedtuple('PoseFeatures', [
+    'hip_center',        # (x, y) middle of both hips
+    'shoulder_center',   # (x, y) middle of both shoulders
+    'left_ankle',        # (x, y)
+    'right_ankle',       # (x, y)
+    'ankle_diff',        # vertical distance between the ankles
+    'left_knee_y',
+    'right_knee_y',
+    'left_hip_y',
+    'left_shoulder_y',
+    'knee_forward',      # left knee x - left ankle x (knee over toe)
+    *_ANGLE_NAMES
+])
+
+
+def extract_features(landmarks):
+    """ Computes once per frame everything the trackers need from a (33, 4) landmark array """
+    points = np.asarray(landmarks)[_ROWS, :2].astype(np.float64)
+
+    # every joint angle in one vectorized pass (same convention as helpers.calculate_angles)
+    targets = points[_TO]
+    targets[_VERTICAL, 0] = 0
+    directions = targets - points[_FROM]
+    headings = np.arctan2(directions[:, 1], directions[:, 0])
+    count = len(_ANGLE_NAMES)
+    angles = np.abs((headings[:count] - headings[count:]) * 180.0 / np.pi)
+    angles = np.minimum(angles, 360 - angles).tolist()
+
+    left_shoulder, right_shoulder, left_hip, right_hip, left_knee, right_knee, left_ankle, right_ankle = points.tolist()
+
+    return PoseFeatures(
+        ((left_hip[0] + right_hip[0]) / 2, (left_hip[1] + right_hip[1]) / 2),
+        ((left_shoulder[0] + right_shoulder[0]) / 2, (left_shoulder[1] + right_shoulder[1]) / 2),
+        tuple(left_ankle),
+        tuple(right_ankle),
+        abs(left_ankle[1] - right_ankle[1]),
+        left_knee[1],
+        right_knee[1],
+        left_hip[1],
+        left_shoulder[1],
+        left_knee[0] - left_ankle[0],
+        *angles
+    )
+
+
+def extract_features_batch(landmarks):
+    """ Same features as extract_features for a whole session, from a (N, 33, 4) array, as a dict of arrays """
+    points = np.asarray(landmarks)[:, _ROWS, :2].astype(np.float64)
+
+    targets = points[:, _TO]
+    targets[:, _VERTICAL, 0] = 0
+    directions = targets - points[:, _FROM]
+    headings = np.arctan2(directions[..., 1], directions[..., 0])
+    count = len(_ANGLE_NAMES)
+    angles = np.abs((headings[:, :count] - headings[:, count:]) * 180.0 / np.pi)
+    angles = np.minimum(angles, 360 - angles)
+
+    left_shoulder, right_shoulder, left_hip, right_hip, left_knee, right_knee, left_ankle, right_ankle = \
+        points.transpose(1, 0, 2)
+
+    features = {
+        'hip_center': (left_hip + right_hip) / 2,
+        'shoulder_center': (left_shoulder + right_shoulder) / 2,
+        'left_ankle': left_ankle,
+        'right_ankle': right_ankle,
+        'ankle_diff': np.abs(left_ankle[:, 1] - right_ankle[:, 1]),
+        'left_knee_y': left_knee[:, 1],
+        'right_knee_y': right_knee[:, 1],
+        'left_hip_y': left_hip[:, 1],
+        'left_shoulder_y': left_shoulder[:, 1],
+        'knee_forward': left_knee[:, 0] - left_ankle[:, 0],
+    }
+    for i, name in enumerate(_ANGLE_NAMES):
+        features[name] = angles[:, i]
+    return features
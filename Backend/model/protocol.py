@@ -0,0 +1,104 @@
+import copy
+import json
+import os
+
+from helpers import SCORE_KEYS, DEFAULT_SCORE_WEIGHTS
+
+# trackers a phase can activate, the pose features are only extracted in phases running at least one of them
+TRACKERS = ("step", "squat", "balance")
+
+# a phase ends after "duration" seconds, or once "steps" / "squats" were counted during the phase
+CRITERIA = ("duration", "steps", "squats")
+
+# tracker counting each criterion
+CRITERION_TRACKERS = {"steps": "step", "squats": "squat"}
+
+# the assessment the model was built around: 5 s to get ready, 10 steps in place, then 3 squats
+STANDARD_PROTOCOL = {
+    "name": "standard",
+    "phases": [
+        {"name": "WAITING", "instructions": "Get ready for stepping exercise", "trackers": [], "until": {"duration": 5}},
+        {"name": "STEPPING", "instructions": "Perform 10 steps in place", "trackers": ["step", "balance"], "until": {"steps": 10}},
+        {"name": "SQUATTING", "instructions": "Now perform 3 squats", "trackers": ["squat", "balance"], "until": {"squats": 3}},
+    ],
+    "completed_instructions": "Assessment complete!",
+    "score_weights": DEFAULT_SCORE_WEIGHTS,
+}
+
+PROTOCOLS = {
+    "standard": STANDARD_PROTOCOL,
+}
+
+
+def default_instructions(criterion, target):
+    if criterion == "steps":
+        return f"Perform {target} steps in place"
+    if criterion == "squats":
+        return f"Perform {target} squats"
+    return "Get ready"
+
+
+def load_protocol(protocol=None):
+    """
+    Validated copy of an exercise protocol: None (standard protocol), the name of a built-in protocol,
+    the path of a json file or a dict. Phases run in order, each with the trackers it needs and one
+    completion criterion, e.g. {"name": "STEPPING", "trackers": ["step", "balance"], "until": {"steps": 10}}.
+    Invalid protocols raise a ValueError
+    """
+    if protocol is None:
+        protocol = STANDARD_PROTOCOL
+    elif isinstance(protocol, str):
+        if protocol in PROTOCOLS:
+            protocol = PROTOCOLS[protocol]
+        elif os.path.isfile(protocol):
+            with open(protocol) as protocol_file:
+                protocol = json.load(protocol_file)
+        else:
+            raise ValueError(f"Unknown protocol: {protocol}")
+    protocol = copy.deepcopy(protocol)
+
+    phases = protocol.get("phases")
+    if not phases:
+        raise ValueError("A protocol needs at least one phase")
+
+    names = set()
+    for phase in phases:
+        name = phase.get("name")
+        if not name or name == "COMPLETED" or name in names:
+            raise ValueError(f"Invalid or duplicated phase name: {name}")
+        names.add(name)
+
+        trackers = phase.setdefault("trackers", [])
+        unknown = [tracker for tracker in trackers if tracker not in TRACKERS]
+        if unknown:
+            raise ValueError(f"Unknown trackers in phase {name}: {unknown}")
+
+        until = phase.get("until", {})
+        if len(until) != 1 or next(iter(until)) not in CRITERIA:
+            raise ValueError(f"Phase {name} needs exactly one completion criterion among {CRITERIA}")
+        criterion, target = next(iter(until.items()))
+        if not isinstance(target, (int, float)) or target <= 0:
+            raise ValueError(f"Phase {name} has an invalid {criterion} target: {target}")
+        if criterion in CRITERION_TRACKERS and CRITERION_TRACKERS[criterion] not in trackers:
+            raise ValueError(f"Phase {name} counts {criterion} without the {CRITERION_TRACKERS[criterion]} tracker")
+
+        phase.setdefault("instructions", default_instructions(criterion, target))
+
+    weights = protocol.setdefault("score_weights", dict(DEFAULT_SCORE_WEIGHTS))
+    unknown = [key for key in weights if key not in SCORE_KEYS or key == "overall_score"]
+    if unknown:
+        raise ValueError(f"Unknown scores in score_weights: {unknown}")
+
+    protocol.setdefault("name", "custom")
+    protocol.setdefault("completed_instructions", "Assessment complete!")
+    return protocol
+
+
+def protocol_trackers(protocol):
+    """ Every tracker activated by at least one phase """
+    return {tracker for phase in protocol["phases"] for tracker in phase["trackers"]}
+
+
+def protocol_target(protocol, criterion):
+    """ Total steps or squats asked by the protocol """
+    return sum(phase["until"].get(criterion, 0) for phase in protocol["phases"])
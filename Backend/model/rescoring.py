@@ -0,0 +1,106 @@
+import os
+import sys
+import json
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+from session_recorder import load_recording
+from batch_scoring import score_session
+from helpers import resolve_thresholds
+
+MODEL_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+
+
+def resolve_recording_path(path):
+    """ Recording paths are stored relative to the directory the scan ran in (usually model/ or Backend/) """
+    if os.path.isabs(path):
+        return path
+    for directory in (os.getcwd(), MODEL_DIRECTORY, os.path.dirname(MODEL_DIRECTORY)):
+        candidate = os.path.normpath(os.path.join(directory, path))
+        if os.path.exists(candidate):
+            return candidate
+    raise FileNotFoundError(f"Recording not found: {path}")
+
+
+def rescore_recording(path, thresholds=None):
+    """
+    Scores a landmark recording again with other thresholds, no video and no pose inference.
+    The frames where a pose was found are replayed through the batch versions of the trackers (batch_scoring),
+    the session starts at the recorded start event. Landmarks are stored as float16, so scores with
+    the default thresholds can differ slightly from the ones computed live.
+    The session is scored with the protocol it was recorded with (older recordings used the standard one)
+    """
+    thresholds = resolve_thresholds(thresholds)
+    recording = load_recording(resolve_recording_path(path))
+
+    timestamps = np.asarray(recording["timestamps"])
+    start_time = float(timestamps[0]) if len(timestamps) else None
+    for event in recording["metadata"].get("events", []):
+        if event["event"] == "start":
+            start_time = event["timestamp"]
+            break
+
+    # frames without a pose are stored as nan and were never given to the trackers
+    landmarks = recording["landmarks"]
+    found = ~np.isnan(landmarks[:, 0, 0])
+    protocol = recording["metadata"].get("processing_settings", {}).get("protocol")
+    result = score_session(landmarks[found].astype(np.float32), timestamps[found], start_time=start_time,
+                           thresholds=thresholds, protocol=protocol)
+
+    return {
+        "recording": path,
+        "thresholds": thresholds,
+        "frame_count": len(timestamps),
+        **result
+    }
+
+
+def rescore_recordings(paths, thresholds=None, workers=None):
+    """
+    Re-scores many recordings on a pool of worker processes, returns the results in the order of paths.
+    A recording that cannot be scored gives {"recording": path, "error": message} instead of failing the batch
+    """
+    thresholds = resolve_thresholds(thresholds)
+    if not paths:
+        return []
+
+    # spawn gives the same behavior on every platform (and no forked copy of the flask app or the database session)
+    context = multiprocessing.get_context("spawn")
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(rescore_recording, path, thresholds) for path in paths]
+
+        results = []
+        for path, future in zip(paths, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append({"recording": path, "error": str(e)})
+        return results
+
+
+if __name__ == "__main__":
+    # e.g. python rescoring.py '{"scan_ids": [12, 13], "thresholds": {"squat_down_angle": 120}, "workers": 4}'
+    # without scan_ids every scan with a landmark recording is re-scored
+    args = json.loads(sys.argv[1]) if len(sys.argv) > 1 else {}
+    scan_ids = args.get('scan_ids')
+    thresholds = args.get('thresholds')
+    workers = args.get('workers')
+
+    sys.path.append(os.path.dirname(MODEL_DIRECTORY))
+    from app import create_app
+    from app.services.rescoring_service import RescoringService
+
+    app = create_app()
+    with app.app_context():
+        scans = RescoringService.get_recorded_scans(scan_ids)
+        print(f"Re-scoring {len(scans)} scans")
+
+        results = rescore_recordings([scan.recording_path for scan in scans], thresholds, workers)
+        for scan, result in zip(scans, results):
+            if "error" in result:
+                print(f"Scan {scan.id}: {result['error']}")
+                continue
+            score_set = RescoringService.save_score_set(scan, result)
+            print(f"Scan {scan.id}: version {score_set.version}, overall score {score_set.overall_score:.1f}")
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+def spill_file_path(prefix, name):
+    """ Spill file of the name buffer of a tracker spilling to prefix (None when the tracker keeps its history in memory) """
+    return None if prefix is None else f"{prefix}_{name}.bin"
+
+
+class RingBuffer:
+    """
+    Fixed capacity history of scalars (width=None) or fixed width rows, stored in a preallocated numpy array.
+    Every value is written twice (at i and i + capacity), so the last n values are always contiguous
+    and reads like buffer[-30:] are views, never copies.
+    With spill_path, each full block of capacity values is appended to that file before being overwritten,
+    history() then returns the whole session. The file is closed by close() (or at the end of a with block)
+    """
+    __slots__ = ('capacity', 'width', 'data', 'position', 'total', 'spill_path', 'spill_file')
+
+    def __init__(self, capacity, width=None, dtype=np.float64, spill_path=None):
+        self.capacity = capacity
+        self.width = width
+        shape = (2 * capacity,) if width is None else (2 * capacity, width)
+        self.data = np.zeros(shape, dtype=dtype)
+        self.position = 0  # next write index in [0, capacity)
+        self.total = 0     # values appended since the start, including the overwritten ones
+        self.spill_path = spill_path
+        self.spill_file = None
+
+    def append(self, value):
+        position = self.position
+        if position == 0 and self.total and self.spill_path is not None:
+            self.spill()
+        self.data[position] = value
+        self.data[position + self.capacity] = value
+        self.position = position + 1 if position + 1 < self.capacity else 0
+        self.total += 1
+
+    def view(self, count=None):
+        """ Last count values (all the stored ones by default), oldest first, as a read-only view """
+        stored = min(self.total, self.capacity)
+        count = stored if count is None else min(count, stored)
+        end = self.position + self.capacity
+        window = self.data[end - count:end]
+        window.flags.writeable = False
+        return window
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def __bool__(self):
+        return self.total > 0
+
+    def __getitem__(self, key):
+        return self.view()[key]
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def spill(self):
+        # at a wrap the first half holds the last capacity values in order
+        if self.spill_file is None:
+            self.spill_file = open(self.spill_path, 'wb')
+        self.data[:self.capacity].tofile(self.spill_file)
+
+    def history(self):
+        """ Every value since the start when spilling to disk, otherwise the stored ones """
+        # the first block is spilled by the append that follows it
+        if self.spill_path is None or self.total <= self.capacity:
+            return self.view()
+        if self.spill_file is not None:
+            self.spill_file.flush()
+        shape = (-1,) if self.width is None else (-1, self.width)
+        spilled = np.fromfile(self.spill_path, dtype=self.data.dtype).reshape(shape)
+        return np.concatenate([spilled, self.view(self.total - len(spilled))])
+
+    def close(self):
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,104 @@
+import numpy as np
+import cv2
+
+
+class RoiPoseEstimator:
+    """
+    Runs a pose estimator on a padded square crop around the person found in the previous frame,
+    resized to a fixed small input, and maps the landmarks back to full-frame normalized coordinates.
+    Falls back to a full-frame search when the person is lost
+    """
+    def __init__(self, estimator, input_size=256, padding=0.25, min_visibility=0.5, min_visible_landmarks=8):
+        self.estimator = estimator
+        self.input_size = input_size
+        self.padding = padding
+        self.min_visibility = min_visibility
+        self.min_visible_landmarks = min_visible_landmarks
+
+        self.roi = None  # (x0, y0, side) of the square crop in frame pixels
+
+        self.roi_frames = 0
+        self.full_frames = 0
+        self.lost_count = 0
+
+    def process(self, frame, timestamp=None):
+        h, w = frame.shape[:2]
+
+        if self.roi is not None:
+            self.roi_frames += 1
+            landmarks = self.estimator.process(self.crop(frame, self.roi), timestamp)
+            if landmarks is not None:
+                landmarks = self.to_frame_coordinates(landmarks, self.roi, w, h)
+                self.roi = self.compute_roi(landmarks, w, h)
+                if self.roi is not None:
+                    return landmarks
+
+            # tracking lost, we search the whole frame again on this same frame
+            self.lost_count += 1
+            self.roi = None
+
+        self.full_frames += 1
+        landmarks = self.estimator.process(frame, timestamp)
+        if landmarks is not None:
+            self.roi = self.compute_roi(landmarks, w, h)
+        return landmarks
+
+    def compute_roi(self, landmarks, w, h):
+        """ Padded square box around the visible landmarks, None if too few landmarks are visible """
+        visible = landmarks[landmarks[:, 3] >= self.min_visibility]
+        if len(visible) < self.min_visible_landmarks:
+            return None
+
+        xs = visible[:, 0] * w
+        ys = visible[:, 1] * h
+        center_x = (xs.min() + xs.max()) / 2
+        center_y = (ys.min() + ys.max()) / 2
+        side = max(xs.max() - xs.min(), ys.max() - ys.min()) * (1 + 2 * self.padding)
+
+        # no point cropping when the person already fills the frame
+        if side >= min(w, h):
+            return None
+
+        side = int(np.ceil(side))
+        return (int(center_x - side / 2), int(center_y - side / 2), side)
+
+    def crop(self, frame, roi):
+        """ Square crop (areas outside the frame are left black) resized to the model input size """
+        x0, y0, side = roi
+        h, w = frame.shape[:2]
+        canvas = np.zeros((side, side, 3), dtype=frame.dtype)
+
+        fx0, fy0 = max(x0, 0), max(y0, 0)
+        fx1, fy1 = min(x0 + side, w), min(y0 + side, h)
+        if fx0 < fx1 and fy0 < fy1:
+            canvas[fy0 - y0:fy1 - y0, fx0 - x0:fx1 - x0] = frame[fy0:fy1, fx0:fx1]
+
+        interpolation = cv2.INTER_AREA if side > self.input_size else cv2.INTER_LINEAR
+        return cv2.resize(canvas, (self.input_size, self.input_size), interpolation=interpolation)
+
+    @staticmethod
+    def to_frame_coordinates(landmarks, roi, w, h):
+        x0, y0, side = roi
+        mapped = landmarks.copy()
+        mapped[:, 0] = (x0 + landmarks[:, 0] * side) / w
+        mapped[:, 1] = (y0 + landmarks[:, 1] * side) / h
+        # mediapipe z uses the same scale as x
+        mapped[:, 2] = landmarks[:, 2] * side / w
+        return mapped
+
+    def stats(self):
+        total = self.roi_frames + self.full_frames
+        return {
+            "roi_frames": self.roi_frames,
+            "full_frames": self.full_frames,
+            "lost_count": self.lost_count,
+            "roi_rate": self.roi_frames / total if total else 0.0,
+            "input_size": self.input_size
+        }
+
+    def reconfigure(self, **pose_options):
+        self.roi = None
+        return self.estimator.reconfigure(**pose_options)
+
+    def close(self):
+        self.estimator.close()
@@ -0,0 +1,102 @@
+import os
+import json
+import queue
+import threading
+import numpy as np
+
+from landmarks import NUM_LANDMARKS, LANDMARK_FIELDS
+
+# one record per processed frame, landmarks quantized to float16 (nan when no pose was found)
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('kind', 'u1'),  # inference_scheduler frame codes (inferred, held, extrapolated, ...)
+    ('landmarks', '<f2', (NUM_LANDMARKS, LANDMARK_FIELDS)),
+])
+
+# the npy header is written with a fixed size so the frame count can be filled in once the session is over
+HEADER_SIZE = 256
+CHUNK_SIZE = 256
+
+
+def npy_header(dtype, count):
+    """ Version 1.0 npy header of a 1-d array of count records, padded to HEADER_SIZE bytes """
+    header = repr({'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (count,)})
+    header = header.ljust(HEADER_SIZE - 10 - 1) + '\n'
+    return b'\x93NUMPY\x01\x00' + len(header).to_bytes(2, 'little') + header.encode('latin1')
+
+
+class SessionRecorder:
+    """
+    Records the landmarks given to the trackers, their capture timestamps and the session events.
+    Frames are written to a memory mappable .npy file of RECORD_DTYPE records, events and settings
+    to a .json file next to it. The capture and inference loops only fill an in-memory chunk,
+    full chunks are written to disk by a background thread
+    """
+    def __init__(self, path):
+        self.path = path
+        self.metadata_path = os.path.splitext(path)[0] + '.json'
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.file = open(path, 'wb')
+        self.file.write(npy_header(RECORD_DTYPE, 0))
+
+        self.chunk = np.empty(CHUNK_SIZE, dtype=RECORD_DTYPE)
+        self.chunk_count = 0
+        self.count = 0
+
+        self.write_queue = queue.Queue()
+        self.writer = threading.Thread(target=self.write_chunks, name="session-recorder", daemon=True)
+        self.writer.start()
+
+    def record(self, timestamp, landmarks, kind):
+        record = self.chunk[self.chunk_count]
+        record['timestamp'] = timestamp
+        record['kind'] = kind
+        record['landmarks'] = np.nan if landmarks is None else landmarks
+        self.chunk_count += 1
+        self.count += 1
+
+        if self.chunk_count == CHUNK_SIZE:
+            self.write_queue.put(self.chunk)
+            self.chunk = np.empty(CHUNK_SIZE, dtype=RECORD_DTYPE)
+            self.chunk_count = 0
+
+    def write_chunks(self):
+        while True:
+            chunk = self.write_queue.get()
+            if chunk is None:
+                break
+            chunk.tofile(self.file)
+
+    def close(self, metadata=None):
+        """ Writes the last frames, the final header and the metadata, returns the recording path """
+        if self.chunk_count:
+            self.write_queue.put(self.chunk[:self.chunk_count])
+        self.write_queue.put(None)
+        self.writer.join()
+
+        self.file.seek(0)
+        self.file.write(npy_header(RECORD_DTYPE, self.count))
+        self.file.close()
+
+        with open(self.metadata_path, 'w') as metadata_file:
+            json.dump({"frame_count": self.count, **(metadata or {})}, metadata_file, indent=4)
+
+        return self.path
+
+
+def load_recording(path):
+    """ Memory maps a recording, landmarks and timestamps are views on the file (nothing is copied) """
+    frames = np.load(path, mmap_mode='r')
+    metadata_path = os.path.splitext(path)[0] + '.json'
+    metadata = {}
+    if os.path.exists(metadata_path):
+        with open(metadata_path) as metadata_file:
+            metadata = json.load(metadata_file)
+
+    return {
+        "timestamps": frames['timestamp'],
+        "kinds": frames['kind'],
+        "landmarks": frames['landmarks'],
+        "metadata": metadata
+    }
@@ -1,89 +1,66 @@
 import numpy as np
-from helpers import calculate_angles
+from ring_buffer import RingBuffer, spill_file_path
+
+# squat quality looks at the last 30 frames, the posture score at the last 90 spine angles
+SQUAT_HISTORY = 128
 
 class SquatTracker:
-    def __init__(self):
+    __slots__ = ('squat_count', 'in_squat', 'last_squat_time', 'down_angle', 'up_angle', 'hip_positions', 'knee_angles', 'spine_angles',
+                 'knee_tracking', 'arm_angles', 'squat_qualities')
+
+    def __init__(self, capacity=SQUAT_HISTORY, down_angle=130, up_angle=160, spill_path=None):
         self.squat_count = 0
         self.in_squat = False # flag to indicate if currently in a squat
         self.last_squat_time = 0
+        self.down_angle = down_angle
+        self.up_angle = up_angle
         
-        self.hip_positions = []
-        self.knee_angles = [] 
-        self.spine_angles = [] 
+        # with spill_path, the histories are also appended to <spill_path>_<history>.bin files
+        self.hip_positions = RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'hip_positions'))
+        self.knee_angles = RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'knee_angles'))
+        self.spine_angles = RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'spine_angles'))
         self.knee_tracking = { 
-            'left': [],
-            'right': []
+            'left': RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'left_knee_tracking'))
         }
-        self.arm_angles = [] 
+        self.arm_angles = RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'arm_angles'))
         self.squat_qualities = []
      
        
-    def add_frame_data(self, landmarks, mp_pose):
-        """ Adds data of a frame to the respective lists for analysis """
-        left_shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-        left_knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        left_foot = landmarks[mp_pose.PoseLandmark.LEFT_FOOT_INDEX.value]
-        
+    def close(self):
+        """ Closes the spill files of the histories """
+        for history in (self.hip_positions, self.knee_angles, self.spine_angles, *self.knee_tracking.values(),
+                        self.arm_angles):
+            history.close()
+
+    def add_frame_data(self, features):
+        """ Adds data of a frame to the respective histories for analysis """
         # track left hip position
-        self.hip_positions.append(left_hip.y)
+        self.hip_positions.append(features.left_hip_y)
         
         # track knee angle (left) for depth during the squat
-        left_knee_angle = calculate_angles(
-            [left_hip.x, left_hip.y], 
-            [left_knee.x, left_knee.y], 
-            [left_ankle.x, left_ankle.y]
-        )
-        self.knee_angles.append(left_knee_angle)
+        self.knee_angles.append(features.left_knee_angle)
         
-        # track spine angle
-        spine_angle = calculate_angles(
-            [left_shoulder.x, left_shoulder.y],
-            [left_hip.x, left_hip.y],
-            [0, left_hip.y]  # Vertical reference point
-        )
-        self.spine_angles.append(spine_angle)
+        # track spine angle (left shoulder and hip against the vertical)
+        self.spine_angles.append(features.trunk_angle)
         
         # track knee alignment
-        knee_forward_position = left_knee.x - left_ankle.x
-        self.knee_tracking['left'].append(knee_forward_position)
+        self.knee_tracking['left'].append(features.knee_forward)
         
         # track arm & shoulder stability
-        shoulder_height = (left_shoulder.y)
-        self.arm_angles.append(shoulder_height)
+        self.arm_angles.append(features.left_shoulder_y)
         
 
-    def detect_squat(self, landmarks, mp_pose, current_time):
+    def detect_squat(self, features, current_time):
         """ Detects squat based on knee angle and tracks squat count """
-        self.add_frame_data(landmarks, mp_pose)
-        
-        # body key points for squat detection
-        left_hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-        left_knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_hip = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value]
-        right_knee = landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value]
-        right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
+        self.add_frame_data(features)
         
-        # calculate the average knee angle for squat detection
-        left_knee_angle = calculate_angles(
-            [left_hip.x, left_hip.y], 
-            [left_knee.x, left_knee.y], 
-            [left_ankle.x, left_ankle.y]
-        )
-        right_knee_angle = calculate_angles(
-            [right_hip.x, right_hip.y], 
-            [right_knee.x, right_knee.y], 
-            [right_ankle.x, right_ankle.y]
-        )
-
-        avg_knee_angle = (left_knee_angle + right_knee_angle) / 2
+        # the average knee angle is used for squat detection
+        avg_knee_angle = (features.left_knee_angle + features.right_knee_angle) / 2
         
         # we detect squat based on knee angle (can be tweaked based on squat depth and professional feedback)
-        if avg_knee_angle < 130 and not self.in_squat and current_time - self.last_squat_time > 1.0:
+        if avg_knee_angle < self.down_angle and not self.in_squat and current_time - self.last_squat_time > 1.0:
             self.in_squat = True
-        elif avg_knee_angle > 160 and self.in_squat:
+        elif avg_knee_angle > self.up_angle and self.in_squat:
             self.squat_count += 1
             self.in_squat = False
             self.last_squat_time = current_time
@@ -182,11 +159,16 @@ class SquatTracker:
 
     def get_squat_score(self):
         """ Get the overall squat score based on completed squats """
-        if self.squat_count == 0:
-            return 0
-            
-        # ff we have quality scores on the three squats, we use their average
-        if len(self.squat_qualities) > 0:
-            return sum(self.squat_qualities) / len(self.squat_qualities)
-        else:
-            return 60  # default middle score if no quality available
\ No newline at end of file
+        return calculate_squat_score(self.squat_count, self.squat_qualities)
+
+
+def calculate_squat_score(squat_count, squat_qualities):
+    """ Squat score from the squat count and the quality of each squat """
+    if squat_count == 0:
+        return 0
+        
+    # ff we have quality scores on the three squats, we use their average
+    if len(squat_qualities) > 0:
+        return sum(squat_qualities) / len(squat_qualities)
+    else:
+        return 60  # default middle score if no quality available
@@ -0,0 +1,152 @@
+import math
+import time
+from collections import deque
+
+# latencies from 10 µs to 10 s in log spaced buckets of ~5% width (percentiles within ~2.5%)
+HISTOGRAM_MIN = 1e-5
+HISTOGRAM_MAX = 10.0
+BUCKET_RATIO = 1.05
+
+# capture times kept for the capture to render latency, more than the frames the stage queues can hold
+CAPTURE_TIMES = 64
+
+
+class LatencyHistogram:
+    """
+    Fixed log spaced histogram of durations in seconds, recording is O(1) with no allocation.
+    Percentiles are read from the bucket counts (geometric middle of the bucket)
+    """
+    __slots__ = ('counts', 'count', 'total', 'maximum')
+
+    BUCKET_COUNT = int(math.ceil(math.log(HISTOGRAM_MAX / HISTOGRAM_MIN) / math.log(BUCKET_RATIO))) + 1
+    LOG_RATIO = math.log(BUCKET_RATIO)
+
+    def __init__(self):
+        self.counts = [0] * self.BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def record(self, duration):
+        if duration <= HISTOGRAM_MIN:
+            bucket = 0
+        else:
+            bucket = min(int(math.log(duration / HISTOGRAM_MIN) / self.LOG_RATIO) + 1, self.BUCKET_COUNT - 1)
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = p / 100 * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if bucket == 0:
+                    return HISTOGRAM_MIN
+                if bucket == self.BUCKET_COUNT - 1:
+                    # overflow bucket, only its largest value is known
+                    return self.maximum
+                # middle of [min * ratio^(bucket - 1), min * ratio^bucket), never above the largest value seen
+                return min(HISTOGRAM_MIN * BUCKET_RATIO ** (bucket - 0.5), self.maximum)
+        return self.maximum
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+            "max_ms": round(self.maximum * 1000, 3)
+        }
+
+
+class StageMeasure:
+    """ Context manager timing one stage into its histogram (one reusable instance per stage) """
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.histogram.record(time.perf_counter() - self.start)
+        return False
+
+
+class StageTimer:
+    """
+    Latency histograms of the named stages of the assessment loop (capture, pose, trackers, overlay, display...)
+    and the rate of processed frames. Each stage must only be timed from one thread.
+    captured() and rendered() time each frame from its capture to the end of its display (capture_to_render)
+    """
+    def __init__(self):
+        self.histograms = {}
+        self.measures = {}
+        self.frame_count = 0
+        self.first_frame = None
+        self.last_frame = None
+        # (timestamp, capture time) in capture order, appended by the capture thread and read by the render one
+        self.capture_times = deque(maxlen=CAPTURE_TIMES)
+
+    def histogram(self, stage):
+        histogram = self.histograms.get(stage)
+        if histogram is None:
+            histogram = self.histograms[stage] = LatencyHistogram()
+            self.measures[stage] = StageMeasure(histogram)
+        return histogram
+
+    def measure(self, stage):
+        """ with timer.measure("pose"): ... """
+        measure = self.measures.get(stage)
+        if measure is None:
+            self.histogram(stage)
+            measure = self.measures[stage]
+        return measure
+
+    def record(self, stage, duration):
+        self.histogram(stage).record(duration)
+
+    def frame(self):
+        """ Marks a processed frame (fps of the loop and time between two frames) """
+        now = time.perf_counter()
+        if self.first_frame is None:
+            self.first_frame = now
+        else:
+            self.record("frame_interval", now - self.last_frame)
+        self.last_frame = now
+        self.frame_count += 1
+
+    def captured(self, timestamp):
+        """ Marks the capture of the frame with this timestamp """
+        self.capture_times.append((timestamp, time.perf_counter()))
+
+    def rendered(self, timestamp):
+        """ Records the capture to render latency of a displayed frame (frames dropped in between are skipped) """
+        capture_times = self.capture_times
+        while capture_times and capture_times[0][0] < timestamp:
+            capture_times.popleft()
+        if capture_times and capture_times[0][0] == timestamp:
+            self.record("capture_to_render", time.perf_counter() - capture_times.popleft()[1])
+
+    def fps(self):
+        if self.frame_count < 2 or self.last_frame == self.first_frame:
+            return 0.0
+        return (self.frame_count - 1) / (self.last_frame - self.first_frame)
+
+    def summary(self, dropped_frames=0):
+        return {
+            "frames": self.frame_count,
+            "fps": round(self.fps(), 2),
+            "dropped_frames": dropped_frames,
+            "stages": {stage: histogram.summary() for stage, histogram in self.histograms.items()}
+        }
@@ -1,62 +1,76 @@
-import numpy as np
-from helpers import calculate_spine_angle
+from ring_buffer import RingBuffer, spill_file_path
+from streaming_stats import WindowedStats
+
+# frames kept in memory
+STEP_HISTORY = 128
+
+# step quality looks at the last 30 frames at most
+STEP_WINDOW = 30
 
 class StepTracker:
-    def __init__(self):
+    __slots__ = ('steps', 'last_step_time', 'is_stepping', 'step_threshold',
+                 'hip_positions', 'shoulder_positions', 'spine_angles', 'knee_heights', 'step_qualities',
+                 'hip_x_window', 'hip_y_window', 'shoulder_x_window', 'spine_window', 'knee_windows')
+
+    def __init__(self, capacity=STEP_HISTORY, step_threshold=0.05, spill_path=None):
         self.steps = 0
         self.last_step_time = 0
         self.is_stepping = False
-        self.step_threshold = 0.05
+        self.step_threshold = step_threshold
         
-        self.ankle_positions = []
-        self.hip_positions = []
-        self.knee_positions = []
-        self.shoulder_positions = []
-        self.spine_angles = []
+        # with spill_path, the histories are also appended to <spill_path>_<history>.bin files
+        self.hip_positions = RingBuffer(capacity, width=2, spill_path=spill_file_path(spill_path, 'hip_positions'))
+        self.shoulder_positions = RingBuffer(capacity, width=2,
+                                             spill_path=spill_file_path(spill_path, 'shoulder_positions'))
+        self.spine_angles = RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'spine_angles'))
         self.knee_heights = {
-            'left': [],
-            'right': []
+            'left': RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'left_knee_heights')),
+            'right': RingBuffer(capacity, spill_path=spill_file_path(spill_path, 'right_knee_heights'))
         }
         self.step_qualities = []
+
+        # sliding window statistics of the step quality, updated in O(1) per frame
+        self.hip_x_window = WindowedStats(STEP_WINDOW)
+        self.hip_y_window = WindowedStats(STEP_WINDOW)
+        self.shoulder_x_window = WindowedStats(STEP_WINDOW)
+        self.spine_window = WindowedStats(STEP_WINDOW)
+        self.knee_windows = {
+            'left': WindowedStats(STEP_WINDOW),
+            'right': WindowedStats(STEP_WINDOW)
+        }
         
-    def add_frame_data(self, landmarks, mp_pose):
-        """ Adds data of a frame to the respective lists for analysis """
-        # hip tracking
-        left_hip = [landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].x, landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y]
-        right_hip = [landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].x, landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].y]
-        hip_center = [(left_hip[0] + right_hip[0])/2, (left_hip[1] + right_hip[1])/2]
-        self.hip_positions.append(hip_center)
-        
-        # shoulder tracking
-        left_shoulder = [landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].x, landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value].y]
-        right_shoulder = [landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].x, landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value].y]
-        shoulder_center = [(left_shoulder[0] + right_shoulder[0])/2, (left_shoulder[1] + right_shoulder[1])/2]
-        self.shoulder_positions.append(shoulder_center)
+    def close(self):
+        """ Closes the spill files of the histories """
+        for history in (self.hip_positions, self.shoulder_positions, self.spine_angles, *self.knee_heights.values()):
+            history.close()
+
+    def add_frame_data(self, features):
+        """ Adds data of a frame to the respective histories for analysis """
+        # hip and shoulder tracking
+        self.hip_positions.append(features.hip_center)
+        self.shoulder_positions.append(features.shoulder_center)
         
         # knee tracking for height and symmetry
-        left_knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-        right_knee = landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value]
-        self.knee_heights['left'].append(left_knee.y)
-        self.knee_heights['right'].append(right_knee.y)
+        self.knee_heights['left'].append(features.left_knee_y)
+        self.knee_heights['right'].append(features.right_knee_y)
         
         # spine angle tracking
-        spine_angle = calculate_spine_angle(landmarks, mp_pose)
-        self.spine_angles.append(spine_angle)
+        self.spine_angles.append(features.spine_angle)
+
+        self.hip_x_window.add(features.hip_center[0])
+        self.hip_y_window.add(features.hip_center[1])
+        self.shoulder_x_window.add(features.shoulder_center[0])
+        self.spine_window.add(features.spine_angle)
+        self.knee_windows['left'].add(features.left_knee_y)
+        self.knee_windows['right'].add(features.right_knee_y)
         
 
-    def detect_step(self, landmarks, mp_pose, current_time):
+    def detect_step(self, features, current_time):
         """ Detects a step based on ankle positions and time """
-        left_ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-        right_ankle = landmarks[mp_pose.PoseLandmark.RIGHT_ANKLE.value]
-        
-        # track ankle vertical positions
-        left_y = left_ankle.y
-        right_y = right_ankle.y
+        # difference between ankle heights
+        ankle_diff = features.ankle_diff
         
-        # calculate difference between ankle heights
-        ankle_diff = abs(left_y - right_y)
-        
-        self.add_frame_data(landmarks, mp_pose)
+        self.add_frame_data(features)
         
         # if ankles are significantly apart vertically and we haven't recently counted a step, count a step
         if ankle_diff > self.step_threshold and not self.is_stepping and current_time - self.last_step_time > 0.5:
@@ -85,21 +99,18 @@ class StepTracker:
         - 3. knee lift symmetry (0-25 points)
         - 4. shoulder stability (0-25 points)
         """
-        # use recent frames (last 2-3 seconds of data)
-        frames_to_analyze = min(30, len(self.hip_positions))
+        # use recent frames (last 2-3 seconds of data), every window holds the last frames_to_analyze values
+        frames_to_analyze = min(STEP_WINDOW, len(self.hip_positions))
         
         # 1. hip displacement & stability (0-25 points)
-        recent_hip_y = [pos[1] for pos in self.hip_positions[-frames_to_analyze:]]
-        hip_vertical_variance = np.var(recent_hip_y)
-        recent_hip_x = [pos[0] for pos in self.hip_positions[-frames_to_analyze:]]
-        hip_lateral_variance = np.var(recent_hip_x)
+        hip_vertical_variance = self.hip_y_window.variance()
+        hip_lateral_variance = self.hip_x_window.variance()
         
         # Lower variance = better stability
         hip_stability_score = 25 - min(25, (hip_vertical_variance + hip_lateral_variance) * 1000)
         
         # 2. spine angle consistency (0-25 points)
-        recent_spine_angles = self.spine_angles[-frames_to_analyze:]
-        spine_variance = np.var(recent_spine_angles)
+        spine_variance = self.spine_window.variance()
         
         # lower variance = more consistent spine angle
         spine_consistency_score = 25 - min(25, spine_variance * 0.5)
@@ -107,8 +118,8 @@ class StepTracker:
         # 3. knee lift symmetry (0-25 points)
         # if we have anough data, we calculate the knee lift symmetry
         if len(self.knee_heights['left']) > frames_to_analyze and len(self.knee_heights['right']) > frames_to_analyze:
-            left_knee_range = max(self.knee_heights['left'][-frames_to_analyze:]) - min(self.knee_heights['left'][-frames_to_analyze:])
-            right_knee_range = max(self.knee_heights['right'][-frames_to_analyze:]) - min(self.knee_heights['right'][-frames_to_analyze:])
+            left_knee_range = self.knee_windows['left'].range()
+            right_knee_range = self.knee_windows['right'].range()
             
             # difference between left and right knee movement range
             knee_symmetry_diff = abs(left_knee_range - right_knee_range)
@@ -119,8 +130,7 @@ class StepTracker:
             knee_symmetry_score = 12.5  # default score (half) 
             
         # 4. shoulder stability (0-25 points)
-        recent_shoulder_x = [pos[0] for pos in self.shoulder_positions[-frames_to_analyze:]]
-        shoulder_lateral_variance = np.var(recent_shoulder_x)
+        shoulder_lateral_variance = self.shoulder_x_window.variance()
         
         # lower variance = better stability
         shoulder_stability_score = 25 - min(25, shoulder_lateral_variance * 1000)
@@ -135,20 +145,25 @@ class StepTracker:
         return self.steps
     
 
-    def get_stepping_score(self):
+    def get_stepping_score(self, steps_required=10):
         """ Calculate overall stepping score based on quantity and quality """
-        if self.steps == 0:
-            return 0
-            
-        # calculate average quality score from all steps
-        if len(self.step_qualities) > 0:
-            avg_quality = sum(self.step_qualities) / len(self.step_qualities)
-        else:
-            avg_quality = 50  # default score (half) if no data
-            
-        # combine quantity (number of steps completed) with quality
-        # 40% of score is from completing steps, 60% from quality
-        quantity_score = min(40, self.steps * 4)  # max 40 points for 10 steps
-        quality_score = avg_quality * 0.6  # max 60 points for quality
-        
-        return min(100, quantity_score + quality_score)
\ No newline at end of file
+        return calculate_stepping_score(self.steps, self.step_qualities, steps_required)
+
+
+def calculate_stepping_score(steps, step_qualities, steps_required=10):
+    """ Stepping score from the step count (out of the steps_required by the protocol) and the quality of each step """
+    if steps == 0:
+        return 0
+        
+    # calculate average quality score from all steps
+    if len(step_qualities) > 0:
+        avg_quality = sum(step_qualities) / len(step_qualities)
+    else:
+        avg_quality = 50  # default score (half) if no data
+        
+    # combine quantity (number of steps completed) with quality
+    # 40% of score is from completing steps, 60% from quality
+    quantity_score = min(40, steps * 40 / steps_required)  # max 40 points for all the required steps
+    quality_score = avg_quality * 0.6  # max 60 points for quality
+    
+    return min(100, quantity_score + quality_score)
@@ -0,0 +1,101 @@
+from collections import deque
+
+
+class RunningStats:
+    """ Mean and population variance (same as np.mean / np.var) of every value added, updated in O(1) with Welford's method """
+    __slots__ = ('count', 'mean', 'm2')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # sum of squared differences to the mean
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def variance(self):
+        return self.m2 / self.count if self.count else 0.0
+
+
+class WindowedStats:
+    """
+    Mean, population variance, min and max of the last size values, updated in O(1) per value.
+    The variance adds the new value and removes the oldest one with Welford updates (recomputed exactly
+    every few windows so rounding errors cannot build up), min and max come from monotonic queues
+    """
+    __slots__ = ('size', 'values', 'position', 'count', 'total', 'mean', 'm2', 'min_queue', 'max_queue', 'removals')
+
+    # removals between two exact recomputations of the variance
+    REFRESH_INTERVAL = 1024
+
+    def __init__(self, size):
+        self.size = size
+        self.values = [0.0] * size
+        self.position = 0
+        self.count = 0  # values currently in the window
+        self.total = 0  # values added since the start
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min_queue = deque()  # (index, value) with increasing values
+        self.max_queue = deque()  # (index, value) with decreasing values
+        self.removals = 0
+
+    def add(self, value):
+        if self.count == self.size:
+            self.remove(self.values[self.position])
+
+        self.values[self.position] = value
+        self.position = (self.position + 1) % self.size
+
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        index = self.total
+        self.total += 1
+        oldest = index - self.size
+        while self.min_queue and self.min_queue[-1][1] >= value:
+            self.min_queue.pop()
+        self.min_queue.append((index, value))
+        if self.min_queue[0][0] <= oldest:
+            self.min_queue.popleft()
+        while self.max_queue and self.max_queue[-1][1] <= value:
+            self.max_queue.pop()
+        self.max_queue.append((index, value))
+        if self.max_queue[0][0] <= oldest:
+            self.max_queue.popleft()
+
+    def remove(self, value):
+        self.count -= 1
+        if self.count == 0:
+            self.mean = self.m2 = 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 -= delta * (value - self.mean)
+
+        self.removals += 1
+        if self.removals % self.REFRESH_INTERVAL == 0:
+            self.refresh()
+
+    def refresh(self):
+        # called with the oldest value already removed, the window is every stored value but the one at position
+        window = [value for i, value in enumerate(self.values) if i != self.position]
+        self.mean = sum(window) / len(window)
+        self.m2 = sum((value - self.mean) ** 2 for value in window)
+
+    def variance(self):
+        return max(self.m2, 0.0) / self.count if self.count else 0.0
+
+    def minimum(self):
+        return self.min_queue[0][1]
+
+    def maximum(self):
+        return self.max_queue[0][1]
+
+    def range(self):
+        return self.max_queue[0][1] - self.min_queue[0][1]
@@ -0,0 +1,181 @@
+import os
+from collections import OrderedDict
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+DEFAULT_FONT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "fonts", "Nunito-Bold.ttf")
+
+# text background style, the outline is 1px wide
+BACKGROUND_PADDING = 10
+BACKGROUND_FILL = (32, 33, 36)
+BACKGROUND_OUTLINE = (70, 70, 70)
+
+
+class TextSprite:
+    """ Pre-rasterized text: BGR pixels, alpha mask and offset of the top-left corner from the text position """
+    def __init__(self, bgr, alpha, offset):
+        self.bgr = bgr
+        self.alpha = alpha
+        self.offset = offset
+
+
+class TextRenderer:
+    """
+    Draws text on opencv frames with pillow fonts.
+    Fonts are loaded once per size and rasterized labels are kept in an LRU cache,
+    so drawing a label only blends a small sprite on the region it covers instead of converting the whole frame
+    """
+    def __init__(self, font_path=None, max_sprites=256):
+        self.font_path = font_path or DEFAULT_FONT_PATH
+        self.max_sprites = max_sprites
+        self.fonts = {}
+        self.sprites = OrderedDict()
+        self.static_layers = OrderedDict()
+
+        if not os.path.isfile(self.font_path):
+            print(f"Warning: Font file not found at {self.font_path}, using default font")
+
+    def get_font(self, font_size):
+        font = self.fonts.get(font_size)
+        if font is None:
+            try:
+                font = ImageFont.truetype(self.font_path, font_size)
+            except Exception as e:
+                print(f"Error loading font: {str(e)}, using default font")
+                font = ImageFont.load_default()
+            self.fonts[font_size] = font
+        return font
+
+    def get_sprite(self, text, font_size=20, text_color=(255, 255, 255), with_background=True):
+        key = (text, font_size, tuple(text_color), with_background)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+
+        sprite = self.rasterize(text, font_size, text_color, with_background)
+        self.sprites[key] = sprite
+        if len(self.sprites) > self.max_sprites:
+            self.sprites.popitem(last=False)
+        return sprite
+
+    def rasterize(self, text, font_size, text_color, with_background):
+        font = self.get_font(font_size)
+
+        if hasattr(font, "getbbox"):
+            # for newer pillow versions (9.2.0+)
+            bbox = font.getbbox(text)
+        elif hasattr(font, "getsize"):
+            # for pillow versions between 9.0.0 - 9.2.0
+            bbox = (0, 0) + tuple(font.getsize(text))
+        else:
+            bbox = (0, 0, 0, 0)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        # canvas covers the background box and the glyphs, relative to the text position
+        padding = BACKGROUND_PADDING if with_background else 0
+        left = min(-padding, bbox[0])
+        top = min(-padding, bbox[1])
+        right = max(text_width + padding, bbox[2]) + 1
+        bottom = max(text_height + padding, bbox[3]) + 1
+
+        canvas = Image.new("RGBA", (right - left, bottom - top), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(canvas)
+
+        if with_background:
+            # the box used to be drawn on an RGB frame, where pillow ignores the fill alpha -> it stays opaque
+            draw.rectangle(
+                [(-padding - left, -padding - top),
+                 (text_width + padding - left, text_height + padding - top)],
+                fill=BACKGROUND_FILL + (255,),
+                outline=BACKGROUND_OUTLINE + (255,),
+                width=1
+            )
+
+        draw.text((-left, -top), text, font=font, fill=tuple(text_color) + (255,))
+
+        rgba = np.asarray(canvas)
+        bgr = np.ascontiguousarray(rgba[:, :, 2::-1])
+        alpha = rgba[:, :, 3:4].astype(np.float32) / 255.0
+        return TextSprite(bgr, alpha, (left, top))
+
+    def blend(self, image, sprite, position):
+        """ Alpha-blends a sprite on the part of the frame it covers (clipped to the frame) """
+        h, w = image.shape[:2]
+        x = position[0] + sprite.offset[0]
+        y = position[1] + sprite.offset[1]
+        sprite_h, sprite_w = sprite.bgr.shape[:2]
+
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + sprite_w, w), min(y + sprite_h, h)
+        if x0 >= x1 or y0 >= y1:
+            return image
+
+        sx0, sy0 = x0 - x, y0 - y
+        sx1, sy1 = sx0 + (x1 - x0), sy0 + (y1 - y0)
+
+        roi = image[y0:y1, x0:x1]
+        alpha = sprite.alpha[sy0:sy1, sx0:sx1]
+        blended = sprite.bgr[sy0:sy1, sx0:sx1] * alpha + roi * (1.0 - alpha)
+        roi[...] = blended.astype(np.uint8)
+        return image
+
+    def draw(self, image, text, position, font_size=20, text_color=(255, 255, 255), with_background=True):
+        sprite = self.get_sprite(text, font_size, text_color, with_background)
+        return self.blend(image, sprite, position)
+
+    def get_static_layer(self, items):
+        """
+        Pre-composites labels that never change (e.g. the sidebar title) into one sprite.
+        items is a tuple of (text, position, font_size, text_color, with_background)
+        """
+        layer = self.static_layers.get(items)
+        if layer is not None:
+            self.static_layers.move_to_end(items)
+            return layer
+
+        placed = []
+        for text, position, font_size, text_color, with_background in items:
+            sprite = self.get_sprite(text, font_size, text_color, with_background)
+            placed.append((sprite, position[0] + sprite.offset[0], position[1] + sprite.offset[1]))
+
+        left = min(x for _, x, _ in placed)
+        top = min(y for _, _, y in placed)
+        right = max(x + sprite.bgr.shape[1] for sprite, x, _ in placed)
+        bottom = max(y + sprite.bgr.shape[0] for sprite, _, y in placed)
+
+        bgr = np.zeros((bottom - top, right - left, 3), dtype=np.float32)
+        alpha = np.zeros((bottom - top, right - left, 1), dtype=np.float32)
+        for sprite, x, y in placed:
+            sprite_h, sprite_w = sprite.bgr.shape[:2]
+            region = (slice(y - top, y - top + sprite_h), slice(x - left, x - left + sprite_w))
+            # "over" compositing of the later labels on the earlier ones
+            bgr[region] = sprite.bgr * sprite.alpha + bgr[region] * (1.0 - sprite.alpha)
+            alpha[region] = sprite.alpha + alpha[region] * (1.0 - sprite.alpha)
+
+        # store premultiplied colors back as straight colors for blend()
+        bgr = np.where(alpha > 0, bgr / np.maximum(alpha, 1e-6), 0).astype(np.uint8)
+        layer = (TextSprite(bgr, alpha, (0, 0)), (left, top))
+
+        self.static_layers[items] = layer
+        if len(self.static_layers) > 16:
+            self.static_layers.popitem(last=False)
+        return layer
+
+    def draw_static(self, image, items):
+        sprite, position = self.get_static_layer(tuple(items))
+        return self.blend(image, sprite, position)
+
+
+_renderers = {}
+
+
+def get_text_renderer(font_path=None):
+    """ Shared renderer per font file """
+    key = font_path or DEFAULT_FONT_PATH
+    renderer = _renderers.get(key)
+    if renderer is None:
+        renderer = TextRenderer(key)
+        _renderers[key] = renderer
+    return renderer
@@ -0,0 +1,139 @@
+import os
+import queue
+import threading
+import time
+import cv2
+
+from pipeline import StageQueue, END_OF_STREAM
+from stage_timer import LatencyHistogram
+
+# video of the session, smaller than the capture and at a lower frame rate than the camera
+VIDEO_SETTINGS = {
+    "fps": 15.0,
+    "width": 960,       # frames are scaled down to this width (None: capture size)
+    "fourcc": "mp4v",
+    "extension": ".mp4",  # container of the fourcc
+    "queue_size": 8     # frames waiting for the encoder before new ones are dropped
+}
+
+# longest gap (in frames) filled by repeating the last frame, so the video keeps the session timing
+MAX_REPEATED_FRAMES = 30
+
+
+class SessionVideoRecorder:
+    """
+    Encodes the frames of a session with cv2.VideoWriter in a background thread.
+    submit() never blocks the assessment loop: frames are sampled down to the video frame rate by their
+    timestamp, and when the encoder falls behind the bounded queue drops the oldest waiting frames.
+    Frames are timed by their capture timestamp, gaps left by dropped frames repeat the previous frame.
+    Submitted frames must not be modified afterwards (they are encoded without being copied)
+    """
+    def __init__(self, path, fps=VIDEO_SETTINGS["fps"], width=VIDEO_SETTINGS["width"],
+                 fourcc=VIDEO_SETTINGS["fourcc"], queue_size=VIDEO_SETTINGS["queue_size"]):
+        self.path = path
+        self.fps = float(fps)
+        self.width = width
+        self.fourcc = fourcc
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self.frames = StageQueue("video", maxsize=queue_size, drop_oldest=True)
+        self.writer = None
+        self.size = None
+        self.start_time = None
+        self.next_index = 0  # index of the next frame the video needs
+
+        self.submitted_count = 0
+        self.written_count = 0
+        self.repeated_count = 0
+        self.encoder_lag = LatencyHistogram()  # submit to written
+        self.encode_time = LatencyHistogram()
+        self.error = None
+
+        self.thread = threading.Thread(target=self.encode_frames, name="video-recorder", daemon=True)
+        self.thread.start()
+
+    def submit(self, frame, timestamp):
+        """ Queues a BGR frame for encoding unless the video does not need it yet, returns immediately """
+        if self.start_time is None:
+            self.start_time = timestamp
+        index = int((timestamp - self.start_time) * self.fps)
+        if index < self.next_index:
+            return
+        self.next_index = index + 1
+        self.submitted_count += 1
+        self.frames.put((frame, timestamp, time.perf_counter()))
+
+    def open_writer(self, frame):
+        h, w = frame.shape[:2]
+        if self.width and self.width < w:
+            # even dimensions, most codecs need them
+            w, h = self.width - self.width % 2, int(h * self.width / w) // 2 * 2
+        self.size = (w, h)
+        self.writer = cv2.VideoWriter(self.path, cv2.VideoWriter_fourcc(*self.fourcc), self.fps, self.size)
+        if not self.writer.isOpened():
+            raise IOError(f"Could not open video writer for {self.path} ({self.fourcc})")
+
+    def encode_frames(self):
+        last_frame = None
+        while True:
+            try:
+                packet = self.frames.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if packet is END_OF_STREAM:
+                break
+            if self.error is not None:
+                continue
+
+            frame, timestamp, submitted = packet
+            try:
+                start = time.perf_counter()
+                if self.writer is None:
+                    self.open_writer(frame)
+                if frame.shape[1::-1] != self.size:
+                    frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+
+                # frame index in the video from the capture timestamp, gaps repeat the previous frame
+                index = int(round((timestamp - self.start_time) * self.fps))
+                repeats = min(index - self.written_count, MAX_REPEATED_FRAMES) if last_frame is not None else 0
+                for _ in range(max(0, repeats)):
+                    self.writer.write(last_frame)
+                    self.written_count += 1
+                    self.repeated_count += 1
+
+                self.writer.write(frame)
+                self.written_count += 1
+                last_frame = frame
+                now = time.perf_counter()
+                self.encode_time.record(now - start)
+                self.encoder_lag.record(now - submitted)
+            except Exception as e:
+                # the assessment goes on without video
+                self.error = str(e)
+                print(f"Video recording stopped: {self.error}")
+
+    def close(self):
+        """ Waits for the queued frames, finalizes the file and returns its path (None if nothing was written) """
+        # the end marker waits for a free slot instead of dropping a frame
+        self.frames.queue.put(END_OF_STREAM)
+        self.thread.join()
+        if self.writer is not None:
+            self.writer.release()
+        if not self.written_count:
+            return None
+        return self.path
+
+    def stats(self):
+        queue_stats = self.frames.stats()
+        return {
+            "fps": self.fps,
+            "size": list(self.size) if self.size else None,
+            "submitted": self.submitted_count,
+            "dropped": queue_stats["dropped"],
+            "written": self.written_count,
+            "repeated": self.repeated_count,
+            "max_queue_depth": queue_stats["max_depth"],
+            "encoder_lag_ms": {key: value for key, value in self.encoder_lag.summary().items() if key != "count"},
+            "encode_ms": self.encode_time.summary()["mean_ms"],
+            "error": self.error
+        }